@@ -1,3 +1,4 @@
+import heapq
 from abc import ABC, abstractmethod
 from collections import deque
 from typing import Optional, Iterator, Tuple
@@ -156,36 +157,40 @@ class Graph[K, V](ABC):
     def shortest_path(self, start_vertex: Vertex, end_vertex: Vertex) -> list[Vertex]:
         """
         Returns the shortest path between two vertices, or an empty list if there is no path.
-        Will not work if there are negative weight cycles.
+        Will not work if there are negative weights.
+        Runs in O((V + E) log V) time, and stops as soon as the end vertex is reached.
         :param start_vertex: start vertex
         :param end_vertex: end vertex
         :return: list containing the shortest path from start vertex to end vertex, or empty if none
         """
-        # Dijkstra's algorithm
-        unvisited = list[Graph.Vertex]()
-        for current_vertex in self.vertices.values():
-            unvisited.append(current_vertex)
-
+        # Dijkstra's algorithm, using a binary heap with lazy deletion
+        # Stale heap entries (vertex already visited with a shorter distance) are skipped when popped.
         distances = [float('inf')] * len(self.vertices)
         pred_vertices: list[Optional[Graph.Vertex]] = [None] * len(self.vertices)
+        visited = [False] * len(self.vertices)
 
         distances[start_vertex.index] = 0.0
 
-        while len(unvisited) > 0:
+        # heap entries are (distance, index, vertex), index is used to break ties so vertices are never compared
+        min_heap = [(0.0, start_vertex.index, start_vertex)]
+        while len(min_heap) > 0:
             # visit vertex with minimum distance from start_vertex
-            smallest_index = 0
+            current_distance, current_index, current_vertex = heapq.heappop(min_heap)
+            if visited[current_index]:
+                continue
+            visited[current_index] = True
 
-            for i in range(1, len(unvisited)):
-                if distances[unvisited[i].index] < distances[unvisited[smallest_index].index]:
-                    smallest_index = i
-            current_vertex = unvisited.pop(smallest_index)
+            if current_vertex is end_vertex:
+                # end vertex will not get any closer, so stop early
+                break
 
             for adj_vertex, edge_weight in self.get_edges_from_vertex(current_vertex):
-                alternative_path_distance = distances[current_vertex.index] + edge_weight
+                alternative_path_distance = current_distance + edge_weight
 
                 if alternative_path_distance < distances[adj_vertex.index]:
                     distances[adj_vertex.index] = alternative_path_distance
                     pred_vertices[adj_vertex.index] = current_vertex
+                    heapq.heappush(min_heap, (alternative_path_distance, adj_vertex.index, adj_vertex))
 
         # now work backwards to find the shortest path
         path = []
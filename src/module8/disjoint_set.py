@@ -0,0 +1,103 @@
+class DisjointSet:
+    """
+    Disjoint set (union-find) of the integers 0 to n - 1, used to track connected components.
+    Uses path compression and union by rank, so find and union take nearly constant amortized time, O(α(n)).
+    """
+
+    def __init__(self, size: int = 0):
+        """
+        Initialize the disjoint set, with each element in its own set.
+        :param size: number of elements
+        """
+        self.parents = list(range(size))  # element -> parent element (itself if it is the root of a set)
+        self.ranks = bytearray(size)  # root element -> upper bound of tree height, at most log₂ n
+        self.count = size  # number of sets
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __repr__(self) -> str:
+        sets = dict[int, list[int]]()
+        for element in range(len(self.parents)):
+            sets.setdefault(self.find(element), []).append(element)
+        return repr(list(sets.values()))
+
+    def add(self) -> int:
+        """
+        Adds a new element in its own set.
+        :return: the new element
+        """
+        element = len(self.parents)
+        self.parents.append(element)
+        self.ranks.append(0)
+        self.count += 1
+        return element
+
+    def extend(self, count: int) -> None:
+        """
+        Adds new elements, each in its own set.
+        :param count: number of elements to add
+        """
+        size = len(self.parents)
+        self.parents.extend(range(size, size + count))
+        self.ranks.extend(bytes(count))
+        self.count += count
+
+    def find(self, element: int) -> int:
+        """
+        Returns the root element of the set containing the given element.
+        Every element on the way to the root is linked directly to the root, to speed up later calls.
+        :param element: element to find
+        :return: root element of the set
+        :raises IndexError: if the element is out of range
+        """
+        parents = self.parents
+        root = element
+        while parents[root] != root:
+            root = parents[root]
+        # path compression
+        while parents[element] != root:
+            parents[element], element = root, parents[element]
+        return root
+
+    def union(self, element1: int, element2: int) -> bool:
+        """
+        Merges the sets containing the given elements.
+        The root of the shorter tree is linked to the root of the taller tree, so trees stay shallow.
+        :param element1: first element
+        :param element2: second element
+        :return: true if the sets were merged, false if the elements were already in the same set
+        :raises IndexError: if either element is out of range
+        """
+        root1 = self.find(element1)
+        root2 = self.find(element2)
+        if root1 == root2:
+            return False
+
+        if self.ranks[root1] < self.ranks[root2]:
+            root1, root2 = root2, root1
+        self.parents[root2] = root1
+        if self.ranks[root1] == self.ranks[root2]:
+            self.ranks[root1] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, element1: int, element2: int) -> bool:
+        """
+        Returns true if the given elements are in the same set.
+        :param element1: first element
+        :param element2: second element
+        :return: true if the elements are in the same set
+        :raises IndexError: if either element is out of range
+        """
+        return self.find(element1) == self.find(element2)
+
+    def copy(self) -> 'DisjointSet':
+        """
+        Returns a copy of the disjoint set.
+        """
+        disjoint_set = DisjointSet()
+        disjoint_set.parents = self.parents.copy()
+        disjoint_set.ranks = self.ranks.copy()
+        disjoint_set.count = self.count
+        return disjoint_set
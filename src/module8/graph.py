@@ -1,6 +1,13 @@
+import heapq
 from abc import ABC, abstractmethod
 from collections import deque
-from typing import Optional, Iterator, Tuple
+from typing import Optional, Iterator, Tuple, Callable, Iterable
+
+import numpy as np
+
+from module8.cache import Cache
+from module8.disjoint_set import DisjointSet
+from module8.visited_set import VisitedSet, SearchLabels
 
 
 class Graph[K, V](ABC):
@@ -10,8 +17,12 @@ class Graph[K, V](ABC):
 
     class Vertex:
         """
-        Vertex in a graph. The key and index should not be modified.
+        Vertex in a graph. The key and index should not be modified, but compacting the graph renumbers the index
+        (see Graph.compact). Each vertex belongs to one graph: frozen copies have their own vertices.
+        Uses slots instead of a dictionary for attributes, to reduce memory per vertex.
+        Internally, the graph algorithms work on vertex indices, and only use vertices for the public API.
         """
+        __slots__ = ('key', 'index', 'value')
 
         def __init__(self, key: K, index: int, value: V = None):
             self.key = key
@@ -21,8 +32,146 @@ class Graph[K, V](ABC):
         def __repr__(self):
             return f'Vertex(key: {repr(self.key)}, index: {self.index}, value: {repr(self.value)})'
 
+    class ShortestPathTree:
+        """
+        Shortest paths from a start vertex to all other vertices. Use Graph.shortest_paths_from() to create.
+        """
+
+        def __init__(self, start_vertex: 'Graph.Vertex', distances: list[float], pred_indices: list[int],
+                     vertices_by_index: list['Graph.Vertex']):
+            """
+            Initialize the shortest paths.
+            :param start_vertex: start vertex
+            :param distances: distance from the start vertex for each vertex index, inf if there is no path
+            :param pred_indices: index of the previous vertex in the shortest path for each vertex index,
+                -1 if there is no path
+            :param vertices_by_index: vertices in index order
+            """
+            self.start_vertex = start_vertex
+            self.distances = distances
+            self.pred_indices = pred_indices
+            self.vertices_by_index = vertices_by_index
+
+        def distance(self, end_vertex: 'Graph.Vertex') -> float:
+            """
+            Returns the length of the shortest path to the given vertex, or inf if there is no path.
+            :param end_vertex: end vertex
+            :return: length of the shortest path
+            """
+            return self.distances[end_vertex.index]
+
+        def shortest_path(self, end_vertex: 'Graph.Vertex') -> list['Graph.Vertex']:
+            """
+            Returns the shortest path to the given vertex, or an empty list if there is no path.
+            Runs in O(path length) time.
+            :param end_vertex: end vertex
+            :return: list containing the shortest path from start vertex to end vertex, or empty if none
+            """
+            # work backwards to find the shortest path
+            path = []
+            if self.pred_indices[end_vertex.index] < 0:
+                # no path
+                return path
+
+            start_index = self.start_vertex.index
+            current_index = end_vertex.index
+            while current_index != start_index:
+                path.append(self.vertices_by_index[current_index])
+                current_index = self.pred_indices[current_index]
+            path.append(self.start_vertex)
+            path.reverse()
+            return path
+
+        def _edge_added(self, graph: 'Graph', source_index: int, dest_index: int,
+                        weight: float) -> Optional['Graph.ShortestPathTree']:
+            """
+            Internal method to repair the shortest paths after an edge is added to the graph, or its weight changed.
+            A new or shorter edge can only make paths shorter, so only the vertices whose distance improves are
+            updated, by propagating from the destination vertex with a priority queue. This takes O(k log k) time,
+            where k is the number of changed vertices and edges from them, instead of searching the whole graph.
+            This tree is not modified, since the caller may still be using it: the changes are collected first, and
+            copied into a new tree only if the repair succeeds, which adds an O(V) list copy but no searching.
+            :param graph: graph that the edge was added to
+            :param source_index: index of the source vertex
+            :param dest_index: index of the destination vertex
+            :param weight: weight of the edge
+            :return: repaired shortest paths (this tree if none changed), or None if they must be found again,
+                because an edge on a shortest path got longer, or the edge made a negative weight cycle reachable
+            """
+            distances = self.distances
+            pred_indices = self.pred_indices
+            new_distance = distances[source_index] + weight
+            if new_distance >= distances[dest_index]:
+                # other edges can't change any shortest path if they get longer
+                if pred_indices[dest_index] != source_index or new_distance == distances[dest_index]:
+                    return self
+                return None
+
+            # vertex index -> improved distance and previous vertex index
+            new_distances = {dest_index: new_distance}
+            new_pred_indices = {dest_index: source_index}
+            # number of edges on each improved path after the new edge: as in _spfa, a path with V edges repeats a
+            # vertex, so it goes around a negative weight cycle
+            num_vertices = len(distances)
+            path_lengths = {dest_index: 1}
+            # with negative weights, a vertex may improve again after it is popped, so it is pushed again
+            min_heap = [(new_distance, dest_index)]
+            while len(min_heap) > 0:
+                current_distance, current_index = heapq.heappop(min_heap)
+                if current_distance > new_distances[current_index]:
+                    # stale heap entry
+                    continue
+                for adj_index, edge_weight in graph._get_edge_indices(current_index):
+                    alternative_path_distance = current_distance + edge_weight
+                    if alternative_path_distance < new_distances.get(adj_index, distances[adj_index]):
+                        path_length = path_lengths[current_index] + 1
+                        if adj_index == source_index or path_length >= num_vertices:
+                            # the source vertex can be reached more cheaply through the new edge itself, or the
+                            # path goes around a cycle that was not reachable before
+                            return None
+                        new_distances[adj_index] = alternative_path_distance
+                        new_pred_indices[adj_index] = current_index
+                        path_lengths[adj_index] = path_length
+                        heapq.heappush(min_heap, (alternative_path_distance, adj_index))
+
+            distances = list(distances)
+            for index, distance in new_distances.items():
+                distances[index] = distance
+            pred_indices = list(pred_indices)
+            for index, pred_index in new_pred_indices.items():
+                pred_indices[index] = pred_index
+            return Graph.ShortestPathTree(self.start_vertex, distances, pred_indices, self.vertices_by_index)
+
+    # maximum number of shortest path trees to cache (see shortest_paths_from)
+    shortest_path_cache_capacity = 16
+    # fraction of vertex indices that can be tombstones before the graph is compacted (see remove_vertex)
+    compact_threshold = 0.25
+
     def __init__(self):
         self.vertices = dict[K, Graph.Vertex]()  # key -> vertex
+        self.vertices_by_index = list[Optional[Graph.Vertex]]()  # index -> vertex, or None if removed (tombstone)
+        self.tombstone_count = 0  # number of removed vertices in vertices_by_index
+        self.shortest_path_cache = Cache[int, Graph.ShortestPathTree](self.shortest_path_cache_capacity)
+        # vertex indices connected by undirected edges (pairs of edges in both directions), updated as they are
+        # added (see connected), or None if it needs to be rebuilt after edges or vertices were removed
+        self.undirected_components: Optional[DisjointSet] = DisjointSet()
+        # number of vertices settled by the most recent shortest path search, used for performance testing
+        self.last_settled_count = 0
+        # true if graph has no cycles, or None if not known (see is_acyclic), kept while added edges follow the
+        # topological order (adding edges can't remove a cycle), and cleared when edges or vertices are removed
+        self.acyclic: Optional[bool] = None
+        # vertex indices in topological order, and position of each vertex index in that order, if acyclic
+        self.topological_indices: Optional[list[int]] = None
+        self.topological_positions: Optional[list[int]] = None
+        # true if any edge has a negative weight, updated as edges are added (see has_negative_weights),
+        # or None if it needs to be checked again after an edge that may be negative was removed or replaced
+        self.negative_weights: Optional[bool] = False
+        # transitive closure index (see can_reach), or None if not built, cleared when the graph is modified
+        self.reachability: Optional['ReachabilityIndex'] = None
+        # visited sets and shortest path search labels that are not in use by a traversal, reused so each traversal
+        # doesn't allocate new buffers
+        self.visited_pool = list[VisitedSet]()
+        self.labels_pool = list[SearchLabels]()
 
     def __repr__(self):
         def get_edges_string(vertex):
@@ -46,10 +195,50 @@ class Graph[K, V](ABC):
         """
         if key in self.vertices.keys():
             raise KeyError(f'Vertex with key {key} already found in graph')
-        vertex = self.Vertex(key, len(self.vertices), data)
+        vertex = self.Vertex(key, len(self.vertices_by_index), data)
         self.vertices[key] = vertex
+        self.vertices_by_index.append(vertex)
+        if self.undirected_components is not None:
+            self.undirected_components.add()
+        if self.acyclic:
+            # a vertex with no edges can go anywhere in topological order
+            self.topological_positions.append(len(self.topological_indices))
+            self.topological_indices.append(vertex.index)
+        self._graph_modified()
         return vertex
 
+    def add_vertices(self, keys: Iterable[K], values: Optional[Iterable[V]] = None) -> list[Vertex]:
+        """
+        Adds new vertices to the graph in one batch.
+        :param keys: keys to add (iterable or NumPy array)
+        :param values: data to add for each key, or None
+        :return: the vertices that were added
+        :raises KeyError: if a vertex with any of the keys already exists, or keys are repeated (nothing is added)
+        :raises ValueError: if the number of values does not match the number of keys
+        """
+        keys = self._to_list(keys)
+        values = [None] * len(keys) if values is None else self._to_list(values)
+        if len(values) != len(keys):
+            raise ValueError(f'Expected {len(keys)} values, got {len(values)}')
+        if len(set(keys)) != len(keys):
+            raise KeyError('Duplicate vertex keys')
+        for key in keys:
+            if key in self.vertices:
+                raise KeyError(f'Vertex with key {key} already found in graph')
+
+        start_index = len(self.vertices_by_index)
+        vertices = [self.Vertex(key, start_index + i, value) for i, (key, value) in enumerate(zip(keys, values))]
+        self.vertices.update(zip(keys, vertices))
+        self.vertices_by_index.extend(vertices)
+        if self.undirected_components is not None:
+            self.undirected_components.extend(len(vertices))
+        if self.acyclic:
+            self.topological_positions.extend(range(len(self.topological_indices),
+                                                    len(self.topological_indices) + len(vertices)))
+            self.topological_indices.extend(vertex.index for vertex in vertices)
+        self._graph_modified()
+        return vertices
+
     def get_vertex(self, key: K) -> Optional[Vertex]:
         """
         Returns the vertex with the given key.
@@ -70,6 +259,171 @@ class Graph[K, V](ABC):
         self.add_edge(vertex1, vertex2, weight)
         self.add_edge(vertex2, vertex1, weight)
 
+    def remove_vertex(self, vertex: Vertex) -> None:
+        """
+        Removes a vertex and all edges to and from it, in O(degree) time for adjacency lists.
+        The vertex index is left as a tombstone, which traversals never reach, so other vertex indices don't change.
+        When more than compact_threshold of the indices are tombstones, the graph is compacted (see compact).
+        :param vertex: vertex to remove
+        :raises KeyError: if the vertex is not in the graph
+        """
+        if self.vertices.get(vertex.key) is not vertex:
+            raise KeyError(f'Vertex with key {vertex.key} not found in graph')
+        self._remove_vertex_edges(vertex.index)
+        del self.vertices[vertex.key]
+        self.vertices_by_index[vertex.index] = None
+        self.tombstone_count += 1
+        self.undirected_components = None
+        if self.negative_weights:
+            self.negative_weights = None
+        self._clear_acyclic()
+        self._graph_modified()
+
+        if self.tombstone_count > self.compact_threshold * len(self.vertices_by_index):
+            self.compact()
+
+    def remove_edge(self, source_vertex: Vertex, dest_vertex: Vertex) -> None:
+        """
+        Removes a directed edge.
+        :param source_vertex: source vertex
+        :param dest_vertex: destination vertex
+        :raises KeyError: if there is no edge from the source vertex to the destination vertex
+        """
+        if not self._remove_edge(source_vertex.index, dest_vertex.index):
+            raise KeyError(f'Edge from {source_vertex.key} to {dest_vertex.key} not found in graph')
+        self.undirected_components = None
+        if self.negative_weights:
+            self.negative_weights = None
+        self._clear_acyclic()
+        self._graph_modified()
+
+    def remove_edge_undirected(self, vertex1: Vertex, vertex2: Vertex) -> None:
+        """
+        Removes an undirected edge.
+        :param vertex1: first vertex
+        :param vertex2: second vertex
+        :raises KeyError: if there is no edge between the vertices (nothing is removed)
+        """
+        if self.get_edge_weight(vertex1, vertex2) is None or self.get_edge_weight(vertex2, vertex1) is None:
+            raise KeyError(f'Edge between {vertex1.key} and {vertex2.key} not found in graph')
+        self.remove_edge(vertex1, vertex2)
+        if vertex1 is not vertex2:
+            self.remove_edge(vertex2, vertex1)
+
+    def compact(self) -> None:
+        """
+        Removes the tombstones left by remove_vertex, so vertex indices are contiguous again and storage shrinks.
+        Runs in O(V + E) time (O(V²) for adjacency matrices). Vertex indices change, so results that refer to
+        indices, like shortest path trees from before compaction, are no longer valid. Frozen copies (see freeze)
+        and contraction hierarchies don't depend on the indices of this graph's vertices, so they stay valid.
+        """
+        if self.tombstone_count == 0:
+            return
+        live_indices = [index for index, vertex in enumerate(self.vertices_by_index) if vertex is not None]
+        self._compact(live_indices)
+        self.vertices_by_index = [self.vertices_by_index[index] for index in live_indices]
+        for index, vertex in enumerate(self.vertices_by_index):
+            vertex.index = index
+        self.tombstone_count = 0
+        self.undirected_components = None
+        self._clear_acyclic()
+        self._graph_modified()
+
+    def connected(self, vertex1: Vertex, vertex2: Vertex) -> bool:
+        """
+        Returns true if there is a path between two vertices using undirected edges, which are pairs of edges in both
+        directions, like those added with add_edge_undirected(). An edge with no edge back is not included.
+        Runs in nearly constant time, O(α(V)), instead of a breadth first search. After an edge or vertex is
+        removed, or directed edges are added with add_edges(), the index is rebuilt in O(V + E) time.
+        :param vertex1: first vertex
+        :param vertex2: second vertex
+        :return: true if the vertices are connected
+        """
+        return self._get_undirected_components().connected(vertex1.index, vertex2.index)
+
+    def connected_component_count(self) -> int:
+        """
+        Returns the number of connected components using undirected edges (pairs of edges in both directions).
+        Runs in O(1) time, unless the index must be rebuilt (see connected).
+        :return: number of connected components (each vertex with no undirected edges is its own component)
+        """
+        # each tombstone is in a set by itself
+        return self._get_undirected_components().count - self.tombstone_count
+
+    def _get_undirected_components(self) -> DisjointSet:
+        """
+        Internal method to get the undirected connectivity index, rebuilding it after edges or vertices were removed.
+        Union-find cannot split sets, so the index is rebuilt from every pair of edges in both directions.
+        """
+        if self.undirected_components is None:
+            num_vertices = len(self.vertices_by_index)
+            edges = {(source_index, dest_index)
+                     for source_index in range(num_vertices)
+                     for dest_index, _ in self._get_edge_indices(source_index)}
+            components = DisjointSet(num_vertices)
+            for source_index, dest_index in edges:
+                if source_index < dest_index and (dest_index, source_index) in edges:
+                    components.union(source_index, dest_index)
+            self.undirected_components = components
+        return self.undirected_components
+
+    def can_reach(self, source_vertex: Vertex, dest_vertex: Vertex) -> bool:
+        """
+        Returns true if there is a directed path from the source vertex to the destination vertex.
+        Every vertex can reach itself. The first call builds a reachability index (see module8.reachability), which
+        answers each later call in O(1) time instead of a depth first search, until the graph is modified.
+        :param source_vertex: source vertex
+        :param dest_vertex: destination vertex
+        :return: true if the destination vertex can be reached from the source vertex
+        """
+        if self.reachability is None:
+            # imported here to avoid circular import
+            from module8.reachability import ReachabilityIndex
+            self.reachability = ReachabilityIndex(self)
+        return self.reachability.can_reach(source_vertex.index, dest_vertex.index)
+
+    def minimum_spanning_tree(self) -> list[Tuple[Vertex, Vertex, float]]:
+        """
+        Returns the edges of a minimum spanning tree using Kruskal's algorithm, treating all edges as undirected.
+        If the graph is not connected, returns a minimum spanning forest with a tree for each component.
+        Runs in O(E log E) time.
+        :return: list of (vertex, vertex, weight) edges in the tree, in increasing order of weight
+        """
+        edges = [(weight, source_index, dest_index)
+                 for source_index in range(len(self.vertices_by_index))
+                 for dest_index, weight in self._get_edge_indices(source_index)
+                 if source_index != dest_index]
+        edges.sort()
+
+        components = DisjointSet(len(self.vertices_by_index))
+        tree = []
+        for weight, source_index, dest_index in edges:
+            if components.union(source_index, dest_index):
+                tree.append((self.vertices_by_index[source_index], self.vertices_by_index[dest_index], weight))
+                if components.count == 1:
+                    # all vertices are connected
+                    break
+        return tree
+
+    def freeze(self) -> 'GraphCSR[K, V]':
+        """
+        Returns an immutable copy of this graph in compressed sparse row (CSR) format, which uses much less memory
+        for edges. The frozen graph has its own copy of each vertex, without removed vertices, so use its vertices
+        (see get_vertex) with it. This graph is not modified.
+        :return: frozen copy of this graph
+        """
+        # imported here to avoid circular import
+        from module8.graph_csr import GraphCSR
+        return GraphCSR.from_graph(self)
+
+    def save(self, path: str) -> None:
+        """
+        Saves a frozen copy of the graph in a compact binary format. Use GraphCSR.load() to load.
+        Keys and values must be JSON serializable (tuples are supported).
+        :param path: path of the file to save
+        """
+        self.freeze().save(path)
+
     @abstractmethod
     def edges_ordered(self) -> bool:
         """
@@ -88,6 +442,103 @@ class Graph[K, V](ABC):
         """
         pass
 
+    def add_edges(self, sources: Iterable, targets: Iterable, weights: Optional[Iterable[float] | float] = None,
+                  by_index: bool = False, undirected: bool = False) -> None:
+        """
+        Adds new directed edges to the graph in one batch.
+        Much faster than calling add_edge for each edge, especially with NumPy arrays of indices.
+        :param sources: keys (or indices) of the source vertices (iterable or NumPy array)
+        :param targets: keys (or indices) of the destination vertices (iterable or NumPy array)
+        :param weights: weight of each edge, a single weight for all edges, or None for weight 1
+        :param by_index: true if sources and targets are vertex indices instead of keys
+        :param undirected: true to add undirected edges, like add_edge_undirected
+        :raises KeyError: if a source or target key is not found
+        :raises IndexError: if a source or target index is out of range, or is the index of a removed vertex
+        :raises ValueError: if the number of sources, targets and weights do not match
+        """
+        source_indices = self._get_indices(sources, by_index)
+        target_indices = self._get_indices(targets, by_index)
+        if len(source_indices) != len(target_indices):
+            raise ValueError(f'Expected {len(source_indices)} targets, got {len(target_indices)}')
+        if weights is None:
+            weights = 1.0
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim == 0:
+            weights = np.full(len(source_indices), weights)
+        elif len(weights) != len(source_indices):
+            raise ValueError(f'Expected {len(source_indices)} weights, got {len(weights)}')
+
+        edge_source_indices = source_indices
+        edge_target_indices = target_indices
+        if undirected:
+            # add each edge in both directions, in the same order as add_edge_undirected
+            source_indices, target_indices = (np.column_stack((source_indices, target_indices)).ravel(),
+                                              np.column_stack((target_indices, source_indices)).ravel())
+            weights = np.repeat(weights, 2)
+
+        self._add_edges(source_indices, target_indices, weights)
+        # update connectivity only after the edges were added, so a failed batch leaves it unchanged
+        if not undirected:
+            # directed edges may pair up with edges already in the other direction, so rebuild when needed
+            self.undirected_components = None
+        elif self.undirected_components is not None:
+            union = self.undirected_components.union
+            for source_index, target_index in zip(edge_source_indices.tolist(), edge_target_indices.tolist()):
+                union(source_index, target_index)
+        if np.any(weights < 0):
+            self.negative_weights = True
+        elif self.negative_weights:
+            # may have replaced a negative weight
+            self.negative_weights = None
+        if self.acyclic:
+            topological_positions = np.asarray(self.topological_positions)
+            if np.any(topological_positions[source_indices] >= topological_positions[target_indices]):
+                # an edge goes backwards in topological order, so it may make a cycle
+                self._clear_acyclic()
+        self._graph_modified()
+
+    def _add_edges(self, source_indices: np.ndarray, target_indices: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Internal method to add a batch of edges, with indices already validated.
+        Subclasses should override with a faster implementation.
+        :param source_indices: indices of the source vertices
+        :param target_indices: indices of the destination vertices
+        :param weights: weight of each edge
+        """
+        vertices_by_index = self.vertices_by_index
+        for source_index, target_index, weight in zip(source_indices.tolist(), target_indices.tolist(),
+                                                      weights.tolist()):
+            self.add_edge(vertices_by_index[source_index], vertices_by_index[target_index], weight)
+
+    def _get_indices(self, keys: Iterable, by_index: bool) -> np.ndarray:
+        """
+        Internal method to convert keys or indices to an array of vertex indices.
+        :param keys: keys or indices
+        :param by_index: true if keys are indices
+        :return: array of vertex indices
+        :raises KeyError: if a key is not found
+        :raises IndexError: if an index is out of range, or is the index of a removed vertex
+        """
+        if by_index:
+            indices = np.asarray(keys if isinstance(keys, np.ndarray) else self._to_list(keys), dtype=np.int64)
+            if len(indices) > 0 and (indices.min() < 0 or indices.max() >= len(self.vertices_by_index)):
+                raise IndexError('Vertex index out of range')
+            if self.tombstone_count > 0:
+                vertices_by_index = self.vertices_by_index
+                for index in np.unique(indices).tolist():
+                    if vertices_by_index[index] is None:
+                        raise IndexError(f'Vertex with index {index} was removed')
+            return indices
+        vertices = self.vertices
+        return np.fromiter((vertices[key].index for key in self._to_list(keys)), dtype=np.int64)
+
+    @staticmethod
+    def _to_list(values: Iterable) -> list:
+        """
+        Converts an iterable or NumPy array to a list (of Python values, not NumPy scalars).
+        """
+        return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
     @abstractmethod
     def get_edge_weight(self, source_vertex: Vertex, dest_vertex: Vertex) -> Optional[float]:
         """
@@ -108,33 +559,213 @@ class Graph[K, V](ABC):
         """
         pass
 
+    @abstractmethod
+    def get_edges_to_vertex(self, dest_vertex: Vertex) -> Iterator[Tuple[Vertex, float]]:
+        """
+        Returns an iterator over all source vertices and weights of edges to the given vertex.
+        Order depends on implementation.
+        :param dest_vertex: destination vertex
+        :return: an iterator, which may be empty, over all source vertices and weights to this vertex
+        """
+        pass
+
+    @abstractmethod
+    def _remove_edge(self, source_index: int, dest_index: int) -> bool:
+        """
+        Internal method to remove the edge between two vertex indices.
+        :param source_index: index of the source vertex
+        :param dest_index: index of the destination vertex
+        :return: true if the edge was removed, false if there is no edge
+        """
+        pass
+
+    @abstractmethod
+    def _remove_vertex_edges(self, index: int) -> None:
+        """
+        Internal method to remove all edges to and from the given vertex index, before it becomes a tombstone.
+        :param index: index of the vertex being removed
+        """
+        pass
+
+    @abstractmethod
+    def _compact(self, live_indices: list[int]) -> None:
+        """
+        Internal method to renumber edge storage when the graph is compacted.
+        The vertex at live_indices[i] gets the new index i.
+        :param live_indices: indices of all vertices that were not removed, in increasing order
+        """
+        pass
+
+    def _get_edge_indices(self, source_index: int) -> Iterable[Tuple[int, float]]:
+        """
+        Internal method that returns the destination index and weight of all edges from the given vertex index.
+        Used by the traversal and search algorithms, so inner loops work on ints instead of vertices.
+        Subclasses should override with a faster implementation.
+        :param source_index: index of the source vertex
+        :return: iterable over destination vertex indices and weights, in the same order as get_edges_from_vertex
+        """
+        return ((dest_vertex.index, weight)
+                for dest_vertex, weight in self.get_edges_from_vertex(self.vertices_by_index[source_index]))
+
+    def _get_reverse_edge_indices(self, dest_index: int) -> Iterable[Tuple[int, float]]:
+        """
+        Internal method that returns the source index and weight of all edges to the given vertex index.
+        Subclasses should override with a faster implementation.
+        :param dest_index: index of the destination vertex
+        :return: iterable over source vertex indices and weights, in the same order as get_edges_to_vertex
+        """
+        return ((source_vertex.index, weight)
+                for source_vertex, weight in self.get_edges_to_vertex(self.vertices_by_index[dest_index]))
+
     def traverse_depth_first(self, root_vertex: Optional[Vertex] = None) -> Iterator[Vertex]:
         """
         Do a depth-first traversal.
         :param root_vertex: root vertex, or None to traverse all vertices.
         :return: depth-first iterator over vertices
         """
-        visited = set[self.Vertex]()
-        if root_vertex is None:
-            # iterate all vertices
-            for vertex in self.vertices.values():
-                yield from self._traverse_depth_first(vertex, visited)
-        else:
-            # iterate given vertex only
-            yield from self._traverse_depth_first(root_vertex, visited)
+        visited = self._acquire_visited()  # indexed by vertex index
+        try:
+            if root_vertex is None:
+                # iterate all vertices
+                for vertex in self.vertices.values():
+                    yield from self._traverse_depth_first(vertex.index, visited)
+            else:
+                # iterate given vertex only
+                yield from self._traverse_depth_first(root_vertex.index, visited)
+        finally:
+            self._release_visited(visited)
 
-    def _traverse_depth_first(self, current_vertex: Vertex, visited: set[Vertex]) -> Iterator[Vertex]:
+    def _traverse_depth_first(self, root_index: int, visited: VisitedSet) -> Iterator[Vertex]:
         """
         Internal method to do a depth-first traversal of subgraph for given vertex.
-        :param current_vertex: vertex to traverse
-        :param visited: vertices that have already been visited
+        Uses an explicit stack instead of recursion, so each vertex is yielded in O(1) time and deep graphs do not
+        hit the recursion limit. Vertices are returned after all vertices reachable from them (post-order).
+        :param root_index: index of vertex to traverse
+        :param visited: vertex indices that have already been visited
         :return: depth-first iterator over vertices
         """
-        if current_vertex not in visited:
-            visited.add(current_vertex)
-            for dest_vertex, _ in self.get_edges_from_vertex(current_vertex):
-                yield from self._traverse_depth_first(dest_vertex, visited)
-            yield current_vertex
+        stamps = visited.stamps
+        epoch = visited.epoch
+        if stamps[root_index] == epoch:
+            return
+        stamps[root_index] = epoch
+
+        # stack entries are (vertex index, iterator over remaining edges from vertex)
+        stack = [(root_index, iter(self._get_edge_indices(root_index)))]
+        while len(stack) > 0:
+            current_index, edges = stack[-1]
+            for dest_index, _ in edges:
+                if stamps[dest_index] != epoch:
+                    # descend into dest vertex, then continue with the remaining edges of current vertex
+                    stamps[dest_index] = epoch
+                    stack.append((dest_index, iter(self._get_edge_indices(dest_index))))
+                    break
+            else:
+                # all edges visited
+                stack.pop()
+                yield self.vertices_by_index[current_index]
+
+    def strongly_connected_components(self) -> list[list[Vertex]]:
+        """
+        Returns the strongly connected components of the graph using Tarjan's algorithm, in O(V + E) time.
+        Components are returned in reverse topological order, i.e. each component is returned before any component
+        that has edges to it.
+        :return: list of components, each of which is a list of vertices
+        """
+        num_vertices = len(self.vertices_by_index)
+        discovery_order = [-1] * num_vertices  # -1 if not yet discovered
+        low_links = [0] * num_vertices  # lowest discovery order reachable through the DFS subtree
+        on_stack = bytearray(num_vertices)
+        component_stack = list[int]()
+        components = list[list[Graph.Vertex]]()
+        num_discovered = 0
+
+        for root_index in range(num_vertices):
+            if discovery_order[root_index] >= 0 or self.vertices_by_index[root_index] is None:
+                continue
+            discovery_order[root_index] = low_links[root_index] = num_discovered
+            num_discovered += 1
+            component_stack.append(root_index)
+            on_stack[root_index] = 1
+
+            # iterative DFS, same as _traverse_depth_first
+            stack = [(root_index, iter(self._get_edge_indices(root_index)))]
+            while len(stack) > 0:
+                current_index, edges = stack[-1]
+                for dest_index, _ in edges:
+                    if discovery_order[dest_index] < 0:
+                        discovery_order[dest_index] = low_links[dest_index] = num_discovered
+                        num_discovered += 1
+                        component_stack.append(dest_index)
+                        on_stack[dest_index] = 1
+                        stack.append((dest_index, iter(self._get_edge_indices(dest_index))))
+                        break
+                    elif on_stack[dest_index]:
+                        low_links[current_index] = min(low_links[current_index], discovery_order[dest_index])
+                else:
+                    stack.pop()
+                    if len(stack) > 0:
+                        parent_index = stack[-1][0]
+                        low_links[parent_index] = min(low_links[parent_index], low_links[current_index])
+
+                    if low_links[current_index] == discovery_order[current_index]:
+                        # current vertex is the root of a component, which is on the top of the component stack
+                        component = []
+                        while True:
+                            index = component_stack.pop()
+                            on_stack[index] = 0
+                            component.append(self.vertices_by_index[index])
+                            if index == current_index:
+                                break
+                        components.append(component)
+        return components
+
+    def topological_sort(self) -> list[Vertex]:
+        """
+        Returns all vertices in topological order, so every edge goes from an earlier vertex to a later vertex.
+        Runs in O(V + E) time.
+        :return: list of vertices in topological order
+        :raises ValueError: if the graph contains a cycle
+        """
+        order = []
+        for component in reversed(self.strongly_connected_components()):
+            vertex = component[0]
+            if len(component) > 1 or self.get_edge_weight(vertex, vertex) is not None:
+                raise ValueError('Graph contains a cycle')
+            order.append(vertex)
+        return order
+
+    def has_negative_weights(self) -> bool:
+        """
+        Returns true if any edge has a negative weight, in which case shortest paths in graphs with cycles are found
+        with SPFA instead of Dijkstra's algorithm (see shortest_path).
+        Tracked in O(1) time as edges are added, and checked again in O(V + E) time after an edge that may have been
+        negative is removed or replaced.
+        :return: true if any edge has a negative weight
+        """
+        if self.negative_weights is None:
+            self.negative_weights = any(weight < 0
+                                        for source_index in range(len(self.vertices_by_index))
+                                        for _, weight in self._get_edge_indices(source_index))
+        return self.negative_weights
+
+    def is_acyclic(self) -> bool:
+        """
+        Returns true if the graph has no cycles, in which case shortest paths are found in O(V + E) time.
+        Checked in O(V + E) time, and the result is cached until an edge or vertex is removed, or an edge is added
+        that goes backwards in the topological order found by the check.
+        :return: true if the graph has no cycles
+        """
+        if self.acyclic is None:
+            try:
+                self.topological_indices = [vertex.index for vertex in self.topological_sort()]
+                self.topological_positions = [0] * len(self.vertices_by_index)
+                for position, index in enumerate(self.topological_indices):
+                    self.topological_positions[index] = position
+                self.acyclic = True
+            except ValueError:
+                self.acyclic = False
+        return self.acyclic
 
     def traverse_breadth_first(self, root_vertex: Vertex) -> Iterator[Vertex]:
         """
@@ -142,61 +773,594 @@ class Graph[K, V](ABC):
         :param root_vertex: root vertex.
         :return: breadth-first iterator over vertices
         """
-        discovered = {root_vertex}
-        queue = deque[Graph.Vertex]()
-        queue.append(root_vertex)
-        while len(queue) > 0:
-            current_vertex = queue.popleft()
-            yield current_vertex
-            for dest_vertex, _ in self.get_edges_from_vertex(current_vertex):
-                if dest_vertex not in discovered:
-                    discovered.add(dest_vertex)
-                    queue.append(dest_vertex)
+        discovered = self._acquire_visited()  # indexed by vertex index
+        try:
+            stamps = discovered.stamps
+            epoch = discovered.epoch
+            stamps[root_vertex.index] = epoch
+            queue = deque[int]()
+            queue.append(root_vertex.index)
+            while len(queue) > 0:
+                current_index = queue.popleft()
+                yield self.vertices_by_index[current_index]
+                for dest_index, _ in self._get_edge_indices(current_index):
+                    if stamps[dest_index] != epoch:
+                        stamps[dest_index] = epoch
+                        queue.append(dest_index)
+        finally:
+            self._release_visited(discovered)
+
+    def breadth_first_distances(self, source_vertices: Iterable[Vertex]) -> np.ndarray:
+        """
+        Returns the number of edges on the shortest path to every vertex from the nearest source vertex,
+        ignoring weights. The search expands one whole level (frontier) of vertices at a time, which is vectorized
+        with NumPy array operations for frozen graphs and adjacency matrices.
+        :param source_vertices: vertices to start from (distance 0)
+        :return: array of distances indexed by vertex index, -1 if a vertex cannot be reached
+        """
+        source_indices = np.fromiter((vertex.index for vertex in source_vertices), dtype=np.int64)
+        return self._breadth_first_distances(np.unique(source_indices))
+
+    def _breadth_first_distances(self, source_indices: np.ndarray) -> np.ndarray:
+        """
+        Internal method to find breadth first distances from the given vertex indices, one level at a time.
+        Subclasses with array storage should override this with a vectorized version.
+        :param source_indices: unique indices of the source vertices
+        :return: array of distances indexed by vertex index, -1 if a vertex cannot be reached
+        """
+        distances = np.full(len(self.vertices_by_index), -1, dtype=np.int64)
+        visited = self._acquire_visited()  # indexed by vertex index
+        stamps = visited.stamps
+        epoch = visited.epoch
+        frontier = source_indices.tolist()
+        for index in frontier:
+            stamps[index] = epoch
+        level = 0
+        while len(frontier) > 0:
+            distances[frontier] = level
+            next_frontier = []
+            for current_index in frontier:
+                for dest_index, _ in self._get_edge_indices(current_index):
+                    if stamps[dest_index] != epoch:
+                        stamps[dest_index] = epoch
+                        next_frontier.append(dest_index)
+            frontier = next_frontier
+            level += 1
+        self._release_visited(visited)
+        return distances
 
     def shortest_path(self, start_vertex: Vertex, end_vertex: Vertex) -> list[Vertex]:
         """
         Returns the shortest path between two vertices, or an empty list if there is no path.
-        Will not work if there are negative weight cycles.
+        If the graph has no cycles (see is_acyclic), edges are relaxed in topological order in O(V + E) time, and
+        negative weights are allowed. Otherwise, uses Dijkstra's algorithm in O((V + E) log V) time, or if there are
+        negative weights (see has_negative_weights), the queue-based Bellman-Ford algorithm (SPFA), which usually
+        takes close to O(V + E) time, but O(VE) in the worst case.
+        The first two stop as soon as the end vertex is reached.
+        The first two only touch the vertices they reach, using reused search labels (see SearchLabels), so a query
+        that stops early doesn't allocate or fill lists of V distances.
+        If the shortest paths from the start vertex are cached (see shortest_paths_from), they are used instead.
         :param start_vertex: start vertex
         :param end_vertex: end vertex
         :return: list containing the shortest path from start vertex to end vertex, or empty if none
+        :raises ValueError: if a negative weight cycle can be reached from the start vertex
+        """
+        if start_vertex.index in self.shortest_path_cache:
+            return self.shortest_path_cache[start_vertex.index].shortest_path(end_vertex)
+        if not self.is_acyclic() and self.has_negative_weights():
+            # SPFA can't stop early, so it finds all shortest paths anyway
+            return self._spfa(start_vertex).shortest_path(end_vertex)
+
+        labels = self._acquire_labels()
+        if self.acyclic:
+            self._dag_search(start_vertex.index, end_vertex.index, labels)
+        else:
+            self._dijkstra_search(start_vertex.index, end_vertex.index, labels)
+        path = self._get_labels_path(labels, start_vertex.index, end_vertex.index)
+        self._release_labels(labels)
+        return path
+
+    def shortest_paths_from(self, start_vertex: Vertex) -> 'Graph.ShortestPathTree':
+        """
+        Returns the shortest paths from the given vertex to all other vertices.
+        The most recently used results are cached until the graph is modified, so repeated calls are O(1).
+        When add_edge adds an edge or shortens one, cached results are repaired instead, updating only the vertices
+        whose paths get shorter, so a stream of small updates doesn't search the whole graph each time. Repaired
+        results are new objects: results that were already returned never change.
+        Uses the same algorithm as shortest_path().
+        :param start_vertex: start vertex
+        :return: shortest paths from the start vertex
+        :raises ValueError: if a negative weight cycle can be reached from the start vertex
+        """
+        if start_vertex.index in self.shortest_path_cache:
+            return self.shortest_path_cache[start_vertex.index]
+        tree = self._shortest_paths(start_vertex)
+        self.shortest_path_cache[start_vertex.index] = tree
+        return tree
+
+    def shortest_paths_from_many(self, start_vertices: Iterable[Vertex],
+                                 max_workers: Optional[int] = None) -> list['Graph.ShortestPathTree']:
+        """
+        Returns the shortest paths from each of the given vertices to all other vertices, running Dijkstra's
+        algorithm for each start vertex in parallel worker processes that share a single copy of the graph.
+        If there are negative weights, uses the same algorithm as shortest_paths_from() in this process instead.
+        :param start_vertices: start vertices
+        :param max_workers: maximum number of worker processes, or None to use the number of CPUs
+        :return: shortest paths from each start vertex, in the same order as start_vertices
+        :raises ValueError: if a negative weight cycle can be reached from a start vertex
         """
-        # Dijkstra's algorithm
-        unvisited = list[Graph.Vertex]()
-        for current_vertex in self.vertices.values():
-            unvisited.append(current_vertex)
+        # imported here to avoid circular import
+        from module8.graph_parallel import shortest_paths_from_many
+        return shortest_paths_from_many(self, list(start_vertices), max_workers)
 
-        distances = [float('inf')] * len(self.vertices)
-        pred_vertices: list[Optional[Graph.Vertex]] = [None] * len(self.vertices)
+    def page_rank(self, damping: float = 0.85, personalization: Optional[dict[Vertex, float]] = None,
+                  weighted: bool = True, tolerance: float = 1e-6, max_iterations: int = 100) -> np.ndarray:
+        """
+        Ranks vertices with the PageRank algorithm, using vectorized power iteration (see module8.page_rank).
+        :param damping: probability of following an edge instead of jumping to a random vertex
+        :param personalization: relative probability of jumping to each vertex, or None to jump to any vertex equally
+        :param weighted: true to follow edges in proportion to their weight, false to follow each edge equally
+        :param tolerance: stop when the total change in rank in one iteration is less than this
+        :param max_iterations: maximum number of iterations
+        :return: array of ranks indexed by vertex index, which add up to 1
+        :raises KeyError: if a personalization vertex is not in the graph
+        :raises ValueError: if damping or personalization is invalid, weighted is true and a weight is not positive, or
+            the ranks don't converge
+        """
+        # imported here to avoid circular import
+        from module8.page_rank import page_rank
+        return page_rank(self, damping, personalization, weighted, tolerance, max_iterations)
+
+    def _shortest_paths(self, start_vertex: Vertex, end_vertex: Optional[Vertex] = None) -> 'Graph.ShortestPathTree':
+        """
+        Internal method to find shortest paths from the start vertex, using the best algorithm for this graph.
+        :param start_vertex: start vertex
+        :param end_vertex: end vertex to stop at, or None to find shortest paths to all vertices
+        :return: shortest paths from the start vertex (only complete up to end vertex, if given)
+        """
+        if self.is_acyclic():
+            return self._dag_shortest_paths(start_vertex, end_vertex)
+        if self.has_negative_weights():
+            return self._spfa(start_vertex)
+        return self._dijkstra(start_vertex, end_vertex)
+
+    def _dag_shortest_paths(self, start_vertex: Vertex,
+                            end_vertex: Optional[Vertex] = None) -> 'Graph.ShortestPathTree':
+        """
+        Internal method to find shortest paths from the start vertex in a graph with no cycles (see _dag_search).
+        :param start_vertex: start vertex
+        :param end_vertex: end vertex to stop at, or None to find shortest paths to all vertices
+        :return: shortest paths from the start vertex (only complete up to end vertex, if given)
+        """
+        labels = self._acquire_labels()
+        self._dag_search(start_vertex.index, end_vertex.index if end_vertex is not None else -1, labels)
+        tree = self._get_labels_tree(start_vertex, labels)
+        self._release_labels(labels)
+        return tree
+
+    def _dag_search(self, start_index: int, end_index: int, labels: SearchLabels) -> None:
+        """
+        Internal method to find shortest paths from the start vertex in a graph with no cycles, by relaxing edges
+        in topological order. Runs in O(V + E) time, and works with negative weights.
+        :param start_index: index of the start vertex
+        :param end_index: index of the end vertex to stop at, or -1 to find shortest paths to all vertices
+        :param labels: empty search labels, which are set for each vertex that is reached
+        """
+        distances = labels.distances
+        pred_indices = labels.pred_indices
+        stamps = labels.stamps
+        epoch = labels.epoch
+
+        stamps[start_index] = epoch
+        distances[start_index] = 0.0
+        pred_indices[start_index] = -1
+
+        # vertices before the start vertex in topological order cannot be reached from it
+        topological_indices = self.topological_indices
+        num_settled = 0
+        for position in range(self.topological_positions[start_index], len(topological_indices)):
+            current_index = topological_indices[position]
+            if stamps[current_index] != epoch:
+                # not reachable
+                continue
+            num_settled += 1
+
+            if current_index == end_index:
+                # all paths to the end vertex have been relaxed, so stop early
+                break
+
+            current_distance = distances[current_index]
+            for adj_index, edge_weight in self._get_edge_indices(current_index):
+                alternative_path_distance = current_distance + edge_weight
+                if stamps[adj_index] != epoch or alternative_path_distance < distances[adj_index]:
+                    stamps[adj_index] = epoch
+                    distances[adj_index] = alternative_path_distance
+                    pred_indices[adj_index] = current_index
+
+        self.last_settled_count = num_settled
+
+    def _spfa(self, start_vertex: Vertex) -> 'Graph.ShortestPathTree':
+        """
+        Internal method to find shortest paths from the start vertex in a graph with negative weights, using the
+        queue-based Bellman-Ford algorithm, also known as the shortest path faster algorithm (SPFA).
+        Instead of relaxing every edge V times, only the edges from vertices whose distance has just improved are
+        relaxed again, so the number of vertices taken from the queue is usually a small multiple of V.
+        Distances are not final until the queue is empty, so this cannot stop early at an end vertex.
+        :param start_vertex: start vertex
+        :return: shortest paths from the start vertex
+        :raises ValueError: if a negative weight cycle can be reached from the start vertex
+        """
+        num_vertices = len(self.vertices_by_index)
+        distances = [float('inf')] * num_vertices
+        pred_indices = [-1] * num_vertices
+        # number of edges on the shortest path found so far: a path with V edges repeats a vertex, so the cycle
+        # must be negative
+        path_lengths = [0] * num_vertices
+        in_queue = bytearray(num_vertices)
 
         distances[start_vertex.index] = 0.0
 
-        while len(unvisited) > 0:
+        queue = deque[int]()
+        queue.append(start_vertex.index)
+        in_queue[start_vertex.index] = 1
+        num_settled = 0
+        while len(queue) > 0:
+            current_index = queue.popleft()
+            in_queue[current_index] = 0
+            num_settled += 1
+
+            current_distance = distances[current_index]
+            for adj_index, edge_weight in self._get_edge_indices(current_index):
+                alternative_path_distance = current_distance + edge_weight
+
+                if alternative_path_distance < distances[adj_index]:
+                    distances[adj_index] = alternative_path_distance
+                    pred_indices[adj_index] = current_index
+                    path_lengths[adj_index] = path_lengths[current_index] + 1
+                    if path_lengths[adj_index] >= num_vertices:
+                        raise ValueError('Graph contains a negative weight cycle')
+                    if not in_queue[adj_index]:
+                        in_queue[adj_index] = 1
+                        queue.append(adj_index)
+
+        self.last_settled_count = num_settled
+        return self.ShortestPathTree(start_vertex, distances, pred_indices, self.vertices_by_index)
+
+    def _dijkstra(self, start_vertex: Vertex, end_vertex: Optional[Vertex] = None) -> 'Graph.ShortestPathTree':
+        """
+        Internal method to find shortest paths from the start vertex using Dijkstra's algorithm (see _dijkstra_search).
+        :param start_vertex: start vertex
+        :param end_vertex: end vertex to stop at, or None to find shortest paths to all vertices
+        :return: shortest paths from the start vertex (only complete up to end vertex, if given)
+        """
+        labels = self._acquire_labels()
+        self._dijkstra_search(start_vertex.index, end_vertex.index if end_vertex is not None else -1, labels)
+        tree = self._get_labels_tree(start_vertex, labels)
+        self._release_labels(labels)
+        return tree
+
+    def _dijkstra_search(self, start_index: int, end_index: int, labels: SearchLabels) -> None:
+        """
+        Internal method to find shortest paths from the start vertex using Dijkstra's algorithm.
+        :param start_index: index of the start vertex
+        :param end_index: index of the end vertex to stop at, or -1 to find shortest paths to all vertices
+        :param labels: empty search labels, which are set for each vertex that is reached
+        """
+        # Dijkstra's algorithm, using a binary heap with lazy deletion
+        # Stale heap entries (vertex already visited with a shorter distance) are skipped when popped.
+        distances = labels.distances
+        pred_indices = labels.pred_indices
+        stamps = labels.stamps
+        epoch = labels.epoch
+        visited = self._acquire_visited()
+        visited_stamps = visited.stamps
+        visited_epoch = visited.epoch
+
+        stamps[start_index] = epoch
+        distances[start_index] = 0.0
+        pred_indices[start_index] = -1
+
+        # heap entries are (distance, vertex index)
+        min_heap = [(0.0, start_index)]
+        num_settled = 0
+        while len(min_heap) > 0:
             # visit vertex with minimum distance from start_vertex
-            smallest_index = 0
+            current_distance, current_index = heapq.heappop(min_heap)
+            if visited_stamps[current_index] == visited_epoch:
+                continue
+            visited_stamps[current_index] = visited_epoch
+            num_settled += 1
 
-            for i in range(1, len(unvisited)):
-                if distances[unvisited[i].index] < distances[unvisited[smallest_index].index]:
-                    smallest_index = i
-            current_vertex = unvisited.pop(smallest_index)
+            if current_index == end_index:
+                # end vertex will not get any closer, so stop early
+                break
 
-            for adj_vertex, edge_weight in self.get_edges_from_vertex(current_vertex):
-                alternative_path_distance = distances[current_vertex.index] + edge_weight
+            for adj_index, edge_weight in self._get_edge_indices(current_index):
+                alternative_path_distance = current_distance + edge_weight
 
-                if alternative_path_distance < distances[adj_vertex.index]:
-                    distances[adj_vertex.index] = alternative_path_distance
-                    pred_vertices[adj_vertex.index] = current_vertex
+                if stamps[adj_index] != epoch or alternative_path_distance < distances[adj_index]:
+                    stamps[adj_index] = epoch
+                    distances[adj_index] = alternative_path_distance
+                    pred_indices[adj_index] = current_index
+                    heapq.heappush(min_heap, (alternative_path_distance, adj_index))
 
-        # now work backwards to find the shortest path
+        self._release_visited(visited)
+        self.last_settled_count = num_settled
+
+    def shortest_path_a_star(self, start_vertex: Vertex, end_vertex: Vertex,
+                             heuristic: Callable[[Vertex, Vertex], float]) -> list[Vertex]:
+        """
+        Returns the shortest path between two vertices using A* search, or an empty list if there is no path.
+        Vertices are visited in order of distance from the start vertex plus estimated distance to the end vertex,
+        so usually far fewer vertices are visited than with shortest_path().
+        Will not work if there are negative weights.
+        :param start_vertex: start vertex
+        :param end_vertex: end vertex
+        :param heuristic: function that estimates the distance from a vertex to the end vertex, for example using
+            coordinates stored in Vertex.value. To find the shortest path, the estimate must never be more than the
+            actual distance, and must not decrease by more than the weight when following an edge.
+        :return: list containing the shortest path from start vertex to end vertex, or empty if none
+        """
+        vertices_by_index = self.vertices_by_index
+        labels = self._acquire_labels()
+        distances = labels.distances
+        pred_indices = labels.pred_indices
+        label_stamps = labels.stamps
+        label_epoch = labels.epoch
+        visited = self._acquire_visited()
+        stamps = visited.stamps
+        epoch = visited.epoch
+        start_index = start_vertex.index
+        end_index = end_vertex.index
+
+        label_stamps[start_index] = label_epoch
+        distances[start_index] = 0.0
+        pred_indices[start_index] = -1
+
+        # heap entries are (estimated total distance, vertex index)
+        min_heap = [(heuristic(start_vertex, end_vertex), start_index)]
+        num_settled = 0
+        while len(min_heap) > 0:
+            _, current_index = heapq.heappop(min_heap)
+            if stamps[current_index] == epoch:
+                continue
+            stamps[current_index] = epoch
+            num_settled += 1
+
+            if current_index == end_index:
+                break
+
+            current_distance = distances[current_index]
+            for adj_index, edge_weight in self._get_edge_indices(current_index):
+                alternative_path_distance = current_distance + edge_weight
+
+                if label_stamps[adj_index] != label_epoch or alternative_path_distance < distances[adj_index]:
+                    label_stamps[adj_index] = label_epoch
+                    distances[adj_index] = alternative_path_distance
+                    pred_indices[adj_index] = current_index
+                    estimated_distance = alternative_path_distance + heuristic(vertices_by_index[adj_index],
+                                                                               end_vertex)
+                    heapq.heappush(min_heap, (estimated_distance, adj_index))
+
+        self._release_visited(visited)
+        self.last_settled_count = num_settled
+        path = self._get_labels_path(labels, start_index, end_index)
+        self._release_labels(labels)
+        return path
+
+    def shortest_path_bidirectional(self, start_vertex: Vertex, end_vertex: Vertex) -> list[Vertex]:
+        """
+        Returns the shortest path between two vertices using bidirectional Dijkstra, or an empty list if there is
+        no path. Searches forward from the start vertex and backward from the end vertex (using
+        get_edges_to_vertex) until the searches meet, which usually visits far fewer vertices than shortest_path().
+        Will not work if there are negative weights.
+        :param start_vertex: start vertex
+        :param end_vertex: end vertex
+        :return: list containing the shortest path from start vertex to end vertex, or empty if none
+        """
+        self.last_settled_count = 0
+        if start_vertex is end_vertex:
+            return []
+
+        # index 0 is the forward search, index 1 is the backward search
+        # backward pred_indices holds the next vertex index on the path to the end vertex
+        get_edges = (self._get_edge_indices, self._get_reverse_edge_indices)
+        labels = (self._acquire_labels(), self._acquire_labels())
+        distances = (labels[0].distances, labels[1].distances)
+        pred_indices = (labels[0].pred_indices, labels[1].pred_indices)
+        label_stamps = (labels[0].stamps, labels[1].stamps)
+        label_epochs = (labels[0].epoch, labels[1].epoch)
+        visited = (self._acquire_visited(), self._acquire_visited())
+        stamps = (visited[0].stamps, visited[1].stamps)
+        epochs = (visited[0].epoch, visited[1].epoch)
+        min_heaps = ([(0.0, start_vertex.index)], [(0.0, end_vertex.index)])
+        for direction, index in enumerate((start_vertex.index, end_vertex.index)):
+            label_stamps[direction][index] = label_epochs[direction]
+            distances[direction][index] = 0.0
+            pred_indices[direction][index] = -1
+
+        # shortest path found so far, through meeting index
+        best_distance = float('inf')
+        meeting_index = -1
+
+        num_settled = 0
+        while len(min_heaps[0]) > 0 and len(min_heaps[1]) > 0:
+            if min_heaps[0][0][0] + min_heaps[1][0][0] >= best_distance:
+                # neither search can find a shorter path
+                break
+
+            # advance whichever search has the closer vertex
+            direction = 0 if min_heaps[0][0][0] <= min_heaps[1][0][0] else 1
+            current_distance, current_index = heapq.heappop(min_heaps[direction])
+            if stamps[direction][current_index] == epochs[direction]:
+                continue
+            stamps[direction][current_index] = epochs[direction]
+            num_settled += 1
+
+            search_distances = distances[direction]
+            search_stamps = label_stamps[direction]
+            search_epoch = label_epochs[direction]
+            other_distances = distances[1 - direction]
+            other_stamps = label_stamps[1 - direction]
+            other_epoch = label_epochs[1 - direction]
+            for adj_index, edge_weight in get_edges[direction](current_index):
+                alternative_path_distance = current_distance + edge_weight
+
+                if search_stamps[adj_index] != search_epoch or alternative_path_distance < search_distances[adj_index]:
+                    search_stamps[adj_index] = search_epoch
+                    search_distances[adj_index] = alternative_path_distance
+                    pred_indices[direction][adj_index] = current_index
+                    heapq.heappush(min_heaps[direction], (alternative_path_distance, adj_index))
+
+                # check for a shorter path where the searches meet
+                if other_stamps[adj_index] != other_epoch:
+                    continue
+                total_distance = search_distances[adj_index] + other_distances[adj_index]
+                if total_distance < best_distance:
+                    best_distance = total_distance
+                    meeting_index = adj_index
+
+        self._release_visited(visited[0])
+        self._release_visited(visited[1])
+        self.last_settled_count = num_settled
+        if meeting_index < 0:
+            # no path
+            self._release_labels(labels[0])
+            self._release_labels(labels[1])
+            return []
+
+        # work backwards from the meeting vertex to the start, then forwards to the end
+        path = []
+        current_index = meeting_index
+        while current_index >= 0:
+            path.append(self.vertices_by_index[current_index])
+            current_index = pred_indices[0][current_index]
+        path.reverse()
+        current_index = pred_indices[1][meeting_index]
+        while current_index >= 0:
+            path.append(self.vertices_by_index[current_index])
+            current_index = pred_indices[1][current_index]
+        self._release_labels(labels[0])
+        self._release_labels(labels[1])
+        return path
+
+    def _acquire_visited(self) -> VisitedSet:
+        """
+        Internal method to get an empty visited set, large enough for all vertex indices, from the pool.
+        Each traversal that is in progress at the same time (like interleaved traversal iterators) gets a different
+        set. Return it with _release_visited when the traversal is finished.
+        """
+        visited = self.visited_pool.pop() if len(self.visited_pool) > 0 else VisitedSet()
+        visited.clear(len(self.vertices_by_index))
+        return visited
+
+    def _release_visited(self, visited: VisitedSet) -> None:
+        """
+        Internal method to return a visited set to the pool, so the next traversal can reuse it.
+        """
+        self.visited_pool.append(visited)
+
+    def _acquire_labels(self) -> SearchLabels:
+        """
+        Internal method to get empty shortest path search labels, large enough for all vertex indices, from the pool.
+        Return them with _release_labels when the search is finished.
+        """
+        labels = self.labels_pool.pop() if len(self.labels_pool) > 0 else SearchLabels()
+        labels.clear(len(self.vertices_by_index))
+        return labels
+
+    def _release_labels(self, labels: SearchLabels) -> None:
+        """
+        Internal method to return search labels to the pool, so the next search can reuse them.
+        """
+        self.labels_pool.append(labels)
+
+    def _get_labels_tree(self, start_vertex: Vertex, labels: SearchLabels) -> 'Graph.ShortestPathTree':
+        """
+        Internal method to copy search labels into new shortest paths from the start vertex, in O(V) time.
+        :param start_vertex: start vertex of the search
+        :param labels: labels set by the search
+        :return: shortest paths from the start vertex
+        """
+        num_vertices = len(self.vertices_by_index)
+        stamps = labels.stamps[:num_vertices]
+        epoch = labels.epoch
+        inf = float('inf')
+        distances = [distance if stamp == epoch else inf for stamp, distance in zip(stamps, labels.distances)]
+        pred_indices = [pred_index if stamp == epoch else -1 for stamp, pred_index in zip(stamps, labels.pred_indices)]
+        return self.ShortestPathTree(start_vertex, distances, pred_indices, self.vertices_by_index)
+
+    def _get_labels_path(self, labels: SearchLabels, start_index: int, end_index: int) -> list[Vertex]:
+        """
+        Internal method to find the shortest path from search labels, like ShortestPathTree.shortest_path.
+        Runs in O(path length) time.
+        :param labels: labels set by a search from the start vertex
+        :param start_index: index of the start vertex
+        :param end_index: index of the end vertex
+        :return: list containing the shortest path from start vertex to end vertex, or empty if none
+        """
         path = []
-        if pred_vertices[end_vertex.index] is None:
+        pred_indices = labels.pred_indices
+        if labels.stamps[end_index] != labels.epoch or pred_indices[end_index] < 0:
             # no path
             return path
 
-        current_vertex = end_vertex
-        while current_vertex is not start_vertex:
-            path.append(current_vertex)
-            current_vertex = pred_vertices[current_vertex.index]
-        path.append(start_vertex)
+        vertices_by_index = self.vertices_by_index
+        current_index = end_index
+        while current_index != start_index:
+            path.append(vertices_by_index[current_index])
+            current_index = pred_indices[current_index]
+        path.append(vertices_by_index[start_index])
         path.reverse()
         return path
+
+    def _edge_added(self, source_index: int, dest_index: int, weight: float) -> None:
+        """
+        Internal method called by add_edge after an edge is added, or the weight of an existing edge is changed.
+        :param source_index: index of the source vertex
+        :param dest_index: index of the destination vertex
+        :param weight: weight of the edge
+        """
+        if weight < 0:
+            self.negative_weights = True
+        elif self.negative_weights:
+            # may have replaced a negative weight
+            self.negative_weights = None
+
+        # an edge back makes an undirected edge
+        vertices_by_index = self.vertices_by_index
+        if (self.undirected_components is not None and
+                self.get_edge_weight(vertices_by_index[dest_index], vertices_by_index[source_index]) is not None):
+            self.undirected_components.union(source_index, dest_index)
+
+        if self.acyclic and self.topological_positions[source_index] >= self.topological_positions[dest_index]:
+            # the edge goes backwards in topological order, so it may make a cycle
+            self._clear_acyclic()
+
+        # repair cached shortest paths instead of clearing them
+        cache = self.shortest_path_cache
+        for start_index, tree in list(cache.items()):
+            repaired_tree = tree._edge_added(self, source_index, dest_index, weight)
+            if repaired_tree is None:
+                del cache[start_index]
+            elif repaired_tree is not tree:
+                cache.replace(start_index, repaired_tree)
+        self._graph_modified(clear_shortest_paths=False)
+
+    def _graph_modified(self, clear_shortest_paths: bool = True) -> None:
+        """
+        Internal method called whenever a vertex or edge is added, to clear cached results.
+        :param clear_shortest_paths: false if cached shortest paths have already been updated
+        """
+        if clear_shortest_paths:
+            self.shortest_path_cache.clear()
+        self.reachability = None
+
+    def _clear_acyclic(self) -> None:
+        """
+        Internal method called when edges or vertices are removed, or an added edge may make a cycle, so is_acyclic
+        checks the graph again.
+        """
+        self.acyclic = None
+        self.topological_indices = None
+        self.topological_positions = None
@@ -0,0 +1,197 @@
+from typing import Optional, Iterator, Tuple, Iterable
+
+import numpy as np
+
+from module8.graph import Graph
+from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+
+
+class GraphAdaptive[K, V](Graph[K, V]):
+    """
+    Graph that stores edges in an adjacency list while it is sparse, and switches to an adjacency matrix when it
+    becomes dense (and back again), based on the edge density E / V².
+    The thresholds for switching are different, so a graph near a threshold doesn't switch back and forth on every
+    change (hysteresis). Each switch copies all edges in O(V + E) time (O(V²) from a matrix).
+    """
+
+    # switch to an adjacency matrix when the density rises to dense_threshold,
+    # and back to an adjacency list when it falls below sparse_threshold
+    dense_threshold = 0.25
+    sparse_threshold = 0.1
+
+    def __init__(self):
+        super().__init__()
+        # graph that stores the edges, with the same vertex keys and indices as this graph
+        self.storage: GraphAdjacencyList[K, None] | GraphAdjacencyMatrix[K, None] = self._create_storage(False)
+        self.edge_count = 0  # number of edges, used to calculate the density
+        self.layout_switch_count = 0  # number of times the storage has switched, used for performance testing
+
+    def density(self) -> float:
+        """
+        Returns the fraction of all possible edges (including loops) that are in the graph, E / V².
+        :return: edge density between 0 and 1, or 0 if there are no vertices
+        """
+        num_vertices = len(self.vertices)
+        return self.edge_count / (num_vertices * num_vertices) if num_vertices > 0 else 0.0
+
+    def is_dense(self) -> bool:
+        """
+        Returns true if edges are currently stored in an adjacency matrix, false if in an adjacency list.
+        """
+        return isinstance(self.storage, GraphAdjacencyMatrix)
+
+    def add_vertex(self, key: K, data: V = None) -> Graph.Vertex:
+        vertex = super().add_vertex(key, data)
+        self.storage.add_vertex(key)
+        self._update_layout()
+        return vertex
+
+    def add_vertices(self, keys: Iterable[K], values: Optional[Iterable[V]] = None) -> list[Graph.Vertex]:
+        vertices = super().add_vertices(keys, values)
+        self.storage.add_vertices([vertex.key for vertex in vertices])
+        self._update_layout()
+        return vertices
+
+    def add_edge(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex, weight: float = 1.0) -> None:
+        """
+        Adds a new directed edge to the graph.
+        :param source_vertex: source vertex
+        :param dest_vertex: destination vertex
+        :param weight: weight of the edge (1 by default)
+        """
+        if self.storage.get_edge_weight(source_vertex, dest_vertex) is None:
+            self.edge_count += 1
+        self.storage.add_edge(source_vertex, dest_vertex, weight)
+        # the weight as stored, which the matrix rounds to its precision
+        stored_weight = self.storage.get_edge_weight(source_vertex, dest_vertex)
+        self._edge_added(source_vertex.index, dest_vertex.index, stored_weight)
+        self._update_layout()
+
+    def _add_edges(self, source_indices: np.ndarray, target_indices: np.ndarray, weights: np.ndarray) -> None:
+        self.storage._add_edges(source_indices, target_indices, weights)
+        # batches may contain existing or repeated edges, so count again
+        self.edge_count = self._count_edges()
+        self._update_layout()
+
+    def get_edge_weight(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex) -> Optional[float]:
+        """
+        Returns the weight of the edge between two vertices, or None if there is no edge.
+        :param source_vertex: source vertex
+        :param dest_vertex: destination vertex
+        :return: weight of the edge, or None if there is no edge
+        """
+        return self.storage.get_edge_weight(source_vertex, dest_vertex)
+
+    def get_edges_from_vertex(self, source_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+         Returns an iterator over all destination vertices and weights from the given vertex.
+         Edges will be returned in the order they were added while sparse, or in the order the destination vertex
+         was added while dense.
+         :param source_vertex: source vertex
+         :return: an iterator, which may be empty, over all destination vertices and weights from this vertex
+         """
+        vertices_by_index = self.vertices_by_index
+        return ((vertices_by_index[dest_index], weight)
+                for dest_index, weight in self.storage._get_edge_indices(source_vertex.index))
+
+    def get_edges_to_vertex(self, dest_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+         Returns an iterator over all source vertices and weights of edges to the given vertex.
+         :param dest_vertex: destination vertex
+         :return: an iterator, which may be empty, over all source vertices and weights to this vertex
+         """
+        vertices_by_index = self.vertices_by_index
+        return ((vertices_by_index[source_index], weight)
+                for source_index, weight in self.storage._get_reverse_edge_indices(dest_vertex.index))
+
+    def _get_edge_indices(self, source_index: int) -> Iterable[Tuple[int, float]]:
+        return self.storage._get_edge_indices(source_index)
+
+    def _get_reverse_edge_indices(self, dest_index: int) -> Iterable[Tuple[int, float]]:
+        return self.storage._get_reverse_edge_indices(dest_index)
+
+    def _breadth_first_distances(self, source_indices: np.ndarray) -> np.ndarray:
+        return self.storage._breadth_first_distances(source_indices)
+
+    def remove_vertex(self, vertex: Graph.Vertex) -> None:
+        super().remove_vertex(vertex)
+        self._update_layout()
+
+    def _remove_edge(self, source_index: int, dest_index: int) -> bool:
+        if not self.storage._remove_edge(source_index, dest_index):
+            return False
+        self.edge_count -= 1
+        self._update_layout()
+        return True
+
+    def _remove_vertex_edges(self, index: int) -> None:
+        # the storage keeps a matching tombstone, so its indices stay the same
+        storage_vertex = self.storage.vertices_by_index[index]
+        num_edges = (sum(1 for _ in self.storage._get_edge_indices(index)) +
+                     sum(1 for source_index, _ in self.storage._get_reverse_edge_indices(index)
+                         if source_index != index))
+        self.storage.remove_vertex(storage_vertex)
+        self.edge_count -= num_edges
+
+    def _compact(self, live_indices: list[int]) -> None:
+        self.storage.compact()
+
+    def _update_layout(self) -> None:
+        """
+        Internal method to switch storage if the density has crossed a threshold.
+        """
+        density = self.density()
+        if not self.is_dense() and density >= self.dense_threshold:
+            self._switch_storage(True)
+        elif self.is_dense() and density < self.sparse_threshold:
+            self._switch_storage(False)
+
+    def _switch_storage(self, dense: bool) -> None:
+        """
+        Internal method to copy all edges to a new adjacency list or matrix, with the same vertex indices.
+        :param dense: true to switch to an adjacency matrix, false to switch to an adjacency list
+        """
+        old_storage = self.storage
+        storage = self._create_storage(dense)
+        # tombstones get unique placeholder keys, and are then removed, so indices don't change
+        storage.add_vertices([vertex.key if vertex is not None else object() for vertex in self.vertices_by_index])
+        for index, vertex in enumerate(self.vertices_by_index):
+            if vertex is None:
+                storage.remove_vertex(storage.vertices_by_index[index])
+
+        sources = []
+        targets = []
+        weights = []
+        for source_index in range(len(self.vertices_by_index)):
+            for dest_index, weight in old_storage._get_edge_indices(source_index):
+                sources.append(source_index)
+                targets.append(dest_index)
+                weights.append(weight)
+        storage.add_edges(sources, targets, weights, by_index=True)
+
+        self.storage = storage
+        self.layout_switch_count += 1
+
+    def _count_edges(self) -> int:
+        """
+        Internal method to count the edges in storage, in O(V) time for an adjacency list or O(V²) for a matrix.
+        """
+        if isinstance(self.storage, GraphAdjacencyMatrix):
+            num_vertices = len(self.vertices_by_index)
+            return int(np.count_nonzero(self.storage.adjacency_matrix[:num_vertices, :num_vertices] != np.inf))
+        return sum(map(len, self.storage.edges_by_source))
+
+    @staticmethod
+    def _create_storage(dense: bool) -> GraphAdjacencyList | GraphAdjacencyMatrix:
+        storage = GraphAdjacencyMatrix() if dense else GraphAdjacencyList()
+        # only compacted when this graph is compacted, so indices always match
+        storage.compact_threshold = float('inf')
+        return storage
+
+    def edges_ordered(self) -> bool:
+        """
+        Returns true if edge order is currently preserved (while stored in an adjacency list).
+        Used for testing.
+        """
+        return self.storage.edges_ordered()
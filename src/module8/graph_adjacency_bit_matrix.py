@@ -0,0 +1,166 @@
+from itertools import repeat
+from typing import Optional, Iterator, Tuple, Iterable
+
+import numpy as np
+
+from module8.graph import Graph
+
+
+class GraphAdjacencyBitMatrix[K, V](Graph[K, V]):
+    """
+    Unweighted graph implemented with an adjacency matrix, where each row is a bitset stored in a Python int.
+    Uses 1 bit per cell instead of 32, and a breadth first search expands a whole frontier with one OR per vertex.
+    All edges have weight 1.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # bit d of rows[s] is set if there is an edge from the vertex with index s to the vertex with index d
+        self.rows = list[int]()
+
+    def add_vertex(self, key: K, data: V = None) -> Graph.Vertex:
+        vertex = super().add_vertex(key, data)
+        self.rows.append(0)
+        return vertex
+
+    def add_vertices(self, keys: Iterable[K], values: Optional[Iterable[V]] = None) -> list[Graph.Vertex]:
+        vertices = super().add_vertices(keys, values)
+        self.rows.extend(repeat(0, len(vertices)))
+        return vertices
+
+    def add_edge(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex, weight: float = 1.0) -> None:
+        """
+        Adds a new directed edge to the graph.
+        :param source_vertex: source vertex
+        :param dest_vertex: destination vertex
+        :param weight: weight of the edge, which must be 1
+        :raises ValueError: if the weight is not 1
+        """
+        if weight != 1:
+            raise ValueError(f'Edge weight must be 1 in an unweighted graph, got {weight}')
+        self.rows[source_vertex.index] |= 1 << dest_vertex.index
+        self._edge_added(source_vertex.index, dest_vertex.index, weight)
+
+    def add_edges(self, sources: Iterable, targets: Iterable, weights: Optional[Iterable[float] | float] = None,
+                  by_index: bool = False, undirected: bool = False) -> None:
+        """
+        Adds new directed edges to the graph in one batch (see Graph.add_edges).
+        :raises ValueError: if any weight is not 1 (nothing is added)
+        """
+        if weights is not None and np.any(np.asarray(weights) != 1):
+            raise ValueError('Edge weights must be 1 in an unweighted graph')
+        super().add_edges(sources, targets, weights, by_index, undirected)
+
+    def _add_edges(self, source_indices: np.ndarray, target_indices: np.ndarray, weights: np.ndarray) -> None:
+        rows = self.rows
+        for source_index, target_index in zip(source_indices.tolist(), target_indices.tolist()):
+            rows[source_index] |= 1 << target_index
+
+    def get_edge_weight(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex) -> Optional[float]:
+        """
+        Returns the weight of the edge between two vertices, or None if there is no edge.
+        :param source_vertex: source vertex
+        :param dest_vertex: destination vertex
+        :return: 1 if there is an edge, or None if there is no edge
+        """
+        return 1.0 if self.rows[source_vertex.index] >> dest_vertex.index & 1 else None
+
+    def get_edges_from_vertex(self, source_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+         Returns an iterator over all destination vertices and weights from the given vertex.
+         Edges will be returned in the order that the target vertex was added.
+         :param source_vertex: source vertex
+         :return: an iterator, which may be empty, over all destination vertices and weights from this vertex
+         """
+        return zip(map(self.vertices_by_index.__getitem__, self._get_bit_indices(self.rows[source_vertex.index])),
+                   repeat(1.0))
+
+    def get_edges_to_vertex(self, dest_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+         Returns an iterator over all source vertices and weights of edges to the given vertex.
+         Checks every row, so takes O(V) time.
+         :param dest_vertex: destination vertex
+         :return: an iterator, which may be empty, over all source vertices and weights to this vertex
+         """
+        return zip(map(self.vertices_by_index.__getitem__, self._get_source_indices(dest_vertex.index)),
+                   repeat(1.0))
+
+    def _get_edge_indices(self, source_index: int) -> Iterable[Tuple[int, float]]:
+        return zip(self._get_bit_indices(self.rows[source_index]), repeat(1.0))
+
+    def _get_reverse_edge_indices(self, dest_index: int) -> Iterable[Tuple[int, float]]:
+        return zip(self._get_source_indices(dest_index), repeat(1.0))
+
+    def _get_source_indices(self, dest_index: int) -> list[int]:
+        return [source_index for source_index, row in enumerate(self.rows) if row >> dest_index & 1]
+
+    def _breadth_first_distances(self, source_indices: np.ndarray) -> np.ndarray:
+        """
+        Bitwise breadth first distances. The next frontier is the OR of the rows of all frontier vertices, masked by
+        the unvisited bits, so each level takes one big-integer OR per frontier vertex.
+        """
+        rows = self.rows
+        distances = np.full(len(self.vertices_by_index), -1, dtype=np.int64)
+        visited = 0
+        for index in source_indices.tolist():
+            visited |= 1 << index
+
+        frontier = visited
+        level = 0
+        while frontier:
+            frontier_indices = self._get_bit_indices(frontier)
+            distances[frontier_indices] = level
+            reached = 0
+            for index in frontier_indices:
+                reached |= rows[index]
+            frontier = reached & ~visited
+            visited |= frontier
+            level += 1
+        return distances
+
+    def _remove_edge(self, source_index: int, dest_index: int) -> bool:
+        bit = 1 << dest_index
+        if not self.rows[source_index] & bit:
+            return False
+        self.rows[source_index] &= ~bit
+        return True
+
+    def _remove_vertex_edges(self, index: int) -> None:
+        self.rows[index] = 0
+        mask = ~(1 << index)
+        self.rows = [row & mask for row in self.rows]
+
+    def _compact(self, live_indices: list[int]) -> None:
+        num_bytes = (len(self.rows) + 7) // 8
+        self.rows = [self._pack_bits(self._unpack_bits(self.rows[index], num_bytes)[live_indices])
+                     for index in live_indices]
+
+    @staticmethod
+    def _get_bit_indices(bits: int) -> list[int]:
+        """
+        Returns the indices of all set bits in increasing order, in O(number of bits) vectorized time.
+        """
+        if bits == 0:
+            return []
+        return np.flatnonzero(GraphAdjacencyBitMatrix._unpack_bits(bits, (bits.bit_length() + 7) // 8)).tolist()
+
+    @staticmethod
+    def _unpack_bits(bits: int, num_bytes: int) -> np.ndarray:
+        """
+        Converts a bitset to an array of 0 or 1 for each bit, with 8 * num_bytes elements.
+        """
+        return np.unpackbits(np.frombuffer(bits.to_bytes(num_bytes, 'little'), dtype=np.uint8), bitorder='little')
+
+    @staticmethod
+    def _pack_bits(bit_array: np.ndarray) -> int:
+        """
+        Converts an array of 0 or 1 for each bit to a bitset.
+        """
+        return int.from_bytes(np.packbits(bit_array, bitorder='little').tobytes(), 'little')
+
+    def edges_ordered(self) -> bool:
+        """
+        Returns false because edge order is not preserved.
+        Used for testing.
+        """
+        return False
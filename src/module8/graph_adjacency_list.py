@@ -1,4 +1,6 @@
-from typing import Optional, Iterator, Tuple
+from typing import Optional, Iterator, Tuple, Iterable
+
+import numpy as np
 
 from module8.graph import Graph
 
@@ -11,15 +13,28 @@ class GraphAdjacencyList[K, V](Graph[K, V]):
 
     def __init__(self):
         super().__init__()
-        self.edges_by_source: dict[K, dict[K, float]] = {}
+        # edges are stored by vertex index: edges_by_source[source index][dest index] = weight
+        self.edges_by_source = list[dict[int, float]]()
+        # reverse index of edges, used for backward searches: edges_by_dest[dest index][source index] = weight
+        self.edges_by_dest = list[dict[int, float]]()
 
-    def add_vertex(self, key: K, data: V = None) -> Optional[V]:
+    def add_vertex(self, key: K, data: V = None) -> Graph.Vertex:
         vertex = super().add_vertex(key, data)
 
         # populate empty edge list after adding vertex
-        self.edges_by_source[key] = {}
+        self.edges_by_source.append({})
+        self.edges_by_dest.append({})
         return vertex
 
+    def add_vertices(self, keys: Iterable[K], values: Optional[Iterable[V]] = None) -> list[Graph.Vertex]:
+        vertices = super().add_vertices(keys, values)
+
+        # populate empty edge lists after adding vertices
+        for _ in vertices:
+            self.edges_by_source.append({})
+            self.edges_by_dest.append({})
+        return vertices
+
     def get_edge_weight(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex) -> Optional[float]:
         """
         Returns the weight of the edge between two vertices, or None if there is no edge.
@@ -27,7 +42,7 @@ class GraphAdjacencyList[K, V](Graph[K, V]):
         :param dest_vertex: destination vertex
         :return: weight of the edge, or None if there is no edge
         """
-        return self.edges_by_source[source_vertex.key].get(dest_vertex.key, None)
+        return self.edges_by_source[source_vertex.index].get(dest_vertex.index, None)
 
     def add_edge(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex, weight: float = 1.0) -> None:
         """
@@ -36,7 +51,46 @@ class GraphAdjacencyList[K, V](Graph[K, V]):
         :param dest_vertex: destination vertex
         :param weight: weight of the edge (1 by default)
         """
-        self.edges_by_source[source_vertex.key][dest_vertex.key] = weight
+        self.edges_by_source[source_vertex.index][dest_vertex.index] = weight
+        self.edges_by_dest[dest_vertex.index][source_vertex.index] = weight
+        self._edge_added(source_vertex.index, dest_vertex.index, weight)
+
+    def _add_edges(self, source_indices: np.ndarray, target_indices: np.ndarray, weights: np.ndarray) -> None:
+        edges_by_source = self.edges_by_source
+        edges_by_dest = self.edges_by_dest
+        for source_index, target_index, weight in zip(source_indices.tolist(), target_indices.tolist(),
+                                                      weights.tolist()):
+            edges_by_source[source_index][target_index] = weight
+            edges_by_dest[target_index][source_index] = weight
+
+    def _remove_edge(self, source_index: int, dest_index: int) -> bool:
+        if dest_index not in self.edges_by_source[source_index]:
+            return False
+        del self.edges_by_source[source_index][dest_index]
+        del self.edges_by_dest[dest_index][source_index]
+        return True
+
+    def _remove_vertex_edges(self, index: int) -> None:
+        for dest_index in self.edges_by_source[index]:
+            if dest_index != index:
+                del self.edges_by_dest[dest_index][index]
+        for source_index in self.edges_by_dest[index]:
+            if source_index != index:
+                del self.edges_by_source[source_index][index]
+        self.edges_by_source[index] = {}
+        self.edges_by_dest[index] = {}
+
+    def _compact(self, live_indices: list[int]) -> None:
+        new_indices = [-1] * len(self.edges_by_source)
+        for new_index, old_index in enumerate(live_indices):
+            new_indices[old_index] = new_index
+        # dictionaries are rebuilt in the same order, so edge order is preserved
+        self.edges_by_source = [{new_indices[dest_index]: weight
+                                 for dest_index, weight in self.edges_by_source[old_index].items()}
+                                for old_index in live_indices]
+        self.edges_by_dest = [{new_indices[source_index]: weight
+                               for source_index, weight in self.edges_by_dest[old_index].items()}
+                              for old_index in live_indices]
 
     def get_edges_from_vertex(self, source_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
         """
@@ -45,8 +99,24 @@ class GraphAdjacencyList[K, V](Graph[K, V]):
          :param source_vertex: source vertex
          :return: an iterator, which may be empty, over all destination vertices and weights from this vertex
          """
-        for key, weight in self.edges_by_source.get(source_vertex.key, {}).items():
-            yield self.get_vertex(key), weight
+        edges = self.edges_by_source[source_vertex.index]
+        return zip(map(self.vertices_by_index.__getitem__, edges.keys()), edges.values())
+
+    def get_edges_to_vertex(self, dest_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+         Returns an iterator over all source vertices and weights of edges to the given vertex.
+         Edges will be returned in the order they were added.
+         :param dest_vertex: destination vertex
+         :return: an iterator, which may be empty, over all source vertices and weights to this vertex
+         """
+        edges = self.edges_by_dest[dest_vertex.index]
+        return zip(map(self.vertices_by_index.__getitem__, edges.keys()), edges.values())
+
+    def _get_edge_indices(self, source_index: int) -> Iterable[Tuple[int, float]]:
+        return self.edges_by_source[source_index].items()
+
+    def _get_reverse_edge_indices(self, dest_index: int) -> Iterable[Tuple[int, float]]:
+        return self.edges_by_dest[dest_index].items()
 
     def edges_ordered(self) -> bool:
         """
@@ -1,6 +1,8 @@
-import itertools
 from array import array
-from typing import Optional, Iterator, Tuple
+from bisect import insort, bisect_left
+from typing import Optional, Iterator, Tuple, Iterable
+
+import numpy as np
 
 from module8.graph import Graph
 
@@ -8,23 +10,100 @@ from module8.graph import Graph
 class GraphAdjacencyMatrix[K, V](Graph[K, V]):
     """
     Graph implemented with an adjacency matrix.
-    All vertices must be added before any edge is added.
+    The matrix capacity doubles when it is full, so vertices can be added at any time.
+    The columns of the edges in each sparse row are also kept in a sorted list, so edges from a vertex are found in
+    O(out-degree) time instead of scanning the whole row.
     Most of the logic is implemented in the Graph abstract base class
     """
+    start_capacity = 8
+    # rows with more edges than this fraction of the capacity are scanned instead of indexed (see row_columns),
+    # so the index takes at most 1/16 of the memory of the matrix
+    row_index_threshold = 1 / 16
+
+    class AllPairsShortestPaths:
+        """
+        Shortest paths between all pairs of vertices. Use GraphAdjacencyMatrix.all_pairs_shortest_paths() to create.
+        """
+
+        def __init__(self, vertices_by_index: list[Graph.Vertex], distances: np.ndarray, pred_indices: np.ndarray):
+            """
+            Initialize the shortest paths.
+            :param vertices_by_index: vertices in index order
+            :param distances: distances[i, j] is the length of the shortest path from vertex i to vertex j
+            :param pred_indices: pred_indices[i, j] is the index of the vertex before j on the shortest path from
+                vertex i to vertex j, or -1 if there is no path
+            """
+            self.vertices_by_index = vertices_by_index
+            self.distances = distances
+            self.pred_indices = pred_indices
+
+        def distance(self, start_vertex: Graph.Vertex, end_vertex: Graph.Vertex) -> float:
+            """
+            Returns the length of the shortest path between two vertices, or inf if there is no path.
+            :param start_vertex: start vertex
+            :param end_vertex: end vertex
+            :return: length of the shortest path
+            """
+            return float(self.distances[start_vertex.index, end_vertex.index])
+
+        def shortest_path(self, start_vertex: Graph.Vertex, end_vertex: Graph.Vertex) -> list[Graph.Vertex]:
+            """
+            Returns the shortest path between two vertices, or an empty list if there is no path.
+            Runs in O(path length) time.
+            :param start_vertex: start vertex
+            :param end_vertex: end vertex
+            :return: list containing the shortest path from start vertex to end vertex, or empty if none
+            """
+            path = []
+            pred_row = self.pred_indices[start_vertex.index]
+            if pred_row[end_vertex.index] < 0:
+                # no path
+                return path
+
+            current_index = end_vertex.index
+            while current_index != start_vertex.index:
+                path.append(self.vertices_by_index[current_index])
+                current_index = int(pred_row[current_index])
+            path.append(start_vertex)
+            path.reverse()
+            return path
 
     def __init__(self):
         super().__init__()
 
-        # adjacency matrix uses weight or None if no path
-        # 1 dimensional, use get_edge_index() to get index
-        # None until first edge is added
-        self.adjacency_matrix = None
+        # adjacency matrix uses weight or inf if no path
+        # 2 dimensional, indexed by [source index, dest index]
+        # rows and columns past the number of vertices are unused capacity
+        self.adjacency_matrix = self._create_matrix(self.start_capacity)
+        # view of the matrix, which reads single cells as Python floats much faster than indexing the array
+        self.matrix_view = memoryview(self.adjacency_matrix)
+        # row index -> sorted column indices of the edges in that row, or None if the row is too dense to index
+        self.row_columns = list[Optional[array]]()
+
+        # cached result of all_pairs_shortest_paths(), cleared when the graph is modified
+        self.all_pairs = None
+
+    def add_vertex(self, key: K, data: V = None) -> Graph.Vertex:
+        vertex = super().add_vertex(key, data)
+        self.row_columns.append(array('i'))
+
+        # double capacity if matrix is full (amortized O(V) per vertex)
+        capacity = len(self.adjacency_matrix)
+        if len(self.vertices_by_index) > capacity:
+            self._resize(capacity * 2)
+        return vertex
+
+    def add_vertices(self, keys: Iterable[K], values: Optional[Iterable[V]] = None) -> list[Graph.Vertex]:
+        vertices = super().add_vertices(keys, values)
+        self.row_columns.extend(array('i') for _ in vertices)
 
-    def add_vertex(self, key: K, data: V = None) -> Optional[V]:
-        # verify that vertices are added before edges (so matrix can be allocated with proper size)
-        if self.adjacency_matrix is not None:
-            raise ValueError('Must add all vertices before any edges are added')
-        return super().add_vertex(key, data)
+        # grow to the next power of 2 that fits all vertices (only copy the matrix once)
+        capacity = len(self.adjacency_matrix)
+        while len(self.vertices_by_index) > capacity:
+            capacity *= 2
+        if capacity > len(self.adjacency_matrix):
+            self._resize(capacity)
+        return vertices
 
     def add_edge(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex, weight: float = 1.0) -> None:
         """
@@ -33,13 +112,74 @@ class GraphAdjacencyMatrix[K, V](Graph[K, V]):
         :param dest_vertex: destination vertex
         :param weight: weight of the edge (1 by default)
         """
-        if self.adjacency_matrix is None:
-            # initialize matrix if this is the first edge added
-            # Note: use array module for better efficiency, at the cost of needing to convert 'inf' to None.
-            self.adjacency_matrix = array('f', itertools.repeat(float('inf'), len(self.vertices) ** 2))
-        # set edge weight
-        # convert 2d square index to 1d index using _get_edge_index
-        self.adjacency_matrix[self._get_edge_index(source_vertex, dest_vertex)] = weight
+        source_index = source_vertex.index
+        columns = self.row_columns[source_index]
+        if columns is not None and self.adjacency_matrix[source_index, dest_vertex.index] == np.inf:
+            if len(columns) >= self.row_index_threshold * len(self.adjacency_matrix):
+                # too dense to index
+                self.row_columns[source_index] = None
+            else:
+                insort(columns, dest_vertex.index)
+        self.adjacency_matrix[source_index, dest_vertex.index] = weight
+        # repair cached shortest paths with the weight as stored, rounded to the matrix's precision, so they match
+        # paths found again from the matrix
+        self._edge_added(source_index, dest_vertex.index, self.matrix_view[source_index, dest_vertex.index])
+
+    def _add_edges(self, source_indices: np.ndarray, target_indices: np.ndarray, weights: np.ndarray) -> None:
+        is_new = self.adjacency_matrix[source_indices, target_indices] == np.inf
+        # vectorized assignment of all weights
+        self.adjacency_matrix[source_indices, target_indices] = weights
+
+        # index each row with new edges again, in O(V) vectorized time per row
+        num_vertices = len(self.vertices_by_index)
+        new_counts = np.bincount(source_indices[is_new], minlength=num_vertices)
+        for source_index in np.flatnonzero(new_counts).tolist():
+            columns = self.row_columns[source_index]
+            if columns is None:
+                continue
+            if len(columns) + new_counts[source_index] > self.row_index_threshold * len(self.adjacency_matrix):
+                # too dense to index, even if some new edges are repeated
+                self.row_columns[source_index] = None
+            else:
+                self.row_columns[source_index] = self._index_row(self.adjacency_matrix[source_index, :num_vertices])
+
+    def _remove_edge(self, source_index: int, dest_index: int) -> bool:
+        if self.adjacency_matrix[source_index, dest_index] == np.inf:
+            return False
+        self.adjacency_matrix[source_index, dest_index] = np.inf
+        self._remove_row_column(source_index, dest_index)
+        return True
+
+    def _remove_vertex_edges(self, index: int) -> None:
+        num_vertices = len(self.vertices_by_index)
+        for source_index in np.flatnonzero(self.adjacency_matrix[:num_vertices, index] != np.inf).tolist():
+            self._remove_row_column(source_index, index)
+        self.row_columns[index] = array('i')
+        self.adjacency_matrix[index, :] = np.inf
+        self.adjacency_matrix[:, index] = np.inf
+
+    def _remove_row_column(self, source_index: int, dest_index: int) -> None:
+        """
+        Internal method to remove an edge from the row index, if the row is indexed.
+        """
+        columns = self.row_columns[source_index]
+        if columns is not None:
+            del columns[bisect_left(columns, dest_index)]
+
+    def _compact(self, live_indices: list[int]) -> None:
+        # shrink to the smallest power of 2 that fits the remaining vertices
+        capacity = self.start_capacity
+        while len(live_indices) > capacity:
+            capacity *= 2
+        live_indices = np.array(live_indices, dtype=np.int64)
+        num_vertices = len(live_indices)
+        old_matrix = self.adjacency_matrix
+        self.adjacency_matrix = self._create_matrix(capacity)
+        self.adjacency_matrix[:num_vertices, :num_vertices] = old_matrix[np.ix_(live_indices, live_indices)]
+        self.matrix_view = memoryview(self.adjacency_matrix)
+
+        # columns have moved, and some rows may be sparse enough to index again
+        self.row_columns = [self._index_row(row) for row in self.adjacency_matrix[:num_vertices, :num_vertices]]
 
     def get_edge_weight(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex) -> Optional[float]:
         """
@@ -48,13 +188,8 @@ class GraphAdjacencyMatrix[K, V](Graph[K, V]):
         :param dest_vertex: destination vertex
         :return: weight of the edge, or None if there is no edge
         """
-        if self.adjacency_matrix is not None:
-            # convert 2d square index to 1d index using _get_edge_index
-            weight = self.adjacency_matrix[self._get_edge_index(source_vertex, dest_vertex)]
-            return weight if weight != float('inf') else None
-        else:
-            # special case for no edges added
-            return None
+        weight = self.matrix_view[source_vertex.index, dest_vertex.index]
+        return weight if weight != np.inf else None
 
     def get_edges_from_vertex(self, source_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
         """
@@ -63,12 +198,106 @@ class GraphAdjacencyMatrix[K, V](Graph[K, V]):
          :param source_vertex: source vertex
          :return: an iterator, which may be empty, over all destination vertices and weights from this vertex
          """
-        if self.adjacency_matrix is not None:
-            base_index = self._get_base_index(source_vertex)
-            for dest_vertex in self.vertices.values():
-                weight = self.adjacency_matrix[base_index + dest_vertex.index]
-                if weight != float('inf'):
-                    yield dest_vertex, weight
+        vertices_by_index = self.vertices_by_index
+        return ((vertices_by_index[dest_index], weight)
+                for dest_index, weight in self._get_edge_indices(source_vertex.index))
+
+    def get_edges_to_vertex(self, dest_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+         Returns an iterator over all source vertices and weights of edges to the given vertex.
+         Edges will be returned in the order that the source vertex was added.
+         :param dest_vertex: destination vertex
+         :return: an iterator, which may be empty, over all source vertices and weights to this vertex
+         """
+        num_vertices = len(self.vertices_by_index)
+        source_indices, weights = self._get_edge_lists(self.adjacency_matrix[:num_vertices, dest_vertex.index])
+        return zip(map(self.vertices_by_index.__getitem__, source_indices), weights)
+
+    def _get_edge_indices(self, source_index: int) -> Iterable[Tuple[int, float]]:
+        columns = self.row_columns[source_index]
+        if columns is None:
+            return zip(*self._get_edge_lists(self.adjacency_matrix[source_index, :len(self.vertices_by_index)]))
+        matrix_view = self.matrix_view
+        return [(dest_index, matrix_view[source_index, dest_index]) for dest_index in columns]
+
+    def _get_reverse_edge_indices(self, dest_index: int) -> Iterable[Tuple[int, float]]:
+        return zip(*self._get_edge_lists(self.adjacency_matrix[:len(self.vertices_by_index), dest_index]))
+
+    def _index_row(self, row: np.ndarray) -> Optional[array]:
+        """
+        Internal method to find the sorted columns of the edges in a row of the matrix.
+        :param row: row of the matrix
+        :return: column indices of the edges, or None if the row is too dense to index
+        """
+        columns = np.flatnonzero(row != np.inf)
+        if len(columns) > self.row_index_threshold * len(self.adjacency_matrix):
+            return None
+        return array('i', columns.tolist())
+
+    @staticmethod
+    def _get_edge_lists(weights: np.ndarray) -> tuple[list[int], list[float]]:
+        """
+        Vectorized scan of a row or column of the matrix for edges.
+        :param weights: row or column of the matrix
+        :return: list of indices with edges, and list of weights of those edges
+        """
+        indices = np.nonzero(weights != np.inf)[0]
+        return indices.tolist(), weights[indices].tolist()
+
+    def all_pairs_shortest_paths(self) -> AllPairsShortestPaths:
+        """
+        Returns the shortest paths between all pairs of vertices, using a vectorized Floyd-Warshall algorithm.
+        Takes O(V³) time (in V vectorized steps) and O(V²) space, and the result is cached until the graph is
+        modified.
+        Negative weights are allowed, but not negative weight cycles.
+        :return: shortest paths between all pairs of vertices
+        :raises ValueError: if the graph contains a negative weight cycle
+        """
+        if self.all_pairs is None:
+            num_vertices = len(self.vertices_by_index)
+            # use 64-bit floats to avoid accumulating rounding errors
+            distances = self.adjacency_matrix[:num_vertices, :num_vertices].astype(np.float64)
+            # predecessor of j on the path from i is i if there is a direct edge
+            pred_indices = np.where(distances != np.inf, np.arange(num_vertices)[:, np.newaxis], -1)
+            np.fill_diagonal(distances, np.minimum(distances.diagonal(), 0.0))
+            np.fill_diagonal(pred_indices, -1)
+
+            for k in range(num_vertices):
+                # update all paths i->j that are shorter when going through k: i->k->j
+                alternative_distances = distances[:, k, np.newaxis] + distances[np.newaxis, k, :]
+                shorter = alternative_distances < distances
+                np.copyto(distances, alternative_distances, where=shorter)
+                np.copyto(pred_indices, np.broadcast_to(pred_indices[k], pred_indices.shape), where=shorter)
+
+            if np.any(distances.diagonal() < 0):
+                raise ValueError('Graph contains a negative weight cycle')
+            self.all_pairs = self.AllPairsShortestPaths(self.vertices_by_index, distances, pred_indices)
+        return self.all_pairs
+
+    def _breadth_first_distances(self, source_indices: np.ndarray) -> np.ndarray:
+        """
+        Vectorized breadth first distances. Each level checks the matrix rows of the whole frontier at once,
+        taking O(V²) time in total but only one NumPy step per level.
+        """
+        num_vertices = len(self.vertices_by_index)
+        matrix = self.adjacency_matrix[:num_vertices, :num_vertices]
+        distances = np.full(num_vertices, -1, dtype=np.int64)
+        visited = np.zeros(num_vertices, dtype=np.bool_)
+        visited[source_indices] = True
+
+        frontier = source_indices
+        level = 0
+        while len(frontier) > 0:
+            distances[frontier] = level
+            reached = np.any(matrix[frontier] != np.inf, axis=0)
+            frontier = np.flatnonzero(reached & ~visited)
+            visited[frontier] = True
+            level += 1
+        return distances
+
+    def _graph_modified(self, clear_shortest_paths: bool = True) -> None:
+        super()._graph_modified(clear_shortest_paths)
+        self.all_pairs = None
 
     def edges_ordered(self) -> bool:
         """
@@ -77,8 +306,24 @@ class GraphAdjacencyMatrix[K, V](Graph[K, V]):
         """
         return False
 
-    def _get_edge_index(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex) -> int:
-        return self._get_base_index(source_vertex) + dest_vertex.index
+    def _resize(self, capacity: int) -> None:
+        """
+        Copies the adjacency matrix into a new matrix with the given capacity.
+        Rows that were too dense to index at the old capacity are indexed again if they are sparse enough now.
+        :param capacity: new number of rows and columns
+        """
+        old_matrix = self.adjacency_matrix
+        self.adjacency_matrix = self._create_matrix(capacity)
+        self.adjacency_matrix[:len(old_matrix), :len(old_matrix)] = old_matrix
+        self.matrix_view = memoryview(self.adjacency_matrix)
+
+        # O(V) per row, which is less than copying the matrix
+        num_vertices = len(self.vertices_by_index)
+        for row_index, columns in enumerate(self.row_columns):
+            if columns is None:
+                self.row_columns[row_index] = self._index_row(self.adjacency_matrix[row_index, :num_vertices])
 
-    def _get_base_index(self, source_vertex: Graph.Vertex) -> int:
-        return source_vertex.index * len(self.vertices)
+    @staticmethod
+    def _create_matrix(capacity: int) -> np.ndarray:
+        # Note: use 32-bit floats for better memory efficiency, with inf for no edge
+        return np.full((capacity, capacity), np.inf, dtype=np.float32)
@@ -0,0 +1,324 @@
+import json
+import mmap as mmap_module
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Optional, Iterator, Tuple, Iterable, Any
+
+import numpy as np
+
+from module8.graph import Graph
+
+
+class GraphCSR[K, V](Graph[K, V]):
+    """
+    Immutable graph stored in compressed sparse row (CSR) format. Use Graph.freeze() or GraphCSR.load() to create.
+    Edges from the vertex with index i are stored in targets[offsets[i]:offsets[i + 1]], with the corresponding
+    weights in weights[offsets[i]:offsets[i + 1]].
+    """
+
+    # binary file format (see save):
+    # header, vertex table (JSON list of [key, value] padded to 8 bytes), offsets, targets, weights
+    file_magic = b'CSRGRAPH'
+    file_version = 1
+    # magic, version, byte order (0 = little, 1 = big), edges ordered, number of vertices, number of edges,
+    # vertex table size
+    file_header = struct.Struct('<8sIBBxxQQQ')
+
+    def __init__(self, vertices: Iterable[Graph.Vertex], offsets: array | memoryview, targets: array | memoryview,
+                 weights: array | memoryview, edges_ordered: bool = True):
+        """
+        Initialize the graph from CSR arrays (arrays or memory views of 64-bit ints and floats).
+        :param vertices: vertices in index order
+        :param offsets: start offset of the edges for each vertex, plus the total number of edges at the end
+        :param targets: target vertex index for each edge
+        :param weights: weight of each edge
+        :param edges_ordered: true if edges are in the order they were added
+        """
+        super().__init__()
+        for vertex in vertices:
+            self.vertices[vertex.key] = vertex
+            self.vertices_by_index.append(vertex)
+        self.undirected_components.extend(len(self.vertices_by_index))
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._edges_ordered = edges_ordered
+        # checked the first time it is needed (see has_negative_weights)
+        self.negative_weights = None
+
+        # reverse CSR arrays (edges to each vertex), built the first time they are needed
+        self.reverse_offsets = None
+        self.reverse_sources = None
+        self.reverse_weights = None
+
+    @staticmethod
+    def from_graph(graph: Graph[K, V]) -> 'GraphCSR[K, V]':
+        """
+        Creates a frozen copy of the given graph, with its own copy of each vertex, so compacting the original graph
+        later doesn't renumber them. Removed vertices are left out, so the copy has no tombstones, but the original
+        graph is not compacted.
+        :param graph: graph to copy
+        :return: frozen copy of the graph
+        """
+        live_vertices = [vertex for vertex in graph.vertices_by_index if vertex is not None]
+        # vertex index in the original graph -> vertex index in the copy
+        new_indices = [-1] * len(graph.vertices_by_index)
+        for new_index, vertex in enumerate(live_vertices):
+            new_indices[vertex.index] = new_index
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        for vertex in live_vertices:
+            for dest_index, weight in graph._get_edge_indices(vertex.index):
+                targets.append(new_indices[dest_index])
+                weights.append(weight)
+            offsets.append(len(targets))
+        vertices = [Graph.Vertex(vertex.key, new_index, vertex.value) for new_index, vertex in enumerate(live_vertices)]
+        frozen_graph = GraphCSR(vertices, offsets, targets, weights, graph.edges_ordered())
+        if graph.tombstone_count == 0:
+            frozen_graph.undirected_components = graph._get_undirected_components().copy()
+        else:
+            # indices have changed, so rebuild when needed
+            frozen_graph.undirected_components = None
+        return frozen_graph
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> 'GraphCSR':
+        """
+        Loads a graph that was saved with save().
+        If memory-mapped, the edge arrays are read directly from the file as needed, so loading is nearly instant
+        and the operating system can share the pages between processes.
+        Undirected connectivity (see Graph.connected) is not saved, so it is rebuilt the first time it is needed.
+        :param path: path of the file to load
+        :param mmap: true to memory-map the edge arrays, false to read them into memory
+        :return: loaded graph
+        :raises ValueError: if the file is not a saved graph, or was saved on a platform with different byte order
+        """
+        with open(path, 'rb') as file:
+            header = file.read(GraphCSR.file_header.size)
+            if len(header) < GraphCSR.file_header.size:
+                raise ValueError(f'{path} is not a saved graph')
+            magic, version, big_endian, edges_ordered, num_vertices, num_edges, table_size = \
+                GraphCSR.file_header.unpack(header)
+            if magic != GraphCSR.file_magic or version != GraphCSR.file_version:
+                raise ValueError(f'{path} is not a saved graph')
+            if big_endian != (sys.byteorder == 'big'):
+                raise ValueError(f'{path} was saved with a different byte order')
+
+            vertex_table = json.loads(file.read(table_size))
+            vertices = [Graph.Vertex(GraphCSR._from_json(key), index, GraphCSR._from_json(value))
+                        for index, (key, value) in enumerate(vertex_table)]
+
+            offsets_start = GraphCSR.file_header.size + GraphCSR._padded_size(table_size)
+            targets_start = offsets_start + 8 * (num_vertices + 1)
+            weights_start = targets_start + 8 * num_edges
+            weights_end = weights_start + 8 * num_edges
+            if mmap:
+                # memoryview keeps the mapping open after the file is closed
+                buffer = memoryview(mmap_module.mmap(file.fileno(), 0, access=mmap_module.ACCESS_READ))
+            else:
+                file.seek(0)
+                buffer = memoryview(file.read())
+            if len(buffer) < weights_end:
+                raise ValueError(f'{path} is truncated')
+
+            offsets = buffer[offsets_start:targets_start].cast('q')
+            targets = buffer[targets_start:weights_start].cast('q')
+            weights = buffer[weights_start:weights_end].cast('d')
+            graph = GraphCSR(vertices, offsets, targets, weights, bool(edges_ordered))
+            graph.undirected_components = None
+            return graph
+
+    def save(self, path: str) -> None:
+        """
+        Saves the graph in a compact binary format that can be loaded with load().
+        Keys and values must be JSON serializable (tuples are supported, and are restored as tuples).
+        The graph is written to a temporary file in the same directory, which then replaces the file at path, so a
+        graph that was memory-mapped from that file can be saved back to it, and a failed save leaves it unchanged.
+        :param path: path of the file to save
+        """
+        vertex_table = json.dumps([[vertex.key, vertex.value] for vertex in self.vertices_by_index]).encode()
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                file.write(self.file_header.pack(self.file_magic, self.file_version, sys.byteorder == 'big',
+                                                 self._edges_ordered, len(self.vertices_by_index), len(self.targets),
+                                                 len(vertex_table)))
+                # pad vertex table so arrays are 8-byte aligned
+                file.write(vertex_table.ljust(self._padded_size(len(vertex_table)), b' '))
+                file.write(self.offsets)
+                file.write(self.targets)
+                file.write(self.weights)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _padded_size(size: int) -> int:
+        return (size + 7) // 8 * 8
+
+    @staticmethod
+    def _from_json(value: Any) -> Any:
+        """
+        Converts JSON lists back to tuples, so keys are hashable.
+        """
+        if isinstance(value, list):
+            return tuple(GraphCSR._from_json(item) for item in value)
+        return value
+
+    def add_vertex(self, key: K, data: V = None) -> Graph.Vertex:
+        raise ValueError('Cannot add a vertex to a frozen graph')
+
+    def add_vertices(self, keys: Iterable[K], values: Optional[Iterable[V]] = None) -> list[Graph.Vertex]:
+        raise ValueError('Cannot add a vertex to a frozen graph')
+
+    def add_edge(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex, weight: float = 1.0) -> None:
+        raise ValueError('Cannot add an edge to a frozen graph')
+
+    def add_edges(self, sources: Iterable, targets: Iterable, weights: Optional[Iterable[float] | float] = None,
+                  by_index: bool = False, undirected: bool = False) -> None:
+        raise ValueError('Cannot add an edge to a frozen graph')
+
+    def remove_vertex(self, vertex: Graph.Vertex) -> None:
+        raise ValueError('Cannot remove a vertex from a frozen graph')
+
+    def remove_edge(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex) -> None:
+        raise ValueError('Cannot remove an edge from a frozen graph')
+
+    def _remove_edge(self, source_index: int, dest_index: int) -> bool:
+        raise ValueError('Cannot remove an edge from a frozen graph')
+
+    def _remove_vertex_edges(self, index: int) -> None:
+        raise ValueError('Cannot remove a vertex from a frozen graph')
+
+    def _compact(self, live_indices: list[int]) -> None:
+        # frozen graphs never have tombstones
+        pass
+
+    def freeze(self) -> 'GraphCSR[K, V]':
+        """
+        Returns this graph, since it is already frozen.
+        """
+        return self
+
+    def get_edge_weight(self, source_vertex: Graph.Vertex, dest_vertex: Graph.Vertex) -> Optional[float]:
+        """
+        Returns the weight of the edge between two vertices, or None if there is no edge.
+        Runs in O(out-degree) time.
+        :param source_vertex: source vertex
+        :param dest_vertex: destination vertex
+        :return: weight of the edge, or None if there is no edge
+        """
+        for i in range(self.offsets[source_vertex.index], self.offsets[source_vertex.index + 1]):
+            if self.targets[i] == dest_vertex.index:
+                return self.weights[i]
+        return None
+
+    def get_edges_from_vertex(self, source_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+        Returns an iterator over all destination vertices and weights from the given vertex.
+        Edges will be returned in the same order as the graph this was created from.
+        :param source_vertex: source vertex
+        :return: an iterator, which may be empty, over all destination vertices and weights from this vertex
+        """
+        start = self.offsets[source_vertex.index]
+        end = self.offsets[source_vertex.index + 1]
+        # slice the flat arrays instead of using a generator, to avoid a Python frame per expansion
+        return zip(map(self.vertices_by_index.__getitem__, self.targets[start:end]), self.weights[start:end])
+
+    def get_edges_to_vertex(self, dest_vertex: Graph.Vertex) -> Iterator[Tuple[Graph.Vertex, float]]:
+        """
+        Returns an iterator over all source vertices and weights of edges to the given vertex.
+        Edges will be returned in order of source vertex index.
+        :param dest_vertex: destination vertex
+        :return: an iterator, which may be empty, over all source vertices and weights to this vertex
+        """
+        if self.reverse_offsets is None:
+            self._build_reverse()
+        start = self.reverse_offsets[dest_vertex.index]
+        end = self.reverse_offsets[dest_vertex.index + 1]
+        return zip(map(self.vertices_by_index.__getitem__, self.reverse_sources[start:end]),
+                   self.reverse_weights[start:end])
+
+    def _get_edge_indices(self, source_index: int) -> Iterable[Tuple[int, float]]:
+        start = self.offsets[source_index]
+        end = self.offsets[source_index + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def _get_reverse_edge_indices(self, dest_index: int) -> Iterable[Tuple[int, float]]:
+        if self.reverse_offsets is None:
+            self._build_reverse()
+        start = self.reverse_offsets[dest_index]
+        end = self.reverse_offsets[dest_index + 1]
+        return zip(self.reverse_sources[start:end], self.reverse_weights[start:end])
+
+    def has_negative_weights(self) -> bool:
+        """
+        Returns true if any edge has a negative weight, checked with one vectorized scan of the weights array.
+        """
+        if self.negative_weights is None:
+            self.negative_weights = bool(np.any(np.frombuffer(self.weights, dtype=np.float64) < 0))
+        return self.negative_weights
+
+    def _breadth_first_distances(self, source_indices: np.ndarray) -> np.ndarray:
+        """
+        Vectorized breadth first distances. Each level gathers the edges of the whole frontier from the CSR arrays
+        with NumPy operations, so the number of Python steps is the number of levels rather than vertices and edges.
+        """
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        targets = np.frombuffer(self.targets, dtype=np.int64)
+        distances = np.full(len(self.vertices_by_index), -1, dtype=np.int64)
+        visited = np.zeros(len(self.vertices_by_index), dtype=np.bool_)
+        visited[source_indices] = True
+
+        frontier = source_indices
+        level = 0
+        while len(frontier) > 0:
+            distances[frontier] = level
+            starts = offsets[frontier]
+            counts = offsets[frontier + 1] - starts
+            # positions of all edges from the frontier: starts[i], starts[i] + 1, ..., starts[i] + counts[i] - 1
+            edge_offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            neighbors = targets[edge_offsets + np.arange(len(edge_offsets))]
+            frontier = np.unique(neighbors[~visited[neighbors]])
+            visited[frontier] = True
+            level += 1
+        return distances
+
+    def _build_reverse(self) -> None:
+        """
+        Builds the reverse CSR arrays in O(V + E) time using a counting sort of the edges by target.
+        """
+        num_vertices = len(self.vertices_by_index)
+        reverse_offsets = array('q', bytes(8 * (num_vertices + 1)))
+        for target in self.targets:
+            reverse_offsets[target + 1] += 1
+        for i in range(num_vertices):
+            reverse_offsets[i + 1] += reverse_offsets[i]
+
+        # next free position for each target
+        positions = reverse_offsets[:-1]
+        reverse_sources = array('q', bytes(8 * len(self.targets)))
+        reverse_weights = array('d', bytes(8 * len(self.targets)))
+        for source in range(num_vertices):
+            for i in range(self.offsets[source], self.offsets[source + 1]):
+                target = self.targets[i]
+                reverse_sources[positions[target]] = source
+                reverse_weights[positions[target]] = self.weights[i]
+                positions[target] += 1
+
+        self.reverse_offsets = reverse_offsets
+        self.reverse_sources = reverse_sources
+        self.reverse_weights = reverse_weights
+
+    def edges_ordered(self) -> bool:
+        """
+        Returns true if the graph this was created from preserved edge order.
+        Used for testing.
+        """
+        return self._edges_ordered
@@ -0,0 +1,150 @@
+from math import sqrt
+from random import Random
+from typing import Optional, Tuple
+
+import numpy as np
+
+from module8.graph import Graph
+
+
+def random_graph(graph: Graph, num_vertices: int, probability: float, seed: Optional[int] = None,
+                 acyclic: bool = False, undirected: bool = False, weights: Tuple[float, float] = (1.0, 1.0)) -> Graph:
+    """
+    Adds a random G(n, p) graph, where each pair of vertices is connected with the given probability.
+    Instead of testing all O(V²) pairs, the gaps between connected pairs are sampled from a geometric distribution
+    (geometric skip sampling), so this runs in O(V + E) time.
+    Vertex keys are 0 to num_vertices - 1.
+    :param graph: empty graph to add the vertices and edges to
+    :param num_vertices: number of vertices
+    :param probability: probability of each edge
+    :param seed: random seed, or None for a different graph each time
+    :param acyclic: true to only add directed edges from lower to higher keys, so there are no cycles
+    :param undirected: true to add undirected edges
+    :param weights: range of uniformly distributed edge weights
+    :return: the given graph
+    :raises ValueError: if the graph is not empty, or the probability is not between 0 and 1
+    """
+    _check_empty(graph)
+    if not 0 <= probability <= 1:
+        raise ValueError(f'Probability must be between 0 and 1, got {probability}')
+    rng = np.random.default_rng(seed)
+    graph.add_vertices(range(num_vertices))
+
+    if acyclic or undirected:
+        # pair k is (i, j) with i < j, numbered in order of j, then i: k = j (j - 1) / 2 + i
+        pair_indices = _sample_indices(rng, num_vertices * (num_vertices - 1) // 2, probability)
+        targets = ((1 + np.sqrt(1 + 8 * pair_indices.astype(np.float64))) // 2).astype(np.int64)
+        # correct for rounding
+        targets -= targets * (targets - 1) // 2 > pair_indices
+        targets += (targets + 1) * targets // 2 <= pair_indices
+        sources = pair_indices - targets * (targets - 1) // 2
+    else:
+        # pair k is (i, j) with i != j, numbered in order of i, then j
+        pair_indices = _sample_indices(rng, num_vertices * (num_vertices - 1), probability)
+        sources, targets = np.divmod(pair_indices, max(num_vertices - 1, 1))
+        targets += targets >= sources
+
+    graph.add_edges(sources, targets, _uniform_weights(rng, len(sources), weights), by_index=True,
+                    undirected=undirected)
+    return graph
+
+
+def barabasi_albert_graph(graph: Graph, num_vertices: int, edges_per_vertex: int, seed: Optional[int] = None,
+                          weights: Tuple[float, float] = (1.0, 1.0)) -> Graph:
+    """
+    Adds a random undirected graph with a power-law degree distribution (Barabási-Albert model).
+    Each new vertex is connected to edges_per_vertex existing vertices, chosen with probability proportional to
+    their degree, so a few vertices become hubs with very high degree. Runs in O(V + E) time.
+    Vertex keys are 0 to num_vertices - 1.
+    :param graph: empty graph to add the vertices and edges to
+    :param num_vertices: number of vertices
+    :param edges_per_vertex: number of edges from each new vertex
+    :param seed: random seed, or None for a different graph each time
+    :param weights: range of uniformly distributed edge weights
+    :return: the given graph
+    :raises ValueError: if the graph is not empty, or edges_per_vertex is not between 1 and num_vertices - 1
+    """
+    _check_empty(graph)
+    if num_vertices > 0 and not 1 <= edges_per_vertex < num_vertices:
+        raise ValueError(f'Edges per vertex must be between 1 and {num_vertices - 1}, got {edges_per_vertex}')
+    rng = Random(seed)
+    graph.add_vertices(range(num_vertices))
+
+    sources = []
+    targets = []
+    # each vertex appears once for each of its edges, so a uniform choice from this list is proportional to degree
+    endpoints = []
+    # the first new vertex is connected to all the initial vertices
+    new_targets = list(range(edges_per_vertex))
+    for source in range(edges_per_vertex, num_vertices):
+        sources.extend([source] * edges_per_vertex)
+        targets.extend(new_targets)
+        endpoints.extend(new_targets)
+        endpoints.extend([source] * edges_per_vertex)
+
+        chosen = set()
+        while len(chosen) < edges_per_vertex:
+            chosen.add(endpoints[rng.randrange(len(endpoints))])
+        new_targets = sorted(chosen)
+
+    graph.add_edges(sources, targets, _uniform_weights(np.random.default_rng(seed), len(sources), weights),
+                    by_index=True, undirected=True)
+    return graph
+
+
+def grid_graph(graph: Graph, width: int, height: int, seed: Optional[int] = None,
+               weights: Tuple[float, float] = (1.0, 1.0)) -> Graph:
+    """
+    Adds a grid of vertices with undirected edges between horizontal and vertical neighbors, similar to a road
+    network. The key and value of each vertex are its (x, y) coordinates, so with weights of at least 1, the
+    Euclidean distance is an admissible A* heuristic. Runs in O(V) time.
+    :param graph: empty graph to add the vertices and edges to
+    :param width: number of columns
+    :param height: number of rows
+    :param seed: random seed, or None for a different graph each time
+    :param weights: range of uniformly distributed edge weights
+    :return: the given graph
+    :raises ValueError: if the graph is not empty
+    """
+    _check_empty(graph)
+    rng = np.random.default_rng(seed)
+    keys = [(x, y) for x in range(width) for y in range(height)]
+    graph.add_vertices(keys, keys)
+
+    indices = np.arange(width * height).reshape(width, height)
+    sources = np.concatenate((indices[:-1, :].ravel(), indices[:, :-1].ravel()))
+    targets = np.concatenate((indices[1:, :].ravel(), indices[:, 1:].ravel()))
+    graph.add_edges(sources, targets, _uniform_weights(rng, len(sources), weights), by_index=True,
+                    undirected=True)
+    return graph
+
+
+def _check_empty(graph: Graph) -> None:
+    if len(graph.vertices) > 0:
+        raise ValueError('Graph must be empty')
+
+
+def _sample_indices(rng: np.random.Generator, count: int, probability: float) -> np.ndarray:
+    """
+    Returns a sorted random subset of 0 to count - 1, where each index is included with the given probability.
+    The gap to each next index is geometrically distributed, so only O(count * probability) numbers are drawn.
+    """
+    if count <= 0 or probability <= 0:
+        return np.empty(0, dtype=np.int64)
+    expected = count * probability
+    chunk_size = int(expected + 4 * sqrt(expected)) + 16
+    chunks = []
+    last_index = -1
+    while last_index < count:
+        indices = last_index + np.cumsum(rng.geometric(probability, chunk_size))
+        chunks.append(indices)
+        last_index = indices[-1]
+    indices = np.concatenate(chunks)
+    return indices[:np.searchsorted(indices, count)]
+
+
+def _uniform_weights(rng: np.random.Generator, count: int, weights: Tuple[float, float]) -> np.ndarray:
+    low, high = weights
+    if low == high:
+        return np.full(count, low, dtype=np.float64)
+    return rng.uniform(low, high, count)
@@ -0,0 +1,163 @@
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from module8.graph import Graph
+
+# Shared memory views used by each worker process, set by _init_worker
+_worker_arrays = None
+
+
+def shortest_paths_from_many(graph: Graph, start_vertices: list[Graph.Vertex],
+                             max_workers: Optional[int] = None) -> list[Graph.ShortestPathTree]:
+    """
+    Finds the shortest paths from each start vertex to all other vertices, using Dijkstra's algorithm in a pool of
+    worker processes. The graph is exported once to shared memory in compressed sparse row (CSR) format, and each
+    worker writes its distances and predecessors directly to shared memory, so nothing large is pickled per task.
+    Dijkstra's algorithm doesn't work with negative weights, so if there are any, the shortest paths are found in
+    this process with the same algorithm as Graph.shortest_paths_from() instead.
+    :param graph: graph to search
+    :param start_vertices: start vertices
+    :param max_workers: maximum number of worker processes, or None to use the number of CPUs
+    :return: shortest paths from each start vertex, in the same order as start_vertices
+    :raises ValueError: if there are negative weights, and a negative weight cycle can be reached from a start vertex
+    """
+    if graph.has_negative_weights():
+        return [graph._shortest_paths(start_vertex) for start_vertex in start_vertices]
+
+    frozen = graph.freeze()
+    num_vertices = len(frozen.vertices_by_index)
+    num_edges = len(frozen.targets)
+    num_sources = len(start_vertices)
+    if num_sources == 0:
+        return []
+
+    # input: offsets, targets and weights (all 8 bytes per element)
+    # output: distances and predecessor indices for each start vertex
+    graph_memory = SharedMemory(create=True, size=8 * (num_vertices + 1 + 2 * num_edges))
+    result_memory = SharedMemory(create=True, size=8 * 2 * num_sources * num_vertices)
+    try:
+        offsets, targets, weights = _get_graph_views(graph_memory, num_vertices, num_edges)
+        offsets[:] = frozen.offsets
+        targets[:] = frozen.targets
+        weights[:] = frozen.weights
+        # views must be released before shared memory can be closed
+        del offsets, targets, weights
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(graph_memory.name, result_memory.name, num_vertices, num_edges,
+                                           num_sources)) as executor:
+            # the frozen copy has its own vertex indices, without removed vertices
+            tasks = [(row, frozen.vertices[vertex.key].index) for row, vertex in enumerate(start_vertices)]
+            # several chunks per worker, to balance the load
+            chunk_size = max(1, num_sources // (4 * max_workers))
+            for _ in executor.map(_shortest_paths_worker, tasks, chunksize=chunk_size):
+                pass
+
+        # convert results to shortest path trees, with the indices of the original graph
+        distances, pred_indices = _get_result_views(result_memory, num_vertices, num_sources)
+        trees = []
+        for row, start_vertex in enumerate(start_vertices):
+            start = row * num_vertices
+            tree_distances = distances[start:start + num_vertices].tolist()
+            tree_pred_indices = pred_indices[start:start + num_vertices].tolist()
+            if graph.tombstone_count > 0:
+                tree_distances, tree_pred_indices = _to_graph_indices(graph, tree_distances, tree_pred_indices)
+            trees.append(Graph.ShortestPathTree(start_vertex, tree_distances, tree_pred_indices,
+                                                graph.vertices_by_index))
+        del distances, pred_indices
+        return trees
+    finally:
+        graph_memory.close()
+        graph_memory.unlink()
+        result_memory.close()
+        result_memory.unlink()
+
+
+def _to_graph_indices(graph: Graph, distances: list[float], pred_indices: list[int]) -> tuple[list[float], list[int]]:
+    """
+    Converts distances and predecessor indices from the vertex indices of a frozen copy, which has no removed
+    vertices, to the vertex indices of the original graph.
+    """
+    live_indices = [vertex.index for vertex in graph.vertices_by_index if vertex is not None]
+    graph_distances = [float('inf')] * len(graph.vertices_by_index)
+    graph_pred_indices = [-1] * len(graph.vertices_by_index)
+    for index, graph_index in enumerate(live_indices):
+        graph_distances[graph_index] = distances[index]
+        if pred_indices[index] >= 0:
+            graph_pred_indices[graph_index] = live_indices[pred_indices[index]]
+    return graph_distances, graph_pred_indices
+
+
+def _get_graph_views(graph_memory: SharedMemory, num_vertices: int, num_edges: int) \
+        -> tuple[memoryview, memoryview, memoryview]:
+    """
+    Returns views of the offsets, targets and weights arrays in shared memory.
+    """
+    targets_start = 8 * (num_vertices + 1)
+    weights_start = targets_start + 8 * num_edges
+    buffer = graph_memory.buf
+    return (buffer[:targets_start].cast('q'),
+            buffer[targets_start:weights_start].cast('q'),
+            buffer[weights_start:weights_start + 8 * num_edges].cast('d'))
+
+
+def _get_result_views(result_memory: SharedMemory, num_vertices: int, num_sources: int) \
+        -> tuple[memoryview, memoryview]:
+    """
+    Returns views of the distances and predecessor indices arrays in shared memory.
+    """
+    pred_start = 8 * num_sources * num_vertices
+    buffer = result_memory.buf
+    return buffer[:pred_start].cast('d'), buffer[pred_start:2 * pred_start].cast('q')
+
+
+def _init_worker(graph_memory_name: str, result_memory_name: str, num_vertices: int, num_edges: int,
+                 num_sources: int) -> None:
+    """
+    Attaches a worker process to the shared memory.
+    """
+    global _worker_arrays
+    graph_memory = SharedMemory(name=graph_memory_name)
+    result_memory = SharedMemory(name=result_memory_name)
+    _worker_arrays = (graph_memory, result_memory, num_vertices,
+                      *_get_graph_views(graph_memory, num_vertices, num_edges),
+                      *_get_result_views(result_memory, num_vertices, num_sources))
+
+
+def _shortest_paths_worker(task: tuple[int, int]) -> None:
+    """
+    Runs Dijkstra's algorithm from one start vertex in a worker process, using vertex indices only.
+    :param task: (result row, start vertex index)
+    """
+    row, start_index = task
+    _, _, num_vertices, offsets, targets, weights, distances_out, pred_indices_out = _worker_arrays
+
+    distances = [float('inf')] * num_vertices
+    pred_indices = [-1] * num_vertices
+    visited = [False] * num_vertices
+    distances[start_index] = 0.0
+
+    min_heap = [(0.0, start_index)]
+    while len(min_heap) > 0:
+        current_distance, current_index = heapq.heappop(min_heap)
+        if visited[current_index]:
+            continue
+        visited[current_index] = True
+
+        for i in range(offsets[current_index], offsets[current_index + 1]):
+            adj_index = targets[i]
+            alternative_path_distance = current_distance + weights[i]
+            if alternative_path_distance < distances[adj_index]:
+                distances[adj_index] = alternative_path_distance
+                pred_indices[adj_index] = current_index
+                heapq.heappush(min_heap, (alternative_path_distance, adj_index))
+
+    start = row * num_vertices
+    distances_out[start:start + num_vertices] = array('d', distances)
+    pred_indices_out[start:start + num_vertices] = array('q', pred_indices)
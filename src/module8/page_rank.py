@@ -0,0 +1,106 @@
+from typing import Optional
+
+import numpy as np
+
+from module8.graph import Graph
+from module8.graph_csr import GraphCSR
+
+
+def page_rank(graph: Graph, damping: float = 0.85, personalization: Optional[dict[Graph.Vertex, float]] = None,
+              weighted: bool = True, tolerance: float = 1e-6, max_iterations: int = 100) -> np.ndarray:
+    """
+    Ranks vertices by the probability that a random walk is at each vertex, following a random edge with probability
+    damping, or jumping to a random vertex (chosen by personalization) otherwise. Walks from vertices with no edges
+    (dangling vertices) also jump.
+    The edges are copied into arrays once (or used directly for frozen graphs), and each power iteration takes
+    O(V + E) time in vectorized NumPy code.
+    :param graph: graph to rank
+    :param damping: probability of following an edge instead of jumping, between 0 and 1
+    :param personalization: relative probability of jumping to each vertex, or None to jump to any vertex equally;
+        vertices that are not included are never jumped to
+    :param weighted: true to follow edges in proportion to their weight (which must be positive), false to follow
+        each edge with equal probability
+    :param tolerance: stop when the total change in rank in one iteration is less than this
+    :param max_iterations: maximum number of iterations
+    :return: array of ranks indexed by vertex index, which add up to 1 (0 for removed vertices)
+    :raises KeyError: if a personalization vertex is not in the graph
+    :raises ValueError: if damping or personalization is invalid, weighted is true and a weight is not positive, or the
+        ranks don't converge within max_iterations
+    """
+    if not 0 <= damping <= 1:
+        raise ValueError(f'Damping must be between 0 and 1, got {damping}')
+    num_vertices = len(graph.vertices_by_index)
+    if len(graph.vertices) == 0:
+        return np.zeros(num_vertices)
+
+    # transition structure: probability of following each edge from its source vertex
+    sources, targets, weights = _get_edge_arrays(graph)
+    if not weighted:
+        weights = np.ones(len(weights))
+    elif not np.all(weights > 0):
+        # a walk can't follow an edge with probability 0 or less
+        raise ValueError(f'Edge weights must be positive, got {weights[~(weights > 0)][0]}')
+    # bincount returns integers if there are no edges
+    out_weights = np.bincount(sources, weights, minlength=num_vertices).astype(np.float64, copy=False)
+    edge_probabilities = weights / out_weights[sources]
+    live = np.array([vertex is not None for vertex in graph.vertices_by_index])
+    dangling = live & (out_weights == 0)
+
+    jump_probabilities = _get_jump_probabilities(graph, personalization, live)
+
+    ranks = live / live.sum()
+    for _ in range(max_iterations):
+        # each edge passes on its share of the rank of its source vertex
+        new_ranks = np.bincount(targets, ranks[sources] * edge_probabilities,
+                                minlength=num_vertices).astype(np.float64, copy=False)
+        new_ranks += ranks[dangling].sum() * jump_probabilities
+        new_ranks *= damping
+        new_ranks += (1 - damping) * jump_probabilities
+
+        change = np.abs(new_ranks - ranks).sum()
+        ranks = new_ranks
+        if change < tolerance:
+            return ranks
+    raise ValueError(f'PageRank did not converge in {max_iterations} iterations')
+
+
+def _get_edge_arrays(graph: Graph) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the source indices, target indices and weights of all edges in the graph.
+    """
+    if isinstance(graph, GraphCSR):
+        offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        return sources, np.frombuffer(graph.targets, dtype=np.int64), np.frombuffer(graph.weights, dtype=np.float64)
+
+    sources = []
+    targets = []
+    weights = []
+    for source_index in range(len(graph.vertices_by_index)):
+        for dest_index, weight in graph._get_edge_indices(source_index):
+            sources.append(source_index)
+            targets.append(dest_index)
+            weights.append(weight)
+    return (np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64),
+            np.array(weights, dtype=np.float64))
+
+
+def _get_jump_probabilities(graph: Graph, personalization: Optional[dict[Graph.Vertex, float]],
+                            live: np.ndarray) -> np.ndarray:
+    """
+    Returns the probability of jumping to each vertex index.
+    """
+    if personalization is None:
+        return live / live.sum()
+
+    jump_probabilities = np.zeros(len(graph.vertices_by_index))
+    for vertex, value in personalization.items():
+        if graph.vertices.get(vertex.key) is not vertex:
+            raise KeyError(f'Vertex with key {vertex.key} not found in graph')
+        if value < 0:
+            raise ValueError(f'Personalization must not be negative, got {value}')
+        jump_probabilities[vertex.index] = value
+    total = jump_probabilities.sum()
+    if total == 0:
+        raise ValueError('Personalization must have a positive value for at least one vertex')
+    return jump_probabilities / total
@@ -1,6 +1,10 @@
+import os
+import tempfile
+import tracemalloc
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from random import randint, shuffle, random
+from math import hypot, isqrt
+from random import randint, shuffle, random, Random
 from time import perf_counter
 from typing import Callable
 
@@ -9,8 +13,14 @@ from matplotlib import pyplot as plt
 
 from module8.bubble_sort import bubble_sort
 from module8.collection import Collection
+from module8.contraction_hierarchy import ContractionHierarchy
 from module8.graph import Graph
+from module8.graph_adaptive import GraphAdaptive
+from module8.graph_adjacency_bit_matrix import GraphAdjacencyBitMatrix
 from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+from module8.graph_csr import GraphCSR
+from module8.graph_generator import random_graph, barabasi_albert_graph, grid_graph
 from module8.hash_table import HashTable
 from module8.linked_list import LinkedList
 from module8.quickselect import quickselect
@@ -150,20 +160,522 @@ class PerfTestShortestPath(PerfTest):
         self.graph = graph
         self.vertices = []
 
+    def init_run(self, size: int):
+        if size != len(self.graph.vertices):
+            # 10% chance of any 2 vertices being connected (no cycles), generated in O(V + E) time
+            self.graph = random_graph(type(self.graph)(), size, .1, seed=size, acyclic=True, weights=(1, 5))
+            self.vertices = self.graph.vertices_by_index
+
+    def run(self):
+        self.graph.shortest_path(self.vertices[0], self.vertices[-1])
+
+
+class PerfTestShortestPathSparse(PerfTestShortestPath):
+    """
+    Shortest path on a sparse graph, where each new vertex gets a fixed number of edges from older vertices.
+    Graph construction is O(V), so this can be used with much larger sizes than PerfTestShortestPath.
+    """
+
+    def __init__(self, name: str, graph: Graph, edges_per_vertex: int = 4):
+        PerfTestShortestPath.__init__(self, name, graph)
+        self.edges_per_vertex = edges_per_vertex
+
     def init_run(self, size: int):
         while size > len(self.graph.vertices):
             new_vertex = self.graph.add_vertex(f'v{len(self.graph.vertices) + 1}')
 
-            for vertex in self.vertices:
-                # 10% chance of any 2 vertices being connected (no cycles)
-                if random() < .1:
-                    weight = randint(1, 5)
-                    self.graph.add_edge(vertex, new_vertex, weight)
+            if len(self.vertices) > 0:
+                for _ in range(self.edges_per_vertex):
+                    # edges only go from older to newer vertices (no cycles)
+                    vertex = self.vertices[randint(0, len(self.vertices) - 1)]
+                    self.graph.add_edge(vertex, new_vertex, randint(1, 5))
 
             self.vertices.append(new_vertex)
 
+
+class PerfTestShortestPathFrozen(PerfTestShortestPathSparse):
+    """
+    Shortest path on a sparse graph that has been frozen into compressed sparse row (CSR) format.
+    """
+
+    def __init__(self, name: str, graph: Graph, edges_per_vertex: int = 4):
+        PerfTestShortestPathSparse.__init__(self, name, graph, edges_per_vertex)
+        self.frozen_graph = graph.freeze()
+
+    def init_run(self, size: int):
+        if size > len(self.graph.vertices):
+            PerfTestShortestPathSparse.init_run(self, size)
+            self.frozen_graph = self.graph.freeze()
+
     def run(self):
-        self.graph.shortest_path(self.vertices[0], self.vertices[-1])
+        # the frozen graph has its own vertices
+        frozen_vertices = self.frozen_graph.vertices_by_index
+        self.frozen_graph.shortest_path(frozen_vertices[0], frozen_vertices[-1])
+
+
+class PerfTestBreadthFirst(PerfTestShortestPathFrozen):
+    """
+    Breadth first distances from the first vertex of a sparse graph, using a traversal one vertex at a time,
+    or level by level with breadth_first_distances (vectorized if frozen).
+    """
+
+    def __init__(self, name: str, graph: Graph, search: str):
+        PerfTestShortestPathFrozen.__init__(self, name, graph)
+        self.search = search
+
+    def run(self):
+        if self.search == 'traversal':
+            for _ in self.graph.traverse_breadth_first(self.vertices[0]):
+                pass
+        elif self.search == 'levels':
+            self.graph.breadth_first_distances(self.vertices[:1])
+        else:
+            self.frozen_graph.breadth_first_distances(self.frozen_graph.vertices_by_index[:1])
+
+
+class PerfTestNegativeWeights(PerfTest):
+    """
+    Finds shortest paths from one vertex in a sparse random graph with cycles, with SPFA or Dijkstra's algorithm.
+    With negative weights, edges to higher indices have weights between -2 and 5, and edges back to lower indices
+    have weights of more than 2 for each index they go back, so every cycle has a positive weight. The number of
+    vertices taken from the SPFA queue for each vertex is recorded, which is V in the worst case.
+    """
+
+    def __init__(self, name: str, spfa: bool, negative_weights: bool):
+        PerfTest.__init__(self, name)
+        self.spfa = spfa
+        self.negative_weights = negative_weights
+        self.graph = GraphAdjacencyList()
+        self.settled_per_vertex = {}  # size -> vertices settled (taken from the queue for SPFA) per vertex
+
+    def init_run(self, size: int):
+        if size != len(self.graph.vertices):
+            if not self.negative_weights:
+                self.graph = random_graph(GraphAdjacencyList(), size, 4 / size, seed=size, weights=(1, 5))
+            else:
+                self.graph = random_graph(GraphAdjacencyList(), size, 4 / size, seed=size, weights=(-2, 5))
+                back_edges = [(source_index, dest_index, weight)
+                              for source_index in range(size)
+                              for dest_index, weight in self.graph._get_edge_indices(source_index)
+                              if dest_index < source_index]
+                sources, targets, weights = (np.array(values) for values in zip(*back_edges))
+                self.graph.add_edges(sources, targets, 2 * (sources - targets) + weights + 3, by_index=True)
+
+    def run(self):
+        start_vertex = self.graph.vertices_by_index[0]
+        if self.spfa:
+            self.graph._spfa(start_vertex)
+        else:
+            self.graph._dijkstra(start_vertex)
+        num_vertices = len(self.graph.vertices)
+        self.settled_per_vertex[num_vertices] = self.graph.last_settled_count / num_vertices
+
+
+class PerfTestEdgeInsertions(PerfTest):
+    """
+    Adds random edges to a sparse random graph one at a time, getting the shortest paths from one vertex after each,
+    with the cached shortest paths repaired after each edge, or found again from scratch.
+    """
+
+    def __init__(self, name: str, repair: bool, num_edges: int = 100):
+        PerfTest.__init__(self, name)
+        self.repair = repair
+        self.num_edges = num_edges
+        self.graph = GraphAdjacencyList()
+        self.rng = None
+
+    def init_run(self, size: int):
+        if size != len(self.graph.vertices):
+            self.rng = Random(size)
+            self.graph = random_graph(GraphAdjacencyList(), size, 4 / size, seed=size, weights=(1, 5))
+
+    def run(self):
+        vertices = self.graph.vertices_by_index
+        start_vertex = vertices[0]
+        self.graph.shortest_paths_from(start_vertex)
+        for _ in range(self.num_edges):
+            self.graph.add_edge(vertices[self.rng.randrange(len(vertices))],
+                                vertices[self.rng.randrange(len(vertices))], self.rng.uniform(1, 5))
+            if not self.repair:
+                self.graph.shortest_path_cache.clear()
+            self.graph.shortest_paths_from(start_vertex)
+
+
+class PerfTestRepeatedShortestPath(PerfTest):
+    """
+    Runs many shortest path queries between random vertices on the same dense graph.
+    """
+
+    def __init__(self, name: str, all_pairs: bool, num_queries: int = 1000):
+        """
+        Initialize the test.
+        :param name: name of the test
+        :param all_pairs: true to compute all pairs shortest paths once, false to call shortest_path() for each query
+        :param num_queries: number of queries in each run
+        """
+        PerfTest.__init__(self, name)
+        self.graph = GraphAdjacencyMatrix()
+        self.vertices = []
+        self.all_pairs = all_pairs
+        self.num_queries = num_queries
+
+    def init_run(self, size: int):
+        while size > len(self.graph.vertices):
+            new_vertex = self.graph.add_vertex(len(self.graph.vertices))
+            for vertex in self.vertices:
+                # 25% chance of an edge in each direction
+                if random() < .25:
+                    self.graph.add_edge(vertex, new_vertex, randint(1, 5))
+                if random() < .25:
+                    self.graph.add_edge(new_vertex, vertex, randint(1, 5))
+            self.vertices.append(new_vertex)
+        # clear cached result, so each run includes computing all pairs shortest paths
+        self.graph.all_pairs = None
+
+    def run(self):
+        if self.all_pairs:
+            all_pairs = self.graph.all_pairs_shortest_paths()
+            shortest_path = all_pairs.shortest_path
+        else:
+            shortest_path = self.graph.shortest_path
+        for _ in range(self.num_queries):
+            shortest_path(self.vertices[randint(0, len(self.vertices) - 1)],
+                          self.vertices[randint(0, len(self.vertices) - 1)])
+
+
+class PerfTestRoadNetwork(PerfTest):
+    """
+    Point-to-point shortest path between random vertices on a grid graph that approximates a road network.
+    Each vertex has (x, y) coordinates as its value, and edge weights are at least the distance between vertices.
+    The contraction hierarchy is built once per size, outside the timed runs, and its build time is recorded.
+    """
+
+    def __init__(self, name: str, search: str):
+        """
+        Initialize the test.
+        :param name: name of the test
+        :param search: shortest path search to use: 'dijkstra', 'a_star', 'bidirectional' or
+            'contraction_hierarchy'
+        """
+        PerfTest.__init__(self, name)
+        self.search = search
+        self.graph = None
+        self.rng = None
+        self.hierarchy = None
+        self.settled_counts = {}  # size -> list of settled vertex counts
+        self.build_times = {}  # size -> contraction hierarchy build time
+
+    def init_run(self, size: int):
+        if self.graph is None or size != len(self.graph.vertices):
+            # seeded so that each search uses the same graph and queries
+            self.rng = Random(size)
+            side = isqrt(size)
+            self.graph = grid_graph(GraphAdjacencyList(), side, side, seed=size, weights=(1, 2))
+            self.settled_counts[size] = []
+            if self.search == 'contraction_hierarchy':
+                start_time = perf_counter()
+                self.hierarchy = ContractionHierarchy(self.graph)
+                self.build_times[size] = perf_counter() - start_time
+
+    def run(self):
+        vertices = self.graph.vertices_by_index
+        start_vertex = vertices[self.rng.randint(0, len(vertices) - 1)]
+        end_vertex = vertices[self.rng.randint(0, len(vertices) - 1)]
+        if self.search == 'a_star':
+            self.graph.shortest_path_a_star(start_vertex, end_vertex, self._euclidean_distance)
+        elif self.search == 'bidirectional':
+            self.graph.shortest_path_bidirectional(start_vertex, end_vertex)
+        elif self.search == 'contraction_hierarchy':
+            self.hierarchy.shortest_path(start_vertex, end_vertex)
+            self.settled_counts[len(vertices)].append(self.hierarchy.last_settled_count)
+            return
+        else:
+            self.graph.shortest_path(start_vertex, end_vertex)
+        self.settled_counts[len(vertices)].append(self.graph.last_settled_count)
+
+    @staticmethod
+    def _euclidean_distance(vertex: Graph.Vertex, end_vertex: Graph.Vertex) -> float:
+        return hypot(vertex.value[0] - end_vertex.value[0], vertex.value[1] - end_vertex.value[1])
+
+
+class PerfTestShortestPathsFromMany(PerfTestShortestPathSparse):
+    """
+    Shortest paths from many start vertices on a sparse graph, using worker processes.
+    """
+
+    def __init__(self, name: str, max_workers: int, num_sources: int = 64):
+        PerfTestShortestPathSparse.__init__(self, name, GraphAdjacencyList())
+        self.max_workers = max_workers
+        self.num_sources = num_sources
+
+    def run(self):
+        self.graph.shortest_paths_from_many(self.vertices[:self.num_sources], self.max_workers)
+
+
+class PerfTestLoadGraph(PerfTestShortestPathSparse):
+    """
+    Loads a saved sparse graph, or rebuilds it from scratch with add_vertex and add_edge.
+    """
+
+    def __init__(self, name: str, load: bool, mmap: bool = True):
+        PerfTestShortestPathSparse.__init__(self, name, GraphAdjacencyList())
+        self.load = load
+        self.mmap = mmap
+        self.path = os.path.join(tempfile.gettempdir(), f'perf_test_graph_{os.getpid()}.bin')
+
+    def init_run(self, size: int):
+        if size > len(self.graph.vertices):
+            PerfTestShortestPathSparse.init_run(self, size)
+            self.graph.save(self.path)
+
+    def run(self):
+        if self.load:
+            GraphCSR.load(self.path, self.mmap)
+        else:
+            # rebuild the same graph
+            graph = GraphAdjacencyList()
+            for vertex in self.graph.vertices_by_index:
+                graph.add_vertex(vertex.key, vertex.value)
+            for vertex in self.graph.vertices_by_index:
+                source_vertex = graph.get_vertex(vertex.key)
+                for dest_vertex, weight in self.graph.get_edges_from_vertex(vertex):
+                    graph.add_edge(source_vertex, graph.get_vertex(dest_vertex.key), weight)
+
+
+class PerfTestAddEdges(PerfTest):
+    """
+    Adds random edges to a graph with 1024 vertices, either one at a time or in a single batch.
+    """
+
+    def __init__(self, name: str, graph_type: type[Graph], bulk: bool, num_vertices: int = 1024):
+        PerfTest.__init__(self, name)
+        self.graph_type = graph_type
+        self.bulk = bulk
+        self.num_vertices = num_vertices
+        self.graph = None
+        self.sources = np.array([])
+        self.targets = np.array([])
+        self.weights = np.array([])
+
+    def init_run(self, size: int):
+        self.graph = self.graph_type()
+        self.graph.add_vertices(range(self.num_vertices))
+        if size != len(self.sources):
+            rng = np.random.default_rng(size)
+            self.sources = rng.integers(0, self.num_vertices, size)
+            self.targets = rng.integers(0, self.num_vertices, size)
+            self.weights = rng.integers(1, 6, size).astype(np.float64)
+
+    def run(self):
+        if self.bulk:
+            self.graph.add_edges(self.sources, self.targets, self.weights, by_index=True)
+        else:
+            vertices = self.graph.vertices
+            for source, target, weight in zip(self.sources.tolist(), self.targets.tolist(), self.weights.tolist()):
+                self.graph.add_edge(vertices[source], vertices[target], weight)
+
+
+class PerfTestConnected(PerfTest):
+    """
+    Checks whether random pairs of vertices are connected in a sparse undirected graph, either with the union-find
+    index maintained by add_edge_undirected, or with a breadth first search.
+    """
+
+    def __init__(self, name: str, use_index: bool, num_queries: int = 100):
+        PerfTest.__init__(self, name)
+        self.use_index = use_index
+        self.num_queries = num_queries
+        self.graph = GraphAdjacencyList()
+        self.queries = []
+
+    def init_run(self, size: int):
+        if size != len(self.graph.vertices):
+            # about one edge per vertex, so there are many components of different sizes
+            rng = Random(size)
+            self.graph = GraphAdjacencyList()
+            vertices = self.graph.add_vertices(range(size))
+            for _ in range(size):
+                self.graph.add_edge_undirected(vertices[rng.randrange(size)], vertices[rng.randrange(size)])
+            self.queries = [(vertices[rng.randrange(size)], vertices[rng.randrange(size)])
+                            for _ in range(self.num_queries)]
+
+    def run(self):
+        if self.use_index:
+            for vertex1, vertex2 in self.queries:
+                self.graph.connected(vertex1, vertex2)
+        else:
+            for vertex1, vertex2 in self.queries:
+                any(vertex is vertex2 for vertex in self.graph.traverse_breadth_first(vertex1))
+
+
+class PerfTestReachability(PerfTest):
+    """
+    Checks whether random pairs of vertices can reach each other in a sparse directed graph, either with a depth
+    first search, or with the reachability index, which is built once, or rebuilt on every run if include_build.
+    """
+
+    def __init__(self, name: str, use_index: bool, include_build: bool = False, num_queries: int = 1000):
+        PerfTest.__init__(self, name)
+        self.use_index = use_index
+        self.include_build = include_build
+        self.num_queries = num_queries
+        self.graph = GraphAdjacencyList()
+        self.queries = []
+
+    def init_run(self, size: int):
+        if size != len(self.graph.vertices):
+            # about 1.5 edges per vertex, so there is one large strongly connected component and many small ones
+            rng = Random(size)
+            self.graph = random_graph(GraphAdjacencyList(), size, 1.5 / size, seed=size)
+            vertices = self.graph.vertices_by_index
+            self.queries = [(vertices[rng.randrange(size)], vertices[rng.randrange(size)])
+                            for _ in range(self.num_queries)]
+            if self.use_index:
+                self.graph.can_reach(vertices[0], vertices[0])
+
+    def run(self):
+        if self.use_index:
+            if self.include_build:
+                self.graph.reachability = None
+            for source_vertex, dest_vertex in self.queries:
+                self.graph.can_reach(source_vertex, dest_vertex)
+        else:
+            for source_vertex, dest_vertex in self.queries:
+                any(vertex is dest_vertex for vertex in self.graph.traverse_depth_first(source_vertex))
+
+
+class PerfTestVertexChurn(PerfTest):
+    """
+    Replaces random vertices of a sparse graph, by removing them in place (with tombstones and compaction),
+    or by rebuilding the graph without them.
+    """
+
+    def __init__(self, name: str, rebuild: bool, num_changes: int = 20, edges_per_vertex: int = 4):
+        PerfTest.__init__(self, name)
+        self.rebuild = rebuild
+        self.num_changes = num_changes
+        self.edges_per_vertex = edges_per_vertex
+        self.graph = None
+        self.rng = None
+        self.next_key = 0
+
+    def init_run(self, size: int):
+        self.rng = Random(size)
+        self.graph = random_graph(GraphAdjacencyList(), size, self.edges_per_vertex / size, seed=size)
+        self.next_key = size
+
+    def run(self):
+        for _ in range(self.num_changes):
+            removed_vertex = self._random_vertex()
+            if self.rebuild:
+                self.graph = self._rebuild_without(self.graph, removed_vertex)
+            else:
+                self.graph.remove_vertex(removed_vertex)
+
+            new_vertex = self.graph.add_vertex(self.next_key)
+            self.next_key += 1
+            for _ in range(self.edges_per_vertex):
+                self.graph.add_edge(new_vertex, self._random_vertex())
+
+    def _random_vertex(self) -> Graph.Vertex:
+        # skip tombstones
+        while True:
+            vertex = self.graph.vertices_by_index[self.rng.randrange(len(self.graph.vertices_by_index))]
+            if vertex is not None:
+                return vertex
+
+    @staticmethod
+    def _rebuild_without(graph: Graph, removed_vertex: Graph.Vertex) -> Graph:
+        new_graph = GraphAdjacencyList()
+        new_graph.add_vertices(key for key in graph.vertices if key != removed_vertex.key)
+        sources = []
+        targets = []
+        weights = []
+        for source_vertex in graph.vertices.values():
+            for dest_vertex, weight in graph.get_edges_from_vertex(source_vertex):
+                if source_vertex is not removed_vertex and dest_vertex is not removed_vertex:
+                    sources.append(source_vertex.key)
+                    targets.append(dest_vertex.key)
+                    weights.append(weight)
+        new_graph.add_edges(sources, targets, weights)
+        return new_graph
+
+
+class PerfTestDensity(PerfTest):
+    """
+    Shortest path or breadth first distances on a random graph with 512 vertices, where the size is the edge density
+    in percent. Also records the memory used by the graph at each density.
+    """
+
+    def __init__(self, name: str, graph_type: type[Graph], search: str, num_vertices: int = 512):
+        """
+        Initialize the test.
+        :param name: name of the test
+        :param graph_type: graph implementation to test
+        :param search: 'shortest_path' or 'breadth_first'
+        :param num_vertices: number of vertices
+        """
+        PerfTest.__init__(self, name)
+        self.graph_type = graph_type
+        self.search = search
+        self.num_vertices = num_vertices
+        self.graph = None
+        self.density = 0
+        self.memory = {}  # density -> bytes allocated for the graph
+
+    def init_run(self, size: int):
+        if size != self.density:
+            self.graph = None
+            tracemalloc.start()
+            self.graph = random_graph(self.graph_type(), self.num_vertices, size / 100, seed=size)
+            self.memory[size] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            self.density = size
+
+    def run(self):
+        vertices = self.graph.vertices_by_index
+        if self.search == 'breadth_first':
+            self.graph.breadth_first_distances(vertices[:1])
+        else:
+            self.graph.shortest_path(vertices[0], vertices[-1])
+
+
+class PerfTestLargeGraph(PerfTest):
+    """
+    Traversal, shortest path (from the first vertex to the last vertex) or PageRank on a large generated graph.
+    """
+
+    def __init__(self, name: str, generate: Callable[[int], Graph], search: str):
+        """
+        Initialize the test.
+        :param name: name of the test
+        :param generate: function to generate a graph with the given number of vertices
+        :param search: 'depth_first', 'breadth_first' (vectorized on a frozen graph), 'shortest_path' or 'page_rank'
+        """
+        PerfTest.__init__(self, name)
+        self.generate = generate
+        self.search = search
+        self.graph = None
+
+    def init_run(self, size: int):
+        if self.graph is None or size != len(self.graph.vertices):
+            # release the previous graph before generating the next one
+            self.graph = None
+            self.graph = self.generate(size)
+            if self.search == 'breadth_first':
+                self.graph = self.graph.freeze()
+
+    def run(self):
+        vertices = self.graph.vertices_by_index
+        if self.search == 'depth_first':
+            for _ in self.graph.traverse_depth_first(vertices[0]):
+                pass
+        elif self.search == 'breadth_first':
+            self.graph.breadth_first_distances(vertices[:1])
+        elif self.search == 'page_rank':
+            self.graph.page_rank()
+        else:
+            self.graph.shortest_path(vertices[0], vertices[-1])
 
 
 def execute_tests(title: str, tests: list[PerfTest], sizes: list[int], log_x: bool = False, log_y: bool = False,
@@ -236,6 +748,163 @@ def perf_test():
 
     execute_tests('Shortest Path', shortest_path_tests, sizes)
 
+    large_sizes = [2 ** i for i in range(10, 18)]  # [1024, ..., 131072]
+    sparse_shortest_path_tests = [
+        PerfTestShortestPathSparse('Adjacency List', GraphAdjacencyList()),
+        PerfTestShortestPathFrozen('Frozen (CSR)', GraphAdjacencyList()),
+    ]
+    execute_tests('Shortest Path (Sparse)', sparse_shortest_path_tests, large_sizes, log_x=True, log_y=True,
+                  num_runs=3)
+
+    negative_weight_tests = [
+        PerfTestNegativeWeights('Dijkstra', spfa=False, negative_weights=False),
+        PerfTestNegativeWeights('SPFA', spfa=True, negative_weights=False),
+        PerfTestNegativeWeights('SPFA (Negative Weights)', spfa=True, negative_weights=True),
+    ]
+    execute_tests('Shortest Paths From One Vertex (Sparse, Cycles)', negative_weight_tests, large_sizes, log_x=True,
+                  log_y=True, num_runs=3)
+    for test in negative_weight_tests:
+        for size, settled in test.settled_per_vertex.items():
+            print(f'{test.operation} - vertices settled per vertex at size {size}: {settled:.2f}')
+
+    # finding the shortest paths again after every edge takes minutes above 8192 vertices
+    edge_insertion_sizes = [2 ** i for i in range(10, 14)]  # [1024, 2048, 4096, 8192]
+    edge_insertion_tests = [
+        PerfTestEdgeInsertions('Shortest Paths Found Again', repair=False),
+        PerfTestEdgeInsertions('Shortest Paths Repaired', repair=True),
+    ]
+    execute_tests('Shortest Paths From One Vertex After Each of 100 Edge Insertions (Sparse)', edge_insertion_tests,
+                  edge_insertion_sizes, log_x=True, log_y=True, num_runs=3)
+
+    # edges from each sparse row of the matrix are found with the row index instead of scanning the whole row
+    matrix_sizes = [2 ** i for i in range(10, 14)]  # [1024, ..., 8192]
+    sparse_matrix_tests = [
+        PerfTestShortestPathSparse('Adjacency List', GraphAdjacencyList()),
+        PerfTestShortestPathSparse('Adjacency Matrix', GraphAdjacencyMatrix()),
+    ]
+    execute_tests('Shortest Path (Sparse, Matrix)', sparse_matrix_tests, matrix_sizes, log_x=True, log_y=True,
+                  num_runs=3)
+
+    breadth_first_tests = [
+        PerfTestBreadthFirst('Traversal', GraphAdjacencyList(), search='traversal'),
+        PerfTestBreadthFirst('Level-Synchronous', GraphAdjacencyList(), search='levels'),
+        PerfTestBreadthFirst('Level-Synchronous (Frozen, Vectorized)', GraphAdjacencyList(), search='frozen'),
+    ]
+    execute_tests('Breadth First Search (Sparse)', breadth_first_tests, large_sizes, log_x=True, log_y=True,
+                  num_runs=3)
+
+    dense_sizes = [2 ** i for i in range(5, 9)]  # [32, 64, 128, 256]
+    repeated_shortest_path_tests = [
+        PerfTestRepeatedShortestPath('Repeated Dijkstra', all_pairs=False),
+        PerfTestRepeatedShortestPath('Floyd-Warshall', all_pairs=True),
+    ]
+    execute_tests('1000 Shortest Paths (Dense)', repeated_shortest_path_tests, dense_sizes, log_y=True, num_runs=3)
+
+    road_sizes = [4 ** i for i in range(4, 9)]  # [256, 1024, 4096, 16384, 65536]
+    road_network_tests = [
+        PerfTestRoadNetwork('Dijkstra', 'dijkstra'),
+        PerfTestRoadNetwork('A*', 'a_star'),
+        PerfTestRoadNetwork('Bidirectional Dijkstra', 'bidirectional'),
+    ]
+    execute_tests('Point-to-Point Shortest Path (Road Network)', road_network_tests, road_sizes, log_x=True,
+                  log_y=True)
+    for test in road_network_tests:
+        for size, settled_counts in test.settled_counts.items():
+            print(f'{test.operation} - average vertices settled at size {size}: '
+                  f'{sum(settled_counts) / len(settled_counts):.0f}')
+
+    # preprocessing grows faster than linearly on grids (about 40s at 16384 vertices), so the hierarchy is compared
+    # on smaller networks
+    hierarchy_sizes = [4 ** i for i in range(4, 8)]  # [256, 1024, 4096, 16384]
+    hierarchy_tests = [
+        PerfTestRoadNetwork('Bidirectional Dijkstra', 'bidirectional'),
+        PerfTestRoadNetwork('Contraction Hierarchy', 'contraction_hierarchy'),
+    ]
+    execute_tests('Point-to-Point Shortest Path (Road Network, Preprocessed)', hierarchy_tests, hierarchy_sizes,
+                  log_x=True, log_y=True)
+    for test in hierarchy_tests:
+        for size, settled_counts in test.settled_counts.items():
+            print(f'{test.operation} - average vertices settled at size {size}: '
+                  f'{sum(settled_counts) / len(settled_counts):.0f}')
+    for size, build_time in hierarchy_tests[1].build_times.items():
+        print(f'Contraction Hierarchy - build time at size {size}: {build_time:.2f}s')
+
+    multi_source_sizes = [2 ** i for i in range(10, 16)]  # [1024, ..., 32768]
+    multi_source_tests = [PerfTestShortestPathsFromMany(f'{max_workers} Worker(s)', max_workers)
+                          for max_workers in [1, 2, 4, 8]]
+    execute_tests('Shortest Paths from 64 Vertices', multi_source_tests, multi_source_sizes, log_x=True, log_y=True,
+                  num_runs=3)
+
+    load_tests = [
+        PerfTestLoadGraph('Rebuild', load=False),
+        PerfTestLoadGraph('Load', load=True, mmap=False),
+        PerfTestLoadGraph('Load (Memory-Mapped)', load=True, mmap=True),
+    ]
+    execute_tests('Load Graph', load_tests, large_sizes, log_x=True, log_y=True, num_runs=3)
+    for test in load_tests:
+        os.remove(test.path)
+
+    edge_sizes = [4 ** i for i in range(5, 11)]  # [1024, ..., 1048576]
+    add_edges_tests = [
+        PerfTestAddEdges('Adjacency List (add_edge)', GraphAdjacencyList, bulk=False),
+        PerfTestAddEdges('Adjacency List (add_edges)', GraphAdjacencyList, bulk=True),
+        PerfTestAddEdges('Adjacency Matrix (add_edge)', GraphAdjacencyMatrix, bulk=False),
+        PerfTestAddEdges('Adjacency Matrix (add_edges)', GraphAdjacencyMatrix, bulk=True),
+    ]
+    execute_tests('Add Edges', add_edges_tests, edge_sizes, log_x=True, log_y=True, num_runs=3)
+
+    connected_tests = [
+        PerfTestConnected('Breadth First Search', use_index=False),
+        PerfTestConnected('Union-Find', use_index=True),
+    ]
+    execute_tests('100 Connectivity Queries', connected_tests, large_sizes, log_x=True, log_y=True, num_runs=3)
+
+    reachability_tests = [
+        PerfTestReachability('Depth First Search', use_index=False),
+        PerfTestReachability('Reachability Index (Including Build)', use_index=True, include_build=True),
+        PerfTestReachability('Reachability Index', use_index=True),
+    ]
+    # the index takes O(V²) memory, and depth first search is too slow for larger graphs
+    reachability_sizes = [2 ** i for i in range(10, 15)]  # [1024, ..., 16384]
+    execute_tests('1000 Reachability Queries', reachability_tests, reachability_sizes, log_x=True, log_y=True,
+                  num_runs=3)
+
+    churn_tests = [
+        PerfTestVertexChurn('Rebuild', rebuild=True),
+        PerfTestVertexChurn('Remove (Tombstones)', rebuild=False),
+    ]
+    execute_tests('Replace 20 Vertices', churn_tests, large_sizes, log_x=True, log_y=True, num_runs=3)
+
+    densities = [1, 2, 5, 10, 15, 20, 30, 50, 80]  # percent
+    for search, title in [('shortest_path', 'Shortest Path'), ('breadth_first', 'Breadth First Distances')]:
+        density_tests = [
+            PerfTestDensity('Adjacency List', GraphAdjacencyList, search),
+            PerfTestDensity('Adjacency Matrix', GraphAdjacencyMatrix, search),
+            PerfTestDensity('Adaptive', GraphAdaptive, search),
+            PerfTestDensity('Bit Matrix (Unweighted)', GraphAdjacencyBitMatrix, search),
+        ]
+        execute_tests(f'{title} vs Density % (512 Vertices)', density_tests, densities, log_y=True)
+    for test in density_tests:
+        for density, memory in test.memory.items():
+            print(f'{test.operation} - memory at {density}% density: {memory / 1024:.0f} KiB')
+
+    huge_sizes = [10 ** 5, 2 * 10 ** 5, 5 * 10 ** 5, 10 ** 6]
+    generators = {
+        'Random (4 Edges per Vertex)': lambda size: random_graph(GraphAdjacencyList(), size, 4 / size, seed=size,
+                                                                 weights=(1, 5)),
+        'Power-Law': lambda size: barabasi_albert_graph(GraphAdjacencyList(), size, 2, seed=size, weights=(1, 5)),
+        'Grid': lambda size: grid_graph(GraphAdjacencyList(), isqrt(size), isqrt(size), seed=size, weights=(1, 2)),
+    }
+    for graph_name, generate in generators.items():
+        large_graph_tests = [
+            PerfTestLargeGraph('Depth First Traversal', generate, search='depth_first'),
+            PerfTestLargeGraph('Breadth First Distances (Frozen)', generate, search='breadth_first'),
+            PerfTestLargeGraph('Shortest Path', generate, search='shortest_path'),
+            PerfTestLargeGraph('PageRank', generate, search='page_rank'),
+        ]
+        execute_tests(f'Large Graphs - {graph_name}', large_graph_tests, huge_sizes, log_x=True, log_y=True,
+                      num_runs=1)
+
 
 if __name__ == '__main__':
     perf_test()
@@ -0,0 +1,61 @@
+from module8.graph import Graph
+
+
+class ReachabilityIndex:
+    """
+    Answers whether one vertex can reach another by a directed path in O(1) time, using the transitive closure of the
+    graph stored as bitsets.
+    Vertices in the same strongly connected component can reach the same vertices, so the graph is first condensed
+    into a graph of components with no cycles, and one bitset is stored for each component. Components are numbered
+    in reverse topological order, so a component can only reach components with lower numbers, and each bitset only
+    needs one bit for each lower numbered component.
+    Building the index takes O(V + E + E * C / 64) time and O(C² / 16) bytes, where C is the number of components.
+    The index is a snapshot, so it must be rebuilt if the graph is modified (see Graph.can_reach).
+    """
+
+    def __init__(self, graph: Graph):
+        """
+        Builds the index for the given graph.
+        :param graph: graph to index
+        """
+        # vertex index -> component number, or -1 for removed vertices
+        self.component_indices = [-1] * len(graph.vertices_by_index)
+        # component number -> bit c is set if the component can reach component c
+        self.closures = list[bytes]()
+
+        # Tarjan's algorithm returns each component before any component that has edges to it
+        components = graph.strongly_connected_components()
+        for component_index, component in enumerate(components):
+            for vertex in component:
+                self.component_indices[vertex.index] = component_index
+
+        closures = list[int]()
+        for component_index, component in enumerate(components):
+            closure = 1 << component_index
+            for vertex in component:
+                for dest_index, _ in graph._get_edge_indices(vertex.index):
+                    dest_component_index = self.component_indices[dest_index]
+                    if dest_component_index != component_index:
+                        closure |= closures[dest_component_index]
+            closures.append(closure)
+            self.closures.append(closure.to_bytes(component_index // 8 + 1, 'little'))
+
+    def __len__(self) -> int:
+        """
+        Returns the number of strongly connected components.
+        """
+        return len(self.closures)
+
+    def can_reach(self, source_index: int, dest_index: int) -> bool:
+        """
+        Returns true if there is a directed path from the source vertex to the destination vertex, in O(1) time.
+        :param source_index: index of the source vertex
+        :param dest_index: index of the destination vertex
+        :return: true if the destination vertex can be reached from the source vertex
+        """
+        source_component_index = self.component_indices[source_index]
+        dest_component_index = self.component_indices[dest_index]
+        if dest_component_index > source_component_index:
+            # edges only go to lower numbered components
+            return False
+        return bool(self.closures[source_component_index][dest_component_index >> 3] >> (dest_component_index & 7) & 1)
@@ -0,0 +1,71 @@
+class VisitedSet:
+    """
+    Set of the integers 0 to n - 1 that can be cleared in O(1) time, used to mark visited vertex indices so a
+    traversal doesn't need to allocate and zero a new buffer each time.
+    Each element stores the epoch in which it was last added, and an element is in the set if its epoch is the current
+    epoch, so clearing just starts a new epoch. Epochs are stored in a bytearray, which is only zeroed when the epoch
+    wraps around, once every 255 clears.
+    Traversals read stamps and epoch directly, since method calls are slow in inner loops.
+    """
+
+    max_epoch = 255
+
+    def __init__(self, size: int = 0):
+        """
+        Initialize an empty set.
+        :param size: number of elements
+        """
+        self.stamps = bytearray(size)  # element -> epoch in which it was last added
+        self.epoch = 1
+
+    def __len__(self) -> int:
+        return len(self.stamps)
+
+    def __contains__(self, element: int) -> bool:
+        return self.stamps[element] == self.epoch
+
+    def add(self, element: int) -> None:
+        """
+        Adds an element to the set.
+        :param element: element to add
+        :raises IndexError: if the element is out of range
+        """
+        self.stamps[element] = self.epoch
+
+    def clear(self, size: int = 0) -> None:
+        """
+        Removes all elements, in O(1) amortized time, and grows the set to at least the given size.
+        :param size: minimum number of elements
+        """
+        if self.epoch == self.max_epoch:
+            self.stamps = bytearray(max(size, len(self.stamps)))
+            self.epoch = 1
+        else:
+            self.epoch += 1
+            if len(self.stamps) < size:
+                self.stamps.extend(bytes(size - len(self.stamps)))
+
+
+class SearchLabels(VisitedSet):
+    """
+    Distance and previous vertex index for each vertex index reached by a shortest path search, so a point to point
+    search doesn't need to allocate and fill lists of V distances and previous vertex indices.
+    The labels of an element are only valid while it is in the set, so like VisitedSet, clearing takes O(1) time and
+    the lists are never refilled: a search adds each vertex index when it first reaches it, and reads the labels of
+    vertex indices that are not in the set as inf and -1.
+    """
+
+    def __init__(self, size: int = 0):
+        """
+        Initialize an empty set.
+        :param size: number of elements
+        """
+        super().__init__(size)
+        self.distances = [float('inf')] * size  # element -> distance from the start, if in the set
+        self.pred_indices = [-1] * size  # element -> previous element on the shortest path, if in the set
+
+    def clear(self, size: int = 0) -> None:
+        super().clear(size)
+        if len(self.distances) < size:
+            self.distances.extend([float('inf')] * (size - len(self.distances)))
+            self.pred_indices.extend([-1] * (size - len(self.pred_indices)))
@@ -0,0 +1,149 @@
+import math
+from random import Random
+
+import pytest
+
+from module8.contraction_hierarchy import ContractionHierarchy
+from module8.graph import Graph
+from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+from module8.graph_generator import grid_graph, random_graph
+
+
+# All tests are run for both graph implementations.
+@pytest.fixture(params=[GraphAdjacencyList, GraphAdjacencyMatrix])
+def graph(request) -> Graph:
+    # Instantiate the graph implementation
+    return request.param()
+
+
+def test_empty(graph):
+    hierarchy = ContractionHierarchy(graph)
+    assert len(hierarchy) == 0
+    assert hierarchy.ranks == []
+
+
+def test_shortcut(graph):
+    """
+    Tests a path where the middle vertex is contracted first, so a shortcut is needed between its neighbors.
+    """
+    vertex1, vertex2, vertex3, vertex4 = graph.add_vertices([1, 2, 3, 4])
+    graph.add_edge(vertex1, vertex2, 1.0)
+    graph.add_edge(vertex2, vertex3, 2.0)
+    graph.add_edge(vertex3, vertex4, 3.0)
+    # longer path from 1 to 3, so vertex 2 is needed
+    graph.add_edge(vertex1, vertex3, 5.0)
+    hierarchy = ContractionHierarchy(graph)
+    assert sorted(hierarchy.ranks) == [0, 1, 2, 3]
+
+    assert hierarchy.shortest_path(vertex1, vertex4) == [vertex1, vertex2, vertex3, vertex4]
+    assert hierarchy.distance(vertex1, vertex4) == 6.0
+    assert hierarchy.shortest_path(vertex4, vertex1) == []
+    assert hierarchy.distance(vertex4, vertex1) == math.inf
+    assert hierarchy.shortest_path(vertex2, vertex2) == []
+    assert hierarchy.distance(vertex2, vertex2) == 0.0
+
+
+def test_negative_weights(graph):
+    vertex1, vertex2 = graph.add_vertices([1, 2])
+    graph.add_edge(vertex1, vertex2, -1.0)
+    with pytest.raises(ValueError):
+        ContractionHierarchy(graph)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_grid(graph, seed):
+    """
+    Compares paths with Graph.shortest_path between random vertices on a grid with random weights (so shortest
+    paths are unique), with some one-way edges.
+    """
+    grid_graph(graph, 12, 12, seed=seed, weights=(1, 2))
+    rng = Random(seed)
+    vertices = graph.vertices_by_index
+    for _ in range(20):
+        vertex = vertices[rng.randrange(len(vertices))]
+        dest_vertex, _ = next(iter(graph.get_edges_from_vertex(vertex)))
+        graph.remove_edge(vertex, dest_vertex)
+    hierarchy = ContractionHierarchy(graph)
+    assert len(hierarchy) > 0
+
+    for _ in range(100):
+        start_vertex = vertices[rng.randrange(len(vertices))]
+        end_vertex = vertices[rng.randrange(len(vertices))]
+        path = hierarchy.shortest_path(start_vertex, end_vertex)
+        assert path == graph.shortest_path(start_vertex, end_vertex)
+        assert hierarchy.distance(start_vertex, end_vertex) == pytest.approx(
+            graph.shortest_paths_from(start_vertex).distance(end_vertex))
+
+
+def test_witness_limits(graph):
+    """
+    Verifies that witness searches limited to a few vertices or edges only add unnecessary shortcuts, without
+    changing any shortest paths.
+    """
+    class LimitedContractionHierarchy(ContractionHierarchy):
+        witness_settle_limit = 2
+        witness_hop_limit = 1
+
+    grid_graph(graph, 8, 8, seed=3, weights=(1, 2))
+    num_shortcuts = len(ContractionHierarchy(graph))
+    hierarchy = LimitedContractionHierarchy(graph)
+    assert len(hierarchy) > num_shortcuts
+
+    for start_vertex in graph.vertices_by_index[::5]:
+        tree = graph.shortest_paths_from(start_vertex)
+        for end_vertex in graph.vertices_by_index:
+            assert hierarchy.distance(start_vertex, end_vertex) == pytest.approx(tree.distance(end_vertex))
+            assert hierarchy.shortest_path(start_vertex, end_vertex) == tree.shortest_path(end_vertex)
+
+
+def test_random_directed(graph):
+    """
+    Compares distances with Graph.shortest_paths_from on a sparse directed graph with unreachable vertices.
+    """
+    random_graph(graph, 60, 0.04, seed=1, weights=(1, 10))
+    hierarchy = ContractionHierarchy(graph)
+    for start_vertex in graph.vertices_by_index:
+        tree = graph.shortest_paths_from(start_vertex)
+        for end_vertex in graph.vertices_by_index:
+            assert hierarchy.distance(start_vertex, end_vertex) == pytest.approx(tree.distance(end_vertex))
+            assert hierarchy.shortest_path(start_vertex, end_vertex) == tree.shortest_path(end_vertex)
+
+
+def test_removed_vertices(graph):
+    """
+    Verifies that building a hierarchy doesn't compact the graph, and that compacting the graph later doesn't change
+    the hierarchy.
+    """
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(6))
+    graph.add_edges(range(5), range(1, 6), [1.0, 2.0, 3.0, 4.0, 5.0], by_index=True)
+    graph.add_edge(vertices[1], vertices[4], 20.0)
+    graph.remove_vertex(vertices[2])
+    hierarchy = ContractionHierarchy(graph)
+    assert graph.tombstone_count == 1
+    assert hierarchy.shortest_path(vertices[0], vertices[5]) == [vertices[0], vertices[1], vertices[4], vertices[5]]
+
+    graph.compact()
+    assert hierarchy.shortest_path(vertices[0], vertices[5]) == [vertices[0], vertices[1], vertices[4], vertices[5]]
+    assert hierarchy.distance(vertices[3], vertices[5]) == 9.0
+    with pytest.raises(KeyError):
+        hierarchy.distance(vertices[2], vertices[5])
+
+
+def test_save_load(graph, tmp_path):
+    grid_graph(graph, 8, 8, seed=0, weights=(1, 2))
+    hierarchy = ContractionHierarchy(graph)
+    path = str(tmp_path / 'hierarchy.npz')
+    hierarchy.save(path)
+
+    loaded = ContractionHierarchy.load(path, graph)
+    assert loaded.ranks == hierarchy.ranks
+    assert loaded.up_edges == hierarchy.up_edges
+    assert loaded.down_edges == hierarchy.down_edges
+    assert loaded.shortcut_middles == hierarchy.shortcut_middles
+    vertices = graph.vertices_by_index
+    assert loaded.shortest_path(vertices[0], vertices[-1]) == graph.shortest_path(vertices[0], vertices[-1])
+
+    with pytest.raises(ValueError):
+        ContractionHierarchy.load(path, type(graph)())
@@ -0,0 +1,70 @@
+import pytest
+
+from module8.disjoint_set import DisjointSet
+
+
+def test_empty():
+    disjoint_set = DisjointSet()
+    assert len(disjoint_set) == 0
+    assert disjoint_set.count == 0
+    assert repr(disjoint_set) == '[]'
+
+    with pytest.raises(IndexError):
+        disjoint_set.find(0)
+
+
+def test_add():
+    disjoint_set = DisjointSet()
+    assert disjoint_set.add() == 0
+    assert disjoint_set.add() == 1
+    disjoint_set.extend(2)
+    assert len(disjoint_set) == 4
+    assert disjoint_set.count == 4
+    assert repr(disjoint_set) == '[[0], [1], [2], [3]]'
+    for element in range(4):
+        assert disjoint_set.find(element) == element
+
+
+def test_union():
+    disjoint_set = DisjointSet(6)
+    assert disjoint_set.union(0, 1)
+    assert disjoint_set.union(2, 3)
+    assert disjoint_set.count == 4
+    assert disjoint_set.connected(0, 1)
+    assert disjoint_set.connected(3, 2)
+    assert not disjoint_set.connected(1, 2)
+
+    assert disjoint_set.union(1, 3)
+    assert not disjoint_set.union(0, 2)  # already connected
+    assert disjoint_set.count == 3
+    assert disjoint_set.connected(0, 3)
+    assert not disjoint_set.connected(0, 4)
+    assert repr(disjoint_set) == '[[0, 1, 2, 3], [4], [5]]'
+
+
+def test_union_by_rank():
+    """
+    Verifies that trees stay shallow, and that find compresses paths.
+    """
+    disjoint_set = DisjointSet(1024)
+    # merge pairs, then pairs of pairs, etc.
+    step = 1
+    while step < 1024:
+        for element in range(0, 1024, 2 * step):
+            disjoint_set.union(element, element + step)
+        step *= 2
+    assert disjoint_set.count == 1
+    assert max(disjoint_set.ranks) == 10
+
+    root = disjoint_set.find(1023)
+    assert disjoint_set.parents[1023] == root
+
+
+def test_copy():
+    disjoint_set = DisjointSet(3)
+    disjoint_set.union(0, 1)
+    copy = disjoint_set.copy()
+    copy.union(1, 2)
+    assert copy.count == 1
+    assert disjoint_set.count == 2
+    assert not disjoint_set.connected(0, 2)
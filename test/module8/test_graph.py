@@ -1,12 +1,14 @@
+import numpy as np
 import pytest
 
 from module8.graph import Graph
+from module8.graph_adaptive import GraphAdaptive
 from module8.graph_adjacency_list import GraphAdjacencyList
 from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
 
 
-# All tests are run for both graph implementations.
-@pytest.fixture(params=[GraphAdjacencyList, GraphAdjacencyMatrix])
+# All tests are run for all graph implementations.
+@pytest.fixture(params=[GraphAdjacencyList, GraphAdjacencyMatrix, GraphAdaptive])
 def graph(request) -> Graph:
     # Instantiate the graph implementation
     return request.param()
@@ -41,6 +43,16 @@ def test_add_vertex(graph):
     assert graph.get_vertex(0) is None
 
 
+def test_vertex_slots(graph):
+    """
+    Verifies that vertices use slots instead of a dictionary, and that the value can still be changed.
+    """
+    vertex = graph.add_vertex(1, 'a')
+    assert not hasattr(vertex, '__dict__')
+    vertex.value = 'b'
+    assert graph.get_vertex(1).value == 'b'
+
+
 def test_add_vertex_duplicate_key(graph):
     """
     Verify that vertex with duplicate key cannot be added.
@@ -79,6 +91,272 @@ def test_add_edge(graph):
     assert graph.get_edge_weight(vertex1, vertex2) == 1
 
 
+def test_add_vertex_after_edges(graph):
+    """
+    Verifies that vertices can be added after edges, including enough to grow the graph storage.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    graph.add_edge(vertex1, vertex2, 2)
+
+    vertices = [vertex1, vertex2]
+    for key in range(3, 101):
+        vertex = graph.add_vertex(key)
+        graph.add_edge(vertices[-1], vertex, key)
+        vertices.append(vertex)
+
+    assert graph.get_edge_weight(vertex1, vertex2) == 2
+    for i in range(1, len(vertices) - 1):
+        assert list(graph.get_edges_from_vertex(vertices[i])) == [(vertices[i + 1], i + 2)]
+        assert graph.get_edge_weight(vertices[i + 1], vertices[i]) is None
+    assert list(graph.get_edges_from_vertex(vertices[-1])) == []
+    assert graph.shortest_path(vertex1, vertices[-1]) == vertices
+
+
+def test_add_vertices(graph):
+    """
+    Tests that vertices can be added in a batch, from a list or NumPy array.
+    """
+    vertex1, vertex2 = graph.add_vertices([1, 2], ['a', 'b'])
+    vertices = graph.add_vertices(np.arange(3, 21))
+
+    assert (vertex1.key, vertex1.index, vertex1.value) == (1, 0, 'a')
+    assert (vertex2.key, vertex2.index, vertex2.value) == (2, 1, 'b')
+    assert [vertex.key for vertex in vertices] == list(range(3, 21))
+    assert all(type(vertex.key) is int for vertex in vertices)
+    assert graph.vertices_by_index == [vertex1, vertex2] + vertices
+    assert graph.get_vertex(20) is vertices[-1]
+    assert list(graph.get_edges_from_vertex(vertices[-1])) == []
+
+    graph.add_edge(vertex1, vertices[-1], 2)
+    assert graph.get_edge_weight(vertex1, vertices[-1]) == 2
+
+
+def test_add_vertices_duplicate_key(graph):
+    """
+    Verifies that no vertices are added if any key is a duplicate.
+    """
+    graph.add_vertex(1)
+    with pytest.raises(KeyError):
+        graph.add_vertices([2, 1])
+    with pytest.raises(KeyError):
+        graph.add_vertices([2, 2])
+    with pytest.raises(ValueError):
+        graph.add_vertices([2, 3], ['a'])
+    assert list(graph.vertices) == [1]
+
+
+def test_add_edges(graph):
+    """
+    Tests that edges can be added in a batch, by key or by index.
+    """
+    vertex1, vertex2, vertex3 = graph.add_vertices(['v1', 'v2', 'v3'])
+
+    graph.add_edges(['v1', 'v1'], ['v2', 'v3'])
+    graph.add_edges(np.array([1, 2]), np.array([2, 0]), np.array([2.5, 3.0]), by_index=True)
+
+    assert list(graph.get_edges_from_vertex(vertex1)) == [(vertex2, 1), (vertex3, 1)]
+    assert list(graph.get_edges_from_vertex(vertex2)) == [(vertex3, 2.5)]
+    assert list(graph.get_edges_from_vertex(vertex3)) == [(vertex1, 3)]
+    assert list(graph.get_edges_to_vertex(vertex3)) == [(vertex1, 1), (vertex2, 2.5)]
+    assert graph.shortest_path(vertex2, vertex1) == [vertex2, vertex3, vertex1]
+
+    # single weight for all edges
+    graph.add_edges([0], [0], 4.0, by_index=True)
+    assert graph.get_edge_weight(vertex1, vertex1) == 4
+
+
+def test_add_edges_undirected(graph):
+    """
+    Tests that undirected edges can be added in a batch, and are included in connected components.
+    """
+    vertex1, vertex2, vertex3, vertex4 = graph.add_vertices(['v1', 'v2', 'v3', 'v4'])
+    graph.add_edges(['v1', 'v2'], ['v2', 'v3'], [2.0, 3.0], undirected=True)
+
+    assert list(graph.get_edges_from_vertex(vertex2)) == [(vertex1, 2), (vertex3, 3)]
+    assert list(graph.get_edges_from_vertex(vertex3)) == [(vertex2, 3)]
+    assert graph.connected(vertex1, vertex3)
+    assert not graph.connected(vertex1, vertex4)
+    assert graph.connected_component_count() == 2
+
+
+def test_add_edges_invalid(graph):
+    """
+    Verifies that add_edges raises an error for unknown vertices or mismatched lengths.
+    """
+    graph.add_vertices(['v1', 'v2'])
+    with pytest.raises(KeyError):
+        graph.add_edges(['v1'], ['v3'])
+    with pytest.raises(IndexError):
+        graph.add_edges([0], [2], by_index=True)
+    with pytest.raises(ValueError):
+        graph.add_edges(['v1', 'v2'], ['v2'])
+    with pytest.raises(ValueError):
+        graph.add_edges(['v1', 'v2'], ['v2', 'v1'], [1.0])
+
+
+def test_add_edges_removed_vertex(graph):
+    """
+    Verifies that add_edges by index raises an error for removed vertices, without adding any edges.
+    """
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(4))
+    graph.remove_vertex(vertices[3])
+    with pytest.raises(IndexError):
+        graph.add_edges([0, 1], [1, 3], by_index=True)
+    with pytest.raises(IndexError):
+        graph.add_edges([3], [0], by_index=True)
+    assert list(graph.get_edges_from_vertex(vertices[0])) == []
+    assert list(graph.traverse_breadth_first(vertices[0])) == [vertices[0]]
+
+
+def test_remove_edge(graph):
+    """
+    Tests that edges can be removed, and that cached results are cleared.
+    """
+    vertex1, vertex2, vertex3 = graph.add_vertices([1, 2, 3])
+    graph.add_edge(vertex1, vertex2)
+    graph.add_edge(vertex2, vertex3)
+    graph.add_edge(vertex1, vertex3, 5.0)
+    assert graph.shortest_path(vertex1, vertex3) == [vertex1, vertex2, vertex3]
+
+    graph.remove_edge(vertex2, vertex3)
+    assert graph.get_edge_weight(vertex2, vertex3) is None
+    assert list(graph.get_edges_from_vertex(vertex2)) == []
+    assert list(graph.get_edges_to_vertex(vertex3)) == [(vertex1, 5)]
+    assert graph.shortest_path(vertex1, vertex3) == [vertex1, vertex3]
+
+    with pytest.raises(KeyError):
+        graph.remove_edge(vertex2, vertex3)
+
+
+def test_remove_edge_undirected(graph):
+    """
+    Tests that removing undirected edges updates connected components.
+    """
+    vertex1, vertex2, vertex3 = graph.add_vertices([1, 2, 3])
+    graph.add_edge_undirected(vertex1, vertex2)
+    graph.add_edge_undirected(vertex2, vertex3)
+    graph.add_edge(vertex1, vertex3)
+    assert graph.connected(vertex1, vertex3)
+
+    graph.remove_edge_undirected(vertex3, vertex2)
+    assert list(graph.get_edges_from_vertex(vertex2)) == [(vertex1, 1)]
+    assert not graph.connected(vertex1, vertex3)
+    assert graph.connected(vertex1, vertex2)
+    assert graph.connected_component_count() == 2
+
+    # only one direction
+    with pytest.raises(KeyError):
+        graph.remove_edge_undirected(vertex1, vertex3)
+    assert graph.get_edge_weight(vertex1, vertex3) == 1
+
+
+def test_remove_vertex(graph):
+    """
+    Tests that removing a vertex removes its edges, and leaves a tombstone that traversals skip.
+    """
+    graph.compact_threshold = 1.0  # only compact manually
+    vertex1, vertex2, vertex3, vertex4 = graph.add_vertices([1, 2, 3, 4])
+    graph.add_edge(vertex1, vertex2)
+    graph.add_edge(vertex2, vertex3)
+    graph.add_edge(vertex2, vertex2)
+    graph.add_edge(vertex3, vertex2)
+    graph.add_edge(vertex1, vertex4, 5.0)
+    graph.add_edge(vertex4, vertex3)
+
+    graph.remove_vertex(vertex2)
+    assert graph.get_vertex(2) is None
+    assert graph.vertices_by_index[1] is None
+    assert graph.tombstone_count == 1
+    assert repr(graph) == '{1: {4: 5.0}, 3: {}, 4: {3: 1.0}}'
+    assert list(graph.get_edges_to_vertex(vertex3)) == [(vertex4, 1)]
+
+    assert list(graph.traverse_depth_first()) == [vertex3, vertex4, vertex1]
+    assert list(graph.traverse_breadth_first(vertex1)) == [vertex1, vertex4, vertex3]
+    assert graph.strongly_connected_components() == [[vertex3], [vertex4], [vertex1]]
+    assert graph.topological_sort() == [vertex1, vertex4, vertex3]
+    assert graph.shortest_path(vertex1, vertex3) == [vertex1, vertex4, vertex3]
+    assert graph.breadth_first_distances([vertex1]).tolist() == [0, -1, 2, 1]
+    assert graph.connected_component_count() == 3
+
+    # new vertices don't reuse the tombstone
+    vertex5 = graph.add_vertex(5)
+    assert vertex5.index == 4
+    graph.add_edge(vertex3, vertex5)
+    assert graph.shortest_path(vertex1, vertex5) == [vertex1, vertex4, vertex3, vertex5]
+
+    with pytest.raises(KeyError):
+        graph.remove_vertex(vertex2)
+
+
+def test_compact(graph):
+    """
+    Tests that compacting renumbers vertex indices and keeps all edges.
+    """
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(6))
+    graph.add_edges(range(5), range(1, 6), [1.0, 2.0, 3.0, 4.0, 5.0], by_index=True)
+    graph.add_edge(vertices[5], vertices[0], 6.0)
+    expected_repr = '{0: {}, 2: {3: 3.0}, 3: {}, 5: {0: 6.0}}'
+
+    graph.remove_vertex(vertices[1])
+    graph.remove_vertex(vertices[4])
+    assert repr(graph) == expected_repr
+    graph.compact()
+    assert graph.tombstone_count == 0
+    assert graph.vertices_by_index == [vertices[0], vertices[2], vertices[3], vertices[5]]
+    assert [vertex.index for vertex in graph.vertices_by_index] == [0, 1, 2, 3]
+    assert repr(graph) == expected_repr
+    assert list(graph.get_edges_to_vertex(vertices[0])) == [(vertices[5], 6)]
+    assert graph.shortest_path(vertices[2], vertices[3]) == [vertices[2], vertices[3]]
+    assert graph.connected_component_count() == 4
+
+    # nothing to do
+    graph.compact()
+    assert graph.vertices_by_index == [vertices[0], vertices[2], vertices[3], vertices[5]]
+
+
+def test_compact_threshold(graph):
+    """
+    Verifies that the graph is compacted automatically when enough vertices are removed, but not when frozen.
+    """
+    vertices = graph.add_vertices(range(8))
+    graph.add_edges(range(7), range(1, 8), by_index=True)
+    graph.remove_vertex(vertices[0])
+    graph.remove_vertex(vertices[1])
+    assert graph.tombstone_count == 2
+    graph.remove_vertex(vertices[2])  # more than 25% removed
+    assert graph.tombstone_count == 0
+    assert len(graph.vertices_by_index) == 5
+    assert vertices[3].index == 0
+
+    graph.remove_vertex(vertices[7])
+    assert graph.tombstone_count == 1
+    frozen = graph.freeze()
+    assert graph.tombstone_count == 1
+    assert [vertex.key for vertex in frozen.vertices_by_index] == [3, 4, 5, 6]
+    path = frozen.shortest_path(frozen.get_vertex(3), frozen.get_vertex(6))
+    assert [vertex.key for vertex in path] == [3, 4, 5, 6]
+
+
+def test_compact_after_freeze(graph):
+    """
+    Verifies that compacting the graph doesn't change a frozen copy made before.
+    """
+    vertex_a, vertex_b, vertex_c, vertex_d = graph.add_vertices(['a', 'b', 'c', 'd'])
+    graph.add_edge(vertex_a, vertex_b)
+    graph.add_edge(vertex_c, vertex_d)
+    frozen = graph.freeze()
+    graph.remove_vertex(vertex_a)
+    graph.remove_vertex(vertex_b)  # more than 25% removed
+    assert graph.tombstone_count == 0
+
+    path = frozen.shortest_path(frozen.get_vertex('c'), frozen.get_vertex('d'))
+    assert [vertex.key for vertex in path] == ['c', 'd']
+    assert graph.shortest_path(vertex_c, vertex_d) == [vertex_c, vertex_d]
+
+
 def test_add_edge_with_weight(graph):
     """
     Verifies that edges can be added with add_vertex using a given weight.
@@ -152,6 +430,86 @@ def test_add_edge_undirected_with_weight(graph):
     assert list(graph.get_edges_from_vertex(vertex3)) == [(vertex1, 3), (vertex2, 4)]
 
 
+def test_connected(graph):
+    """
+    Tests that connectivity is tracked as undirected edges are added.
+    """
+    vertex1, vertex2, vertex3, vertex4 = graph.add_vertices([1, 2, 3, 4])
+    assert graph.connected_component_count() == 4
+    assert graph.connected(vertex1, vertex1)
+    assert not graph.connected(vertex1, vertex2)
+
+    graph.add_edge_undirected(vertex1, vertex2)
+    graph.add_edge_undirected(vertex3, vertex4)
+    assert graph.connected_component_count() == 2
+    assert graph.connected(vertex2, vertex1)
+    assert not graph.connected(vertex1, vertex3)
+
+    # directed edges are not included
+    graph.add_edge(vertex2, vertex3)
+    assert not graph.connected(vertex1, vertex4)
+
+    graph.add_edge_undirected(vertex4, vertex2)
+    vertex5 = graph.add_vertex(5)
+    assert graph.connected_component_count() == 2
+    assert graph.connected(vertex1, vertex4)
+    assert not graph.connected(vertex1, vertex5)
+    frozen = graph.freeze()
+    assert frozen.connected(frozen.get_vertex(1), frozen.get_vertex(4))
+
+
+def test_connected_directed_pairs(graph):
+    """
+    Verifies that directed edges in both directions count as an undirected edge, the same way before and after the
+    index is rebuilt.
+    """
+    vertex_x, vertex_y, vertex_z = graph.add_vertices(['x', 'y', 'z'])
+    graph.add_edge(vertex_x, vertex_y)
+    assert not graph.connected(vertex_x, vertex_y)
+    graph.add_edge(vertex_y, vertex_x)
+    graph.add_edge(vertex_x, vertex_z)
+    assert graph.connected(vertex_x, vertex_y)
+    assert not graph.connected(vertex_x, vertex_z)
+    assert graph.connected_component_count() == 2
+
+    graph.remove_edge(vertex_x, vertex_z)
+    assert graph.connected(vertex_x, vertex_y)
+    assert graph.connected_component_count() == 2
+
+    graph.add_edges(['z'], ['x'])
+    assert not graph.connected(vertex_x, vertex_z)
+    graph.add_edges(['x'], ['z'])
+    assert graph.connected(vertex_x, vertex_z)
+    assert graph.connected_component_count() == 1
+
+
+def test_minimum_spanning_tree(graph):
+    """
+    Tests Kruskal's algorithm on a connected graph and a graph with two components.
+    """
+    vertex1, vertex2, vertex3, vertex4, vertex5 = graph.add_vertices([1, 2, 3, 4, 5])
+    assert graph.minimum_spanning_tree() == []
+
+    graph.add_edge_undirected(vertex1, vertex2, 4.0)
+    graph.add_edge_undirected(vertex1, vertex3, 1.0)
+    graph.add_edge_undirected(vertex2, vertex3, 2.0)
+    graph.add_edge_undirected(vertex2, vertex4, 5.0)
+    graph.add_edge_undirected(vertex3, vertex4, 8.0)
+    graph.add_edge(vertex4, vertex4, 0.0)
+    assert graph.minimum_spanning_tree() == [
+        (vertex1, vertex3, 1.0),
+        (vertex2, vertex3, 2.0),
+        (vertex2, vertex4, 5.0),
+    ]
+
+    # directed edges are treated as undirected
+    graph.add_edge(vertex5, vertex4, 3.0)
+    tree = graph.minimum_spanning_tree()
+    assert len(tree) == 4
+    assert sum(weight for _, _, weight in tree) == 11.0
+    assert (vertex5, vertex4, 3.0) in tree
+
+
 def test_depth_first_traversal_all(graph):
     """
     Tests traverse_depth_first when called without a vertex, which traversed all vertices, depth-first.
@@ -221,6 +579,96 @@ def test_depth_first_leaf(graph):
     assert vertices == [vertex3]
 
 
+def test_depth_first_traversal_deep(graph):
+    """
+    Verifies traverse_depth_first does not hit the recursion limit on a long path.
+    """
+    vertices = [graph.add_vertex(i) for i in range(5000)]
+    for i in range(1, len(vertices)):
+        graph.add_edge(vertices[i - 1], vertices[i])
+
+    assert list(graph.traverse_depth_first(vertices[0])) == list(reversed(vertices))
+
+
+def test_strongly_connected_components(graph):
+    """
+    Tests strongly_connected_components, which should return components in reverse topological order.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    vertex4 = graph.add_vertex(4)
+    vertex5 = graph.add_vertex(5)
+    vertex6 = graph.add_vertex(6)
+
+    # components {1, 2, 3} -> {4, 5}, 6 is disconnected
+    graph.add_edge(vertex1, vertex2)
+    graph.add_edge(vertex2, vertex3)
+    graph.add_edge(vertex3, vertex1)
+    graph.add_edge(vertex3, vertex4)
+    graph.add_edge(vertex4, vertex5)
+    graph.add_edge(vertex5, vertex4)
+
+    components = [set(component) for component in graph.strongly_connected_components()]
+    assert len(components) == 3
+    assert {vertex1, vertex2, vertex3} in components
+    assert {vertex4, vertex5} in components
+    assert {vertex6} in components
+    assert components.index({vertex4, vertex5}) < components.index({vertex1, vertex2, vertex3})
+
+
+def test_strongly_connected_components_deep(graph):
+    """
+    Verifies strongly_connected_components does not hit the recursion limit on a long cycle.
+    """
+    vertices = [graph.add_vertex(i) for i in range(5000)]
+    for i in range(len(vertices)):
+        graph.add_edge(vertices[i - 1], vertices[i])
+
+    components = graph.strongly_connected_components()
+    assert len(components) == 1
+    assert set(components[0]) == set(vertices)
+
+
+def test_topological_sort(graph):
+    """
+    Tests topological_sort on a graph with no cycles.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    vertex4 = graph.add_vertex(4)
+    vertex5 = graph.add_vertex(5)
+
+    graph.add_edge(vertex4, vertex2)
+    graph.add_edge(vertex1, vertex2)
+    graph.add_edge(vertex2, vertex3)
+    graph.add_edge(vertex1, vertex3)
+    graph.add_edge(vertex5, vertex1)
+
+    order = graph.topological_sort()
+    assert set(order) == {vertex1, vertex2, vertex3, vertex4, vertex5}
+    for source_vertex in order:
+        for dest_vertex, _ in graph.get_edges_from_vertex(source_vertex):
+            assert order.index(source_vertex) < order.index(dest_vertex)
+
+
+def test_topological_sort_cycle(graph):
+    """
+    Verifies topological_sort raises an error if the graph has a cycle, including a self loop.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    graph.add_edge(vertex1, vertex2)
+    graph.add_edge(vertex2, vertex3)
+    assert graph.topological_sort() == [vertex1, vertex2, vertex3]
+
+    graph.add_edge(vertex3, vertex3)
+    with pytest.raises(ValueError):
+        graph.topological_sort()
+
+
 def test_breadth_first_traversal(graph):
     """
     Verifies traverse_breadth_first does breadth-first traversal.
@@ -264,10 +712,52 @@ def test_breadth_first_leaf(graph):
     assert vertices == [vertex3]
 
 
-def test_shortest_path(graph):
+@pytest.mark.parametrize('frozen', [False, True])
+def test_breadth_first_distances(graph, frozen):
+    """
+    Tests breadth first distances from one or more source vertices, which ignore weights.
+    """
+    vertex1, vertex2, vertex3, vertex4, vertex5, vertex6 = graph.add_vertices([1, 2, 3, 4, 5, 6])
+    graph.add_edge(vertex1, vertex2, 5.0)
+    graph.add_edge(vertex1, vertex3, 1.0)
+    graph.add_edge(vertex2, vertex4)
+    graph.add_edge(vertex3, vertex4)
+    graph.add_edge(vertex4, vertex1)
+    graph.add_edge(vertex4, vertex5)
+    graph.add_edge(vertex5, vertex5)
+    if frozen:
+        graph = graph.freeze()
+        vertex1, vertex2, vertex3, vertex4, vertex5, vertex6 = (graph.get_vertex(key) for key in range(1, 7))
+
+    assert graph.breadth_first_distances([vertex1]).tolist() == [0, 1, 1, 2, 3, -1]
+    assert graph.breadth_first_distances([vertex4]).tolist() == [1, 2, 2, 0, 1, -1]
+    assert graph.breadth_first_distances([vertex5]).tolist() == [-1, -1, -1, -1, 0, -1]
+    assert graph.breadth_first_distances([vertex2, vertex6, vertex2]).tolist() == [2, 0, 3, 1, 2, 0]
+    assert graph.breadth_first_distances([]).tolist() == [-1] * 6
+
+    # matches breadth first traversal order
+    distances = graph.breadth_first_distances([vertex3])
+    traversal_distances = [distances[vertex.index] for vertex in graph.traverse_breadth_first(vertex3)]
+    assert traversal_distances == sorted(traversal_distances)
+
+
+def test_breadth_first_distances_deep(graph):
+    """
+    Tests breadth first distances on a long chain, so there are many levels.
     """
-    Tests shorter_path algorithm.
+    vertices = graph.add_vertices(range(1000))
+    graph.add_edges(range(999), range(1, 1000), by_index=True)
+    assert graph.breadth_first_distances([vertices[0]]).tolist() == list(range(1000))
+    frozen = graph.freeze()
+    assert frozen.breadth_first_distances([frozen.get_vertex(500)]).tolist() == [-1] * 500 + list(range(500))
+
+
+@pytest.mark.parametrize('search', ['dijkstra', 'a_star', 'bidirectional'])
+def test_shortest_path(graph, search):
+    """
+    Tests shorter_path algorithm, and the A* and bidirectional variants.
     :param graph: graph implementation (GraphAdjacencyList or GraphAdjacencyList)
+    :param search: shortest path search to test
     """
 
     # setup graph
@@ -310,36 +800,444 @@ def test_shortest_path(graph):
     graph.add_edge(vertex5, vertex4, distance54)
 
     # validate all possible combinations
-    _validate_shortest_path(graph, vertex1, vertex1, None)
-    _validate_shortest_path(graph, vertex1, vertex2, distance12, vertex1, vertex2)
-    _validate_shortest_path(graph, vertex1, vertex3, distance12 + distance23, vertex1, vertex2, vertex3)
-    _validate_shortest_path(graph, vertex1, vertex4, distance12 + distance24, vertex1, vertex2, vertex4)
-    _validate_shortest_path(graph, vertex1, vertex5, distance15, vertex1, vertex5)
-
-    _validate_shortest_path(graph, vertex2, vertex1, None)
-    _validate_shortest_path(graph, vertex2, vertex2, None)
-    _validate_shortest_path(graph, vertex2, vertex3, distance23, vertex2, vertex3)
-    _validate_shortest_path(graph, vertex2, vertex4, distance24, vertex2, vertex4)
-    _validate_shortest_path(graph, vertex2, vertex5, distance24 + distance45, vertex2, vertex4, vertex5)
-
-    _validate_shortest_path(graph, vertex3, vertex1, None)
-    _validate_shortest_path(graph, vertex3, vertex2, distance34 + distance42, vertex3, vertex4, vertex2)
-    _validate_shortest_path(graph, vertex3, vertex3, None)
-    _validate_shortest_path(graph, vertex3, vertex4, distance34, vertex3, vertex4)
-    _validate_shortest_path(graph, vertex3, vertex5, distance34 + distance45, vertex3, vertex4, vertex5)
-
-    _validate_shortest_path(graph, vertex4, vertex1, None)
-    _validate_shortest_path(graph, vertex4, vertex2, distance42, vertex4, vertex2)
-    _validate_shortest_path(graph, vertex4, vertex3, distance42 + distance23, vertex4, vertex2, vertex3)
-    _validate_shortest_path(graph, vertex4, vertex4, None)
-    _validate_shortest_path(graph, vertex4, vertex5, distance45, vertex4, vertex5)
-
-    _validate_shortest_path(graph, vertex5, vertex1, None)
-    _validate_shortest_path(graph, vertex5, vertex2, distance54 + distance42, vertex5, vertex4, vertex2)
-    _validate_shortest_path(graph, vertex5, vertex3, distance54 + distance42 + distance23, vertex5, vertex4, vertex2,
-                            vertex3)
-    _validate_shortest_path(graph, vertex5, vertex4, distance54, vertex5, vertex4)
-    _validate_shortest_path(graph, vertex5, vertex5, None)
+    _validate_shortest_path(graph, search, vertex1, vertex1, None)
+    _validate_shortest_path(graph, search, vertex1, vertex2, distance12, vertex1, vertex2)
+    _validate_shortest_path(graph, search, vertex1, vertex3, distance12 + distance23, vertex1, vertex2, vertex3)
+    _validate_shortest_path(graph, search, vertex1, vertex4, distance12 + distance24, vertex1, vertex2, vertex4)
+    _validate_shortest_path(graph, search, vertex1, vertex5, distance15, vertex1, vertex5)
+
+    _validate_shortest_path(graph, search, vertex2, vertex1, None)
+    _validate_shortest_path(graph, search, vertex2, vertex2, None)
+    _validate_shortest_path(graph, search, vertex2, vertex3, distance23, vertex2, vertex3)
+    _validate_shortest_path(graph, search, vertex2, vertex4, distance24, vertex2, vertex4)
+    _validate_shortest_path(graph, search, vertex2, vertex5, distance24 + distance45, vertex2, vertex4, vertex5)
+
+    _validate_shortest_path(graph, search, vertex3, vertex1, None)
+    _validate_shortest_path(graph, search, vertex3, vertex2, distance34 + distance42, vertex3, vertex4, vertex2)
+    _validate_shortest_path(graph, search, vertex3, vertex3, None)
+    _validate_shortest_path(graph, search, vertex3, vertex4, distance34, vertex3, vertex4)
+    _validate_shortest_path(graph, search, vertex3, vertex5, distance34 + distance45, vertex3, vertex4, vertex5)
+
+    _validate_shortest_path(graph, search, vertex4, vertex1, None)
+    _validate_shortest_path(graph, search, vertex4, vertex2, distance42, vertex4, vertex2)
+    _validate_shortest_path(graph, search, vertex4, vertex3, distance42 + distance23, vertex4, vertex2, vertex3)
+    _validate_shortest_path(graph, search, vertex4, vertex4, None)
+    _validate_shortest_path(graph, search, vertex4, vertex5, distance45, vertex4, vertex5)
+
+    _validate_shortest_path(graph, search, vertex5, vertex1, None)
+    _validate_shortest_path(graph, search, vertex5, vertex2, distance54 + distance42, vertex5, vertex4, vertex2)
+    _validate_shortest_path(graph, search, vertex5, vertex3, distance54 + distance42 + distance23,
+                            vertex5, vertex4, vertex2, vertex3)
+    _validate_shortest_path(graph, search, vertex5, vertex4, distance54, vertex5, vertex4)
+    _validate_shortest_path(graph, search, vertex5, vertex5, None)
+
+
+def test_shortest_paths_from(graph):
+    """
+    Tests shortest_paths_from, which returns the shortest paths from one vertex to all other vertices.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    vertex4 = graph.add_vertex(4)
+
+    graph.add_edge(vertex1, vertex2, 2.0)
+    graph.add_edge(vertex1, vertex3, 4.0)
+    graph.add_edge(vertex2, vertex3, 1.0)
+
+    tree = graph.shortest_paths_from(vertex1)
+    assert tree.start_vertex is vertex1
+    assert tree.shortest_path(vertex1) == []
+    assert tree.shortest_path(vertex2) == [vertex1, vertex2]
+    assert tree.shortest_path(vertex3) == [vertex1, vertex2, vertex3]
+    assert tree.shortest_path(vertex4) == []
+    assert tree.distance(vertex1) == 0
+    assert tree.distance(vertex2) == 2
+    assert tree.distance(vertex3) == 3
+    assert tree.distance(vertex4) == float('inf')
+
+    # cached, and used by shortest_path
+    assert graph.shortest_paths_from(vertex1) is tree
+    assert graph.shortest_path(vertex1, vertex3) == [vertex1, vertex2, vertex3]
+
+
+def test_shortest_paths_from_invalidated(graph):
+    """
+    Verifies that cached shortest paths are repaired when an edge is added, and cleared when a vertex is added or an
+    edge on a shortest path gets longer.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    graph.add_edge(vertex1, vertex2)
+    graph.add_edge(vertex2, vertex3)
+
+    tree = graph.shortest_paths_from(vertex1)
+    assert tree.shortest_path(vertex3) == [vertex1, vertex2, vertex3]
+
+    graph.add_edge(vertex1, vertex3)
+    repaired_tree = graph.shortest_paths_from(vertex1)
+    assert repaired_tree is not tree
+    assert graph.shortest_path(vertex1, vertex3) == [vertex1, vertex3]
+    assert repaired_tree.distance(vertex3) == 1
+    assert tree.distance(vertex3) == 2
+    tree = repaired_tree
+
+    # longer edge that is not on a shortest path
+    graph.add_edge(vertex2, vertex3, 5.0)
+    assert graph.shortest_paths_from(vertex1) is tree
+
+    # longer edge on a shortest path
+    graph.add_edge(vertex1, vertex3, 4.0)
+    assert graph.shortest_paths_from(vertex1) is not tree
+    assert graph.shortest_path(vertex1, vertex3) == [vertex1, vertex3]
+    assert graph.shortest_paths_from(vertex1).distance(vertex3) == 4
+
+    tree = graph.shortest_paths_from(vertex1)
+    vertex4 = graph.add_vertex(4)
+    assert graph.shortest_paths_from(vertex1) is not tree
+    assert graph.shortest_paths_from(vertex1).shortest_path(vertex4) == []
+
+
+@pytest.mark.parametrize('negative_weights', [False, True])
+def test_shortest_paths_from_repaired(graph, negative_weights):
+    """
+    Adds random edges and changes random weights, and verifies that the cached shortest paths are the same as
+    shortest paths found from scratch.
+    """
+    rng = np.random.default_rng(1)
+    vertices = graph.add_vertices(range(40))
+
+    def add_random_edge():
+        source, dest = rng.integers(40, size=2)
+        if not negative_weights:
+            weight = rng.integers(1, 20)
+        elif source < dest:
+            weight = rng.integers(-2, 3)
+        else:
+            # each back edge costs more than the forward edges it can close a cycle with, so there are no negative
+            # weight cycles
+            weight = 2 * (source - dest) + rng.integers(1, 20)
+        graph.add_edge(vertices[source], vertices[dest], float(weight))
+
+    for _ in range(60):
+        add_random_edge()
+
+    start_vertices = vertices[:3]
+    for _ in range(100):
+        for start_vertex in start_vertices:
+            graph.shortest_paths_from(start_vertex)
+        add_random_edge()
+
+        for start_vertex in start_vertices:
+            if start_vertex.index in graph.shortest_path_cache:
+                tree = graph.shortest_path_cache[start_vertex.index]
+                graph.shortest_path_cache.clear()
+                expected = graph.shortest_paths_from(start_vertex)
+                assert tree.distances == expected.distances
+                for vertex in vertices:
+                    path = tree.shortest_path(vertex)
+                    if len(path) > 0:
+                        assert (sum(graph.get_edge_weight(u, v) for u, v in zip(path, path[1:])) ==
+                                tree.distance(vertex))
+
+
+def test_shortest_paths_from_negative_cycle(graph):
+    """
+    Verifies that cached shortest paths are cleared when an added edge makes a negative weight cycle.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    graph.add_edge(vertex1, vertex2, 1.0)
+    graph.add_edge(vertex2, vertex3, -2.0)
+
+    tree = graph.shortest_paths_from(vertex1)
+    assert tree.distance(vertex3) == -1
+
+    graph.add_edge(vertex3, vertex2, 3.0)
+    assert graph.shortest_paths_from(vertex1) is tree
+
+    graph.add_edge(vertex3, vertex2, 1.0)
+    with pytest.raises(ValueError):
+        graph.shortest_paths_from(vertex1)
+
+
+def test_shortest_paths_from_negative_cycle_reached(graph):
+    """
+    Verifies that cached shortest paths are cleared when an added edge reaches a negative weight cycle that could not
+    be reached from the start vertex before.
+    """
+    vertex_s, vertex_a, vertex_b, vertex_c = graph.add_vertices(['s', 'a', 'b', 'c'])
+    graph.add_edge(vertex_s, vertex_a, 1.0)
+    graph.add_edge(vertex_b, vertex_c, 1.0)
+    graph.add_edge(vertex_c, vertex_b, -3.0)
+
+    tree = graph.shortest_paths_from(vertex_s)
+    assert tree.distance(vertex_b) == float('inf')
+
+    graph.add_edge(vertex_a, vertex_b, 1.0)
+    assert vertex_s.index not in graph.shortest_path_cache
+    with pytest.raises(ValueError):
+        graph.shortest_paths_from(vertex_s)
+
+
+def test_shortest_paths_from_not_modified(graph):
+    """
+    Verifies that repairing cached shortest paths doesn't change shortest paths that were already returned, whether
+    the repair succeeds or fails.
+    """
+    vertex_a, vertex_b, vertex_c, vertex_d = graph.add_vertices(['a', 'b', 'c', 'd'])
+    graph.add_edge(vertex_a, vertex_b, 1.0)
+    graph.add_edge(vertex_b, vertex_c, 1.0)
+    graph.add_edge(vertex_c, vertex_d, 1.0)
+
+    tree = graph.shortest_paths_from(vertex_a)
+    graph.add_edge(vertex_a, vertex_c, 1.0)
+    repaired_tree = graph.shortest_paths_from(vertex_a)
+    assert repaired_tree is not tree
+    assert repaired_tree.distances == [0.0, 1.0, 1.0, 2.0]
+    assert tree.distances == [0.0, 1.0, 2.0, 3.0]
+    assert tree.shortest_path(vertex_d) == [vertex_a, vertex_b, vertex_c, vertex_d]
+
+    # makes a negative weight cycle b -> c -> d -> b reachable
+    graph.add_edge(vertex_d, vertex_b, -5.0)
+    assert vertex_a.index not in graph.shortest_path_cache
+    assert repaired_tree.distances == [0.0, 1.0, 1.0, 2.0]
+    assert repaired_tree.shortest_path(vertex_c) == [vertex_a, vertex_c]
+
+
+def test_shortest_path_acyclic(graph):
+    """
+    Tests shortest paths in a graph with no cycles, which allows negative weights.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    vertex4 = graph.add_vertex(4)
+    vertex5 = graph.add_vertex(5)
+
+    graph.add_edge(vertex1, vertex2, 1.0)
+    graph.add_edge(vertex1, vertex3, 4.0)
+    graph.add_edge(vertex2, vertex4, 5.0)
+    graph.add_edge(vertex3, vertex2, -6.0)
+    graph.add_edge(vertex3, vertex4, 1.0)
+
+    assert graph.is_acyclic()
+    assert graph.shortest_path(vertex1, vertex4) == [vertex1, vertex3, vertex2, vertex4]
+    assert graph.shortest_path(vertex3, vertex4) == [vertex3, vertex2, vertex4]
+    assert graph.shortest_path(vertex4, vertex1) == []
+    assert graph.shortest_path(vertex1, vertex5) == []
+
+    tree = graph.shortest_paths_from(vertex1)
+    assert tree.distance(vertex2) == -2
+    assert tree.distance(vertex3) == 4
+    assert tree.distance(vertex4) == 3
+    assert tree.distance(vertex5) == float('inf')
+
+    # vertices before the start vertex in topological order are never settled
+    graph.shortest_paths_from(vertex2)
+    assert graph.last_settled_count == 2
+
+
+def test_shortest_path_acyclic_invalidated(graph):
+    """
+    Verifies that adding an edge which forms a cycle switches back to Dijkstra's algorithm.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    graph.add_edge(vertex1, vertex2, 1.0)
+    graph.add_edge(vertex2, vertex3, 1.0)
+    assert graph.is_acyclic()
+    assert graph.topological_indices == [0, 1, 2]
+
+    graph.add_edge(vertex3, vertex1, 1.0)
+    assert graph.acyclic is None
+    assert not graph.is_acyclic()
+    assert graph.topological_indices is None
+    assert graph.shortest_path(vertex2, vertex1) == [vertex2, vertex3, vertex1]
+
+    # a new vertex may be placed anywhere in topological order
+    graph = type(graph)()
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    assert graph.is_acyclic()
+    vertex3 = graph.add_vertex(3)
+    graph.add_edge(vertex3, vertex1, 2.0)
+    graph.add_edge(vertex1, vertex2, 2.0)
+    assert graph.shortest_path(vertex3, vertex2) == [vertex3, vertex1, vertex2]
+
+
+def test_shortest_path_acyclic_kept(graph):
+    """
+    Verifies that whether the graph is acyclic is only checked again when an added edge goes backwards in topological
+    order, or an edge or vertex is removed.
+    """
+    vertex1, vertex2, vertex3 = graph.add_vertices([1, 2, 3])
+    graph.add_edge(vertex1, vertex2, 1.0)
+    graph.add_edge(vertex2, vertex3, 1.0)
+    assert graph.is_acyclic()
+    graph.add_edges([1], [3], [3.0])
+    vertex4 = graph.add_vertex(4)
+    graph.add_edge(vertex3, vertex4, 1.0)
+    assert graph.acyclic
+    assert graph.topological_positions[vertex4.index] == 3
+    assert graph.shortest_path(vertex1, vertex4) == [vertex1, vertex2, vertex3, vertex4]
+
+    graph.add_edges([4], [2])
+    assert graph.acyclic is None
+    assert not graph.is_acyclic()
+    # adding edges can't remove a cycle
+    graph.add_edge(vertex1, vertex4, 1.0)
+    graph.add_vertex(5)
+    assert graph.acyclic is False
+    assert graph.shortest_path(vertex1, vertex4) == [vertex1, vertex4]
+
+    graph.remove_edge(vertex4, vertex2)
+    assert graph.acyclic is None
+    assert graph.is_acyclic()
+    graph.remove_vertex(vertex2)
+    assert graph.acyclic is None
+
+
+@pytest.mark.parametrize('frozen', [False, True])
+def test_shortest_path_negative_weights(graph, frozen):
+    """
+    Verifies that SPFA is used in a graph with cycles and negative weights, where Dijkstra's algorithm would settle
+    b before finding the shorter path to it through c.
+    """
+    vertex_a, vertex_b, vertex_c, vertex_d = graph.add_vertices(['a', 'b', 'c', 'd'])
+    graph.add_edge(vertex_a, vertex_b, 1.0)
+    graph.add_edge(vertex_a, vertex_c, 3.0)
+    graph.add_edge(vertex_c, vertex_b, -3.0)
+    graph.add_edge(vertex_b, vertex_d, 1.0)
+    graph.add_edge(vertex_d, vertex_a, 1.0)
+    if frozen:
+        graph = graph.freeze()
+        vertex_a, vertex_b, vertex_c, vertex_d = (graph.get_vertex(key) for key in ['a', 'b', 'c', 'd'])
+    assert not graph.is_acyclic()
+    assert graph.has_negative_weights()
+
+    assert graph.shortest_path(vertex_a, vertex_d) == [vertex_a, vertex_c, vertex_b, vertex_d]
+    tree = graph.shortest_paths_from(vertex_c)
+    assert [tree.distance(vertex) for vertex in [vertex_a, vertex_b, vertex_c, vertex_d]] == [-1.0, -3.0, 0.0, -2.0]
+    assert tree.shortest_path(vertex_a) == [vertex_c, vertex_b, vertex_d, vertex_a]
+
+
+def test_shortest_path_negative_cycle(graph):
+    """
+    Verifies that a negative weight cycle is detected if it can be reached from the start vertex.
+    """
+    vertex_a, vertex_b, vertex_c, vertex_d, vertex_e = graph.add_vertices(['a', 'b', 'c', 'd', 'e'])
+    graph.add_edge(vertex_a, vertex_b, 1.0)
+    graph.add_edge(vertex_b, vertex_c, 1.0)
+    graph.add_edge(vertex_c, vertex_b, -2.0)
+    graph.add_edge(vertex_d, vertex_a, 1.0)
+    graph.add_edge(vertex_b, vertex_e, 1.0)
+    with pytest.raises(ValueError):
+        graph.shortest_path(vertex_a, vertex_c)
+    with pytest.raises(ValueError):
+        graph.shortest_paths_from(vertex_d)
+    assert graph.shortest_path(vertex_e, vertex_a) == []
+
+    graph.add_edge(vertex_c, vertex_b, -1.0)
+    assert graph.shortest_path(vertex_a, vertex_c) == [vertex_a, vertex_b, vertex_c]
+
+
+def test_has_negative_weights(graph):
+    """
+    Verifies that negative weights are tracked as edges are added, replaced and removed.
+    """
+    vertex1, vertex2, vertex3 = graph.add_vertices([1, 2, 3])
+    graph.add_edge(vertex1, vertex2, 0.0)
+    assert not graph.has_negative_weights()
+    graph.add_edge(vertex2, vertex3, -1.0)
+    assert graph.has_negative_weights()
+    graph.add_edge(vertex1, vertex3, 2.0)
+    assert graph.has_negative_weights()
+
+    graph.add_edge(vertex2, vertex3, 1.0)
+    assert not graph.has_negative_weights()
+    graph.add_edges([3, 3], [1, 2], [1.0, -1.0])
+    assert graph.has_negative_weights()
+    graph.remove_edge(vertex3, vertex1)
+    assert graph.has_negative_weights()
+    graph.remove_vertex(vertex2)
+    assert not graph.has_negative_weights()
+
+
+def test_shortest_paths_from_lru(graph):
+    """
+    Verifies that only the most recently used shortest paths are cached.
+    """
+    graph.shortest_path_cache.capacity = 2
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+
+    tree1 = graph.shortest_paths_from(vertex1)
+    tree2 = graph.shortest_paths_from(vertex2)
+    assert graph.shortest_paths_from(vertex1) is tree1
+    graph.shortest_paths_from(vertex3)
+
+    # vertex2 was least recently used
+    assert graph.shortest_paths_from(vertex1) is tree1
+    assert graph.shortest_paths_from(vertex2) is not tree2
+
+
+def test_get_edges_to_vertex(graph):
+    """
+    Verifies that get_edges_to_vertex returns edges in the reverse direction.
+    """
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+
+    graph.add_edge(vertex2, vertex3, 2)
+    graph.add_edge(vertex1, vertex3, 3)
+    graph.add_edge(vertex1, vertex2, 4)
+
+    assert list(graph.get_edges_to_vertex(vertex1)) == []
+    assert list(graph.get_edges_to_vertex(vertex2)) == [(vertex1, 4)]
+    if graph.edges_ordered():
+        assert list(graph.get_edges_to_vertex(vertex3)) == [(vertex2, 2), (vertex1, 3)]
+    else:
+        assert list(graph.get_edges_to_vertex(vertex3)) == [(vertex1, 3), (vertex2, 2)]
+
+
+def test_shortest_path_a_star_grid(graph):
+    """
+    Verifies that A* with a distance heuristic finds the shortest path on a grid, visiting fewer vertices than
+    Dijkstra's algorithm. Bidirectional search should also find a shortest path while visiting fewer vertices.
+    """
+    size = 10
+    for x in range(size):
+        for y in range(size):
+            vertex = graph.add_vertex((x, y), (x, y))
+            if x > 0:
+                graph.add_edge_undirected(graph.get_vertex((x - 1, y)), vertex, 1.0)
+            if y > 0:
+                graph.add_edge_undirected(graph.get_vertex((x, y - 1)), vertex, 1.5)
+
+    def manhattan_distance(vertex, end_vertex):
+        return abs(vertex.value[0] - end_vertex.value[0]) + abs(vertex.value[1] - end_vertex.value[1])
+
+    start_vertex = graph.get_vertex((2, 3))
+    end_vertex = graph.get_vertex((7, 6))
+    expected_distance = _get_path_distance(graph, graph.shortest_path(start_vertex, end_vertex))
+    dijkstra_settled_count = graph.last_settled_count
+    assert expected_distance == 5 * 1.0 + 3 * 1.5
+
+    path = graph.shortest_path_a_star(start_vertex, end_vertex, manhattan_distance)
+    assert path[0] is start_vertex and path[-1] is end_vertex
+    assert _get_path_distance(graph, path) == expected_distance
+    assert graph.last_settled_count < dijkstra_settled_count
+
+    path = graph.shortest_path_bidirectional(start_vertex, end_vertex)
+    assert path[0] is start_vertex and path[-1] is end_vertex
+    assert _get_path_distance(graph, path) == expected_distance
+    assert graph.last_settled_count < dijkstra_settled_count
 
 
 def test_edge_order(graph):
@@ -425,8 +1323,14 @@ def test_repr(graph):
         assert repr(graph) == "{'v1': {'v2': 1.0, 'v3': 2.0}, 'v2': {'v3': 3.0}, 'v3': {'v1': 2.0}, 'v4': {}}"
 
 
-def _validate_shortest_path(graph, start, end, expected_distance, *expected_path):
-    path = graph.shortest_path(start, end)
+def _validate_shortest_path(graph, search, start, end, expected_distance, *expected_path):
+    if search == 'a_star':
+        # no heuristic, so should work just like Dijkstra
+        path = graph.shortest_path_a_star(start, end, lambda vertex, end_vertex: 0)
+    elif search == 'bidirectional':
+        path = graph.shortest_path_bidirectional(start, end)
+    else:
+        path = graph.shortest_path(start, end)
     assert path == list(expected_path)
 
     if expected_distance is not None:
@@ -438,3 +1342,85 @@ def _validate_shortest_path(graph, start, end, expected_distance, *expected_path
             distance += weight
             vertex = path[i]
         assert distance == expected_distance
+
+
+def _get_path_distance(graph, path):
+    distance = 0
+    for i in range(1, len(path)):
+        distance += graph.get_edge_weight(path[i - 1], path[i])
+    return distance
+
+
+def test_can_reach(graph):
+    """
+    Tests that the reachability index is rebuilt when the graph is modified.
+    """
+    vertex1, vertex2, vertex3 = graph.add_vertices([1, 2, 3])
+    graph.add_edge(vertex1, vertex2)
+    assert graph.can_reach(vertex1, vertex2)
+    assert graph.can_reach(vertex3, vertex3)
+    assert not graph.can_reach(vertex2, vertex1)
+    assert not graph.can_reach(vertex1, vertex3)
+
+    graph.add_edge(vertex2, vertex3)
+    assert graph.can_reach(vertex1, vertex3)
+    graph.add_edge(vertex3, vertex1)
+    assert graph.can_reach(vertex2, vertex1)
+    vertex4 = graph.add_vertex(4)
+    assert not graph.can_reach(vertex4, vertex1)
+    frozen = graph.freeze()
+    assert frozen.can_reach(frozen.get_vertex(3), frozen.get_vertex(2))
+
+    graph.remove_edge(vertex2, vertex3)
+    assert not graph.can_reach(vertex1, vertex3)
+    graph.remove_vertex(vertex2)
+    assert graph.can_reach(vertex3, vertex1)
+    assert not graph.can_reach(vertex1, vertex3)
+
+
+def test_interleaved_traversals(graph):
+    """
+    Tests that traversals in progress at the same time don't share visited sets, and that the sets are reused.
+    """
+    vertices = graph.add_vertices(range(5))
+    graph.add_edges(range(4), range(1, 5), by_index=True)
+    traversal1 = graph.traverse_breadth_first(vertices[0])
+    traversal2 = graph.traverse_breadth_first(vertices[2])
+    assert next(traversal1) is vertices[0]
+    assert next(traversal2) is vertices[2]
+    assert list(graph.traverse_depth_first(vertices[3])) == [vertices[4], vertices[3]]
+    assert list(traversal1) == vertices[1:]
+    assert list(traversal2) == vertices[3:]
+    assert graph.shortest_path(vertices[0], vertices[4]) == vertices
+    assert len(graph.visited_pool) == 3
+
+    for _ in range(300):
+        assert len(list(graph.traverse_depth_first())) == 5
+    assert len(graph.visited_pool) == 3
+
+
+def test_point_queries_reuse_labels(graph):
+    """
+    Tests that back to back point to point searches reuse search labels, and that labels from earlier searches (and
+    earlier epochs) are never read as distances.
+    """
+    rng = np.random.default_rng(3)
+    vertices = graph.add_vertices(range(30))
+    graph.add_edges(rng.integers(30, size=60), rng.integers(30, size=60), rng.integers(1, 10, size=60).astype(float),
+                    by_index=True)
+    trees = [graph._dijkstra(vertex) for vertex in vertices]
+    assert not graph.is_acyclic()
+
+    for i in range(300):
+        start_vertex = vertices[i % 30]
+        end_vertex = vertices[i * 7 % 30]
+        tree = trees[start_vertex.index]
+        for path in [graph.shortest_path(start_vertex, end_vertex),
+                     graph.shortest_path_bidirectional(start_vertex, end_vertex),
+                     graph.shortest_path_a_star(start_vertex, end_vertex, lambda vertex1, vertex2: 0.0)]:
+            if start_vertex is end_vertex or tree.distance(end_vertex) == float('inf'):
+                assert path == []
+            else:
+                assert path[0] is start_vertex and path[-1] is end_vertex
+                assert sum(graph.get_edge_weight(u, v) for u, v in zip(path, path[1:])) == tree.distance(end_vertex)
+    assert len(graph.labels_pool) == 2
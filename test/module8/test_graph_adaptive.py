@@ -0,0 +1,110 @@
+from module8.graph_adaptive import GraphAdaptive
+
+
+def test_switch_to_dense():
+    """
+    Verifies that the graph switches to a matrix when the density reaches the dense threshold, keeping all edges.
+    """
+    graph = GraphAdaptive()
+    vertices = graph.add_vertices(range(10))
+    assert not graph.is_dense()
+    assert graph.density() == 0
+
+    # 24 edges out of 100 possible
+    for i in range(24):
+        graph.add_edge(vertices[i % 10], vertices[(i % 10 + i // 10 + 1) % 10], i)
+    assert graph.edge_count == 24
+    assert not graph.is_dense()
+    edges = {(source.key, dest_vertex.key, weight)
+             for source in vertices for dest_vertex, weight in graph.get_edges_from_vertex(source)}
+
+    graph.add_edge(vertices[0], vertices[0], 1.5)
+    assert graph.density() == 0.25
+    assert graph.is_dense()
+    assert graph.layout_switch_count == 1
+    edges.add((0, 0, 1.5))
+    assert edges == {(source.key, dest_vertex.key, weight)
+                     for source in vertices for dest_vertex, weight in graph.get_edges_from_vertex(source)}
+    assert graph.get_edge_weight(vertices[0], vertices[0]) == 1.5
+
+    # replacing an edge doesn't change the count
+    graph.add_edge(vertices[0], vertices[0], 2.0)
+    assert graph.edge_count == 25
+
+
+def test_hysteresis():
+    """
+    Verifies that the graph only switches back to an adjacency list below the sparse threshold.
+    """
+    graph = GraphAdaptive()
+    vertices = graph.add_vertices(range(10))
+    graph.add_edges([i // 10 for i in range(30)], [i % 10 for i in range(30)], by_index=True)
+    assert graph.edge_count == 30
+    assert graph.is_dense()
+
+    # density 0.1 is between the thresholds, so stays dense
+    for i in range(20):
+        graph.remove_edge(vertices[i // 10], vertices[i % 10])
+    assert graph.density() == 0.1
+    assert graph.is_dense()
+
+    graph.remove_edge(vertices[2], vertices[0])
+    assert not graph.is_dense()
+    assert graph.layout_switch_count == 2
+    assert [dest_vertex for dest_vertex, _ in graph.get_edges_from_vertex(vertices[2])] == vertices[1:]
+    assert graph.shortest_path(vertices[2], vertices[9]) == [vertices[2], vertices[9]]
+
+    # batches are counted correctly
+    graph.add_edges([2] * 9, [1] * 9, by_index=True)  # existing edge, repeated
+    assert graph.edge_count == 9
+
+
+def test_add_vertices_lowers_density():
+    """
+    Verifies that adding vertices can switch a dense graph back to an adjacency list.
+    """
+    graph = GraphAdaptive()
+    vertex1, vertex2 = graph.add_vertices([1, 2])
+    graph.add_edge_undirected(vertex1, vertex2)
+    assert graph.is_dense()
+
+    graph.add_vertices(range(3, 8))
+    assert graph.density() == 2 / 49
+    assert not graph.is_dense()
+    assert graph.connected(vertex1, vertex2)
+    assert graph.shortest_path(vertex2, vertex1) == [vertex2, vertex1]
+
+
+def test_remove_vertex():
+    """
+    Verifies that removed vertices are excluded from the density, and that tombstones survive switching storage.
+    """
+    graph = GraphAdaptive()
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(10))
+    graph.add_edges(range(9), range(1, 10), by_index=True)
+    graph.add_edge(vertices[0], vertices[0])
+    assert graph.edge_count == 10
+    assert not graph.is_dense()
+
+    graph.remove_vertex(vertices[0])
+    assert graph.edge_count == 8
+    for vertex in vertices[1:5]:
+        graph.remove_vertex(vertex)
+    # 4 edges between 5 vertices
+    assert graph.edge_count == 4
+    assert graph.density() == 4 / 25
+    assert not graph.is_dense()
+
+    graph.add_edge(vertices[9], vertices[5])
+    graph.add_edge(vertices[9], vertices[6])
+    graph.add_edge(vertices[9], vertices[7])
+    assert graph.is_dense()
+    assert graph.storage.vertices_by_index[:5] == [None] * 5
+    assert graph.shortest_path(vertices[9], vertices[8]) == [vertices[9], vertices[7], vertices[8]]
+
+    graph.compact()
+    assert [vertex.index for vertex in vertices[5:]] == list(range(5))
+    assert len(graph.storage.vertices_by_index) == 5
+    assert graph.shortest_path(vertices[9], vertices[8]) == [vertices[9], vertices[7], vertices[8]]
+    assert graph.get_edge_weight(vertices[5], vertices[6]) == 1
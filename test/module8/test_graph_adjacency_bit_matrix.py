@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from module8.graph_adjacency_bit_matrix import GraphAdjacencyBitMatrix
+from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_generator import random_graph
+
+
+def test_add_edge():
+    """
+    Tests that edges are stored as bits, with weight 1.
+    """
+    graph = GraphAdjacencyBitMatrix()
+    vertex1, vertex2, vertex3 = graph.add_vertices([1, 2, 3])
+    graph.add_edge(vertex1, vertex3)
+    graph.add_edge(vertex1, vertex2)
+    graph.add_edge_undirected(vertex2, vertex3)
+    graph.add_edges([3], [3])
+
+    assert graph.rows == [0b110, 0b100, 0b110]
+    assert graph.get_edge_weight(vertex1, vertex2) == 1
+    assert graph.get_edge_weight(vertex2, vertex1) is None
+    assert list(graph.get_edges_from_vertex(vertex1)) == [(vertex2, 1), (vertex3, 1)]
+    assert list(graph.get_edges_to_vertex(vertex3)) == [(vertex1, 1), (vertex2, 1), (vertex3, 1)]
+    assert repr(graph) == '{1: {2: 1.0, 3: 1.0}, 2: {3: 1.0}, 3: {2: 1.0, 3: 1.0}}'
+    assert graph.shortest_path(vertex1, vertex3) == [vertex1, vertex3]
+    assert graph.shortest_path_bidirectional(vertex3, vertex2) == [vertex3, vertex2]
+    assert graph.connected(vertex2, vertex3)
+
+
+def test_weight_must_be_one():
+    graph = GraphAdjacencyBitMatrix()
+    vertex1, vertex2 = graph.add_vertices([1, 2])
+    with pytest.raises(ValueError):
+        graph.add_edge(vertex1, vertex2, 2.0)
+    with pytest.raises(ValueError):
+        graph.add_edges([1, 2], [2, 1], [1.0, 0.5], undirected=True)
+    assert graph.rows == [0, 0]
+    assert not graph.connected(vertex1, vertex2)
+
+
+def test_breadth_first_distances():
+    """
+    Verifies that the bitwise breadth first search matches an adjacency list, from one or more sources.
+    """
+    graph = random_graph(GraphAdjacencyBitMatrix(), 300, 0.01, seed=6)
+    expected_graph = random_graph(GraphAdjacencyList(), 300, 0.01, seed=6)
+    for sources in [[0], [5, 17, 299], []]:
+        distances = graph.breadth_first_distances([graph.vertices_by_index[i] for i in sources])
+        expected = expected_graph.breadth_first_distances([expected_graph.vertices_by_index[i] for i in sources])
+        assert np.array_equal(distances, expected)
+    assert max(graph.breadth_first_distances(graph.vertices_by_index[:1])) > 3
+
+
+def test_remove_and_compact():
+    """
+    Tests that removing vertices clears their bits, and compacting renumbers the bits.
+    """
+    graph = GraphAdjacencyBitMatrix()
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(10))
+    graph.add_edges(range(10), [(i + 1) % 10 for i in range(10)], by_index=True)
+    graph.add_edge(vertices[9], vertices[5])
+
+    graph.remove_edge(vertices[0], vertices[1])
+    assert graph.get_edge_weight(vertices[0], vertices[1]) is None
+    for vertex in vertices[1:5]:
+        graph.remove_vertex(vertex)
+    assert graph.rows[0] == 0
+    assert graph.rows[1:5] == [0] * 4
+
+    graph.compact()
+    assert [vertex.index for vertex in graph.vertices_by_index] == list(range(6))
+    assert graph.rows == [0, 0b100, 0b1000, 0b10000, 0b100000, 0b11]
+    assert graph.shortest_path(vertices[6], vertices[0]) == [vertices[6], vertices[7], vertices[8], vertices[9],
+                                                             vertices[0]]
+
+
+def test_memory():
+    """
+    Verifies that rows use 1 bit per cell.
+    """
+    graph = random_graph(GraphAdjacencyBitMatrix(), 1024, 0.5, seed=1)
+    assert sum(row.bit_length() for row in graph.rows) <= 1024 * 1024
+    assert sum((row.bit_length() + 7) // 8 for row in graph.rows) > 1024 * 1024 // 8 - 1024
@@ -0,0 +1,182 @@
+from random import seed, random, randint
+
+import pytest
+
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+
+
+def test_all_pairs_shortest_paths():
+    """
+    Verifies that all pairs shortest paths match shortest_path() on a random graph.
+    """
+    seed(506)
+    graph = GraphAdjacencyMatrix()
+    vertices = [graph.add_vertex(i) for i in range(40)]
+    for source_vertex in vertices:
+        for dest_vertex in vertices:
+            if source_vertex is not dest_vertex and random() < .1:
+                graph.add_edge(source_vertex, dest_vertex, randint(1, 10))
+
+    all_pairs = graph.all_pairs_shortest_paths()
+    for start_vertex in vertices:
+        for end_vertex in vertices:
+            path = all_pairs.shortest_path(start_vertex, end_vertex)
+            expected_path = graph.shortest_path(start_vertex, end_vertex)
+            assert _get_distance(graph, path) == _get_distance(graph, expected_path)
+            if len(path) > 0:
+                assert path[0] is start_vertex
+                assert path[-1] is end_vertex
+                assert all_pairs.distance(start_vertex, end_vertex) == _get_distance(graph, path)
+            elif start_vertex is not end_vertex:
+                assert all_pairs.distance(start_vertex, end_vertex) == float('inf')
+
+
+def test_all_pairs_shortest_paths_cached():
+    """
+    Verifies that all pairs shortest paths are cached until the graph is modified.
+    """
+    graph = GraphAdjacencyMatrix()
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    graph.add_edge(vertex1, vertex2, 2)
+    graph.add_edge(vertex2, vertex3, 2)
+    graph.add_edge(vertex1, vertex3, 5)
+
+    all_pairs = graph.all_pairs_shortest_paths()
+    assert graph.all_pairs_shortest_paths() is all_pairs
+    assert all_pairs.shortest_path(vertex1, vertex3) == [vertex1, vertex2, vertex3]
+    assert all_pairs.shortest_path(vertex3, vertex1) == []
+    assert all_pairs.shortest_path(vertex1, vertex1) == []
+
+    graph.add_edge(vertex1, vertex3, 3)
+    all_pairs = graph.all_pairs_shortest_paths()
+    assert all_pairs.shortest_path(vertex1, vertex3) == [vertex1, vertex3]
+
+    vertex4 = graph.add_vertex(4)
+    assert graph.all_pairs_shortest_paths() is not all_pairs
+    assert graph.all_pairs_shortest_paths().shortest_path(vertex1, vertex4) == []
+
+
+def test_all_pairs_shortest_paths_negative_weights():
+    """
+    Verifies that negative weights are supported, but negative weight cycles raise an error.
+    """
+    graph = GraphAdjacencyMatrix()
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    vertex3 = graph.add_vertex(3)
+    graph.add_edge(vertex1, vertex2, 4)
+    graph.add_edge(vertex1, vertex3, 2)
+    graph.add_edge(vertex2, vertex3, -3)
+
+    all_pairs = graph.all_pairs_shortest_paths()
+    assert all_pairs.shortest_path(vertex1, vertex3) == [vertex1, vertex2, vertex3]
+    assert all_pairs.distance(vertex1, vertex3) == 1
+
+    graph.add_edge(vertex3, vertex1, -2)  # 1 -> 2 -> 3 -> 1 has length -1
+    with pytest.raises(ValueError):
+        graph.all_pairs_shortest_paths()
+
+
+def test_shortest_paths_from_repaired_precision():
+    """
+    Verifies that cached shortest paths are repaired with weights rounded to the precision of the matrix, so they match
+    shortest paths found again.
+    """
+    graph = GraphAdjacencyMatrix()
+    vertex1 = graph.add_vertex(1)
+    vertex2 = graph.add_vertex(2)
+    graph.shortest_paths_from(vertex1)
+    graph.add_edge(vertex1, vertex2, 1.1)
+
+    distance = graph.shortest_paths_from(vertex1).distance(vertex2)
+    graph.shortest_path_cache.clear()
+    assert distance == graph.shortest_paths_from(vertex1).distance(vertex2) == graph.get_edge_weight(vertex1, vertex2)
+    assert distance != 1.1
+
+
+def test_compact_shrinks_matrix():
+    """
+    Verifies that compacting the graph after removing vertices shrinks the matrix and keeps the remaining edges.
+    """
+    graph = GraphAdjacencyMatrix()
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(40))
+    for i in range(39):
+        graph.add_edge(vertices[i], vertices[i + 1], i)
+    assert len(graph.adjacency_matrix) == 64
+
+    for vertex in vertices[10:]:
+        graph.remove_vertex(vertex)
+    assert len(graph.adjacency_matrix) == 64
+    graph.compact()
+    assert len(graph.adjacency_matrix) == 16
+    assert [vertex.index for vertex in vertices[:10]] == list(range(10))
+    assert graph.shortest_path(vertices[0], vertices[9]) == vertices[:10]
+    assert graph.get_edge_weight(vertices[8], vertices[9]) == 8
+
+
+def test_row_index():
+    """
+    Verifies that the index of edges in each row stays sorted as edges are added and removed, and that rows which
+    become too dense are scanned instead.
+    """
+    graph = GraphAdjacencyMatrix()
+    vertices = graph.add_vertices(range(64))  # capacity 64, so rows with more than 4 edges are not indexed
+    graph.add_edge(vertices[0], vertices[9], 2.0)
+    graph.add_edge(vertices[0], vertices[3])
+    graph.add_edge(vertices[0], vertices[3], 5.0)
+    graph.add_edges([0, 0, 1], [7, 7, 2], by_index=True)
+    assert list(graph.row_columns[0]) == [3, 7, 9]
+    assert list(graph.get_edges_from_vertex(vertices[0])) == [(vertices[3], 5.0), (vertices[7], 1.0),
+                                                              (vertices[9], 2.0)]
+
+    graph.remove_edge(vertices[0], vertices[7])
+    assert list(graph.row_columns[0]) == [3, 9]
+    graph.remove_vertex(vertices[3])
+    assert list(graph.row_columns[0]) == [9]
+    assert list(graph.row_columns[1]) == [2]
+
+    graph.add_edges([0] * 4, range(10, 14), by_index=True)
+    assert graph.row_columns[0] is None
+    assert [vertex.key for vertex, _ in graph.get_edges_from_vertex(vertices[0])] == [9, 10, 11, 12, 13]
+
+    # compacting indexes the row again once it is sparse enough
+    for vertex in vertices[11:14]:
+        graph.remove_edge(vertices[0], vertex)
+    assert graph.row_columns[0] is None
+    for vertex in vertices[20:]:
+        graph.remove_vertex(vertex)
+    assert len(graph.adjacency_matrix) == 32
+    assert list(graph.row_columns[0]) == [8, 9]
+    assert list(graph.row_columns[1]) == [2]
+    assert [vertex.key for vertex, _ in graph.get_edges_from_vertex(vertices[0])] == [9, 10]
+
+
+def _get_distance(graph, path):
+    distance = 0
+    for i in range(1, len(path)):
+        distance += graph.get_edge_weight(path[i - 1], path[i])
+    return distance
+
+
+def test_row_index_resize():
+    """
+    Verifies that rows which were too dense to index in a small matrix are indexed again when the matrix grows.
+    """
+    graph = GraphAdjacencyMatrix()
+    vertices = graph.add_vertices(range(8))  # capacity 8, so rows with more than 0.5 edges are not indexed
+    for vertex in vertices[1:]:
+        graph.add_edge(vertices[0], vertex)
+    graph.add_edges([1, 1], [2, 3], by_index=True)
+    assert graph.row_columns[0] is None
+    assert graph.row_columns[1] is None
+
+    graph.add_vertex(8)
+    assert graph.row_columns[0] is None
+    graph.add_vertices(range(9, 4000))
+    assert list(graph.row_columns[0]) == list(range(1, 8))
+    assert list(graph.row_columns[1]) == [2, 3]
+    graph.add_edge(vertices[0], graph.get_vertex(3999))
+    assert graph.row_columns[0][-1] == 3999
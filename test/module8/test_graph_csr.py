@@ -0,0 +1,236 @@
+from typing import Iterable
+
+import pytest
+
+from module8.graph import Graph
+from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+from module8.graph_csr import GraphCSR
+
+
+# All tests are run for frozen copies of both graph implementations.
+@pytest.fixture(params=[GraphAdjacencyList, GraphAdjacencyMatrix])
+def graph(request) -> Graph:
+    # Instantiate the graph implementation and add the vertices and edges
+    #             |v2|<-------5--------|v4|
+    #             |  |                 |  |
+    # |v1|---2--->|  |--------1------->|  |<---3---|v5|----+
+    # |  |        |  |                 |  |        |  |    |
+    # |  |        |  |---1-->|v3|--1-->|  |----1-->|  |<-1-+
+    # |  |                   |  |                  |  |
+    # |  |---------4-------->|  |---------4------->|  |
+    # |  |                                         |  |
+    # |  |---------------------1------------------>|  |
+    graph = request.param()
+    v1 = graph.add_vertex('v1')
+    v2 = graph.add_vertex('v2')
+    v3 = graph.add_vertex('v3')
+    v4 = graph.add_vertex('v4')
+    v5 = graph.add_vertex('v5')
+    graph.add_vertex('v6')  # disconnected
+
+    graph.add_edge(v1, v3, 4.0)
+    graph.add_edge(v1, v2, 2.0)
+    graph.add_edge(v1, v5)
+    graph.add_edge(v2, v3)
+    graph.add_edge(v2, v4)
+    graph.add_edge(v3, v4)
+    graph.add_edge(v3, v5, 4.0)
+    graph.add_edge(v4, v5)
+    graph.add_edge(v4, v2, 5.0)
+    graph.add_edge(v5, v4, 3.0)
+    return graph
+
+
+def test_freeze(graph):
+    """
+    Verifies that a frozen graph has the same vertices and edges as the original graph, with its own vertices.
+    """
+    frozen = graph.freeze()
+    assert isinstance(frozen, GraphCSR)
+    assert _get_vertex_tuples(frozen.vertices_by_index) == _get_vertex_tuples(graph.vertices_by_index)
+    assert all(frozen.get_vertex(key) is not vertex for key, vertex in graph.vertices.items())
+    assert frozen.edges_ordered() == graph.edges_ordered()
+    assert repr(frozen) == repr(graph)
+    assert frozen.freeze() is frozen
+
+    for source_vertex in graph.vertices.values():
+        frozen_source_vertex = frozen.get_vertex(source_vertex.key)
+        assert (_get_edge_keys(frozen.get_edges_from_vertex(frozen_source_vertex)) ==
+                _get_edge_keys(graph.get_edges_from_vertex(source_vertex)))
+        for dest_vertex in graph.vertices.values():
+            assert (frozen.get_edge_weight(frozen_source_vertex, frozen.get_vertex(dest_vertex.key)) ==
+                    graph.get_edge_weight(source_vertex, dest_vertex))
+
+
+def test_freeze_removed_vertices(graph):
+    """
+    Verifies that freezing leaves out removed vertices without compacting the original graph, and that compacting
+    the original graph later doesn't change the frozen copy.
+    """
+    graph.compact_threshold = 1.0  # only compact manually
+    graph.remove_vertex(graph.get_vertex('v1'))
+    graph.remove_vertex(graph.get_vertex('v2'))
+    frozen = graph.freeze()
+    assert graph.tombstone_count == 2
+    assert [vertex.key for vertex in frozen.vertices_by_index] == ['v3', 'v4', 'v5', 'v6']
+    assert [vertex.index for vertex in frozen.vertices_by_index] == [0, 1, 2, 3]
+    assert repr(frozen) == repr(graph)
+    assert frozen.connected_component_count() == graph.connected_component_count()
+
+    graph.compact()
+    path = frozen.shortest_path(frozen.get_vertex('v3'), frozen.get_vertex('v5'))
+    assert [vertex.key for vertex in path] == ['v3', 'v4', 'v5']
+
+
+def test_get_edges_to_vertex(graph):
+    """
+    Verifies that a frozen graph has the same reverse edges as the original graph (ordered by source vertex).
+    """
+    frozen = graph.freeze()
+    for dest_vertex in graph.vertices.values():
+        edges = sorted(graph.get_edges_to_vertex(dest_vertex), key=lambda edge: edge[0].index)
+        assert _get_edge_keys(frozen.get_edges_to_vertex(frozen.get_vertex(dest_vertex.key))) == _get_edge_keys(edges)
+
+
+def test_traversal(graph):
+    """
+    Verifies that traversals of a frozen graph match the original graph.
+    """
+    frozen = graph.freeze()
+    assert _get_keys(frozen.traverse_depth_first()) == _get_keys(graph.traverse_depth_first())
+    for vertex in graph.vertices.values():
+        frozen_vertex = frozen.get_vertex(vertex.key)
+        assert _get_keys(frozen.traverse_depth_first(frozen_vertex)) == _get_keys(graph.traverse_depth_first(vertex))
+        assert (_get_keys(frozen.traverse_breadth_first(frozen_vertex)) ==
+                _get_keys(graph.traverse_breadth_first(vertex)))
+
+
+def test_shortest_path(graph):
+    """
+    Verifies that shortest paths in a frozen graph match the original graph.
+    """
+    frozen = graph.freeze()
+    for start_vertex in graph.vertices.values():
+        for end_vertex in graph.vertices.values():
+            frozen_start_vertex = frozen.get_vertex(start_vertex.key)
+            frozen_end_vertex = frozen.get_vertex(end_vertex.key)
+            assert (_get_keys(frozen.shortest_path(frozen_start_vertex, frozen_end_vertex)) ==
+                    _get_keys(graph.shortest_path(start_vertex, end_vertex)))
+            assert (_get_keys(frozen.shortest_path_bidirectional(frozen_start_vertex, frozen_end_vertex)) ==
+                    _get_keys(graph.shortest_path_bidirectional(start_vertex, end_vertex)))
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load(graph, tmp_path, mmap):
+    """
+    Verifies that a saved graph can be loaded, with or without memory mapping.
+    """
+    graph.get_vertex('v1').value = 'a'
+    graph.get_vertex('v2').value = (1, 2)
+    path = tmp_path / 'graph.bin'
+    graph.save(str(path))
+
+    loaded = GraphCSR.load(str(path), mmap)
+    assert repr(loaded) == repr(graph)
+    assert loaded.edges_ordered() == graph.edges_ordered()
+    assert _get_vertex_tuples(loaded.vertices_by_index) == _get_vertex_tuples(graph.vertices_by_index)
+
+    for start_vertex in graph.vertices.values():
+        for end_vertex in graph.vertices.values():
+            path = loaded.shortest_path(loaded.get_vertex(start_vertex.key), loaded.get_vertex(end_vertex.key))
+            assert [vertex.key for vertex in path] == [vertex.key for vertex in
+                                                       graph.shortest_path(start_vertex, end_vertex)]
+
+
+def test_save_load_connected(graph, tmp_path):
+    """
+    Verifies that undirected connectivity is rebuilt for a loaded graph.
+    """
+    graph.add_edge_undirected(graph.get_vertex('v1'), graph.get_vertex('v6'))
+    path = str(tmp_path / 'graph.bin')
+    graph.save(path)
+
+    loaded = GraphCSR.load(path)
+    assert loaded.connected(loaded.get_vertex('v1'), loaded.get_vertex('v6'))
+    assert not loaded.connected(loaded.get_vertex('v1'), loaded.get_vertex('v2'))
+    # v2, v4 and v5 have edges in both directions, like undirected edges
+    assert loaded.connected(loaded.get_vertex('v2'), loaded.get_vertex('v5'))
+    assert loaded.connected_component_count() == 3
+
+
+def test_save_load_tuple_keys(tmp_path):
+    """
+    Verifies that tuple keys are restored as tuples, and that a loaded graph can be saved again.
+    """
+    graph = GraphAdjacencyList()
+    vertex1 = graph.add_vertex((0, 0))
+    vertex2 = graph.add_vertex((0, 1))
+    graph.add_edge(vertex1, vertex2, 1.5)
+    path = str(tmp_path / 'graph.bin')
+    graph.save(path)
+
+    loaded = GraphCSR.load(path)
+    loaded.save(path + '.copy')
+    loaded = GraphCSR.load(path + '.copy')
+    assert repr(loaded) == '{(0, 0): {(0, 1): 1.5}, (0, 1): {}}'
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_to_loaded_path(graph, tmp_path, mmap):
+    """
+    Verifies that a loaded graph can be saved back to the file it was loaded from, and is still usable.
+    """
+    path = str(tmp_path / 'graph.bin')
+    graph.save(path)
+    loaded = GraphCSR.load(path, mmap)
+    loaded.save(path)
+
+    assert repr(loaded) == repr(graph)
+    assert repr(GraphCSR.load(path, mmap)) == repr(graph)
+    assert [file.name for file in tmp_path.iterdir()] == ['graph.bin']
+
+
+def test_load_invalid(tmp_path):
+    """
+    Verifies that loading a file that is not a saved graph raises an error.
+    """
+    path = tmp_path / 'graph.bin'
+    path.write_bytes(b'not a graph')
+    with pytest.raises(ValueError):
+        GraphCSR.load(str(path))
+
+
+def test_immutable(graph):
+    """
+    Verifies that vertices and edges cannot be added to or removed from a frozen graph.
+    """
+    frozen = graph.freeze()
+    with pytest.raises(ValueError):
+        frozen.add_vertex('v7')
+    with pytest.raises(ValueError):
+        frozen.add_vertices(['v7'])
+    with pytest.raises(ValueError):
+        frozen.add_edges(['v1'], ['v6'])
+    with pytest.raises(ValueError):
+        frozen.add_edges(['v1'], ['v6'], undirected=True)
+    assert not frozen.connected(frozen.get_vertex('v1'), frozen.get_vertex('v6'))
+    with pytest.raises(ValueError):
+        frozen.add_edge(frozen.get_vertex('v1'), frozen.get_vertex('v6'))
+    with pytest.raises(ValueError):
+        frozen.remove_edge(frozen.get_vertex('v1'), frozen.get_vertex('v3'))
+    with pytest.raises(ValueError):
+        frozen.remove_vertex(frozen.get_vertex('v1'))
+    assert frozen.get_vertex('v1') is not None
+
+
+def _get_keys(vertices: Iterable[Graph.Vertex]) -> list:
+    return [vertex.key for vertex in vertices]
+
+
+def _get_edge_keys(edges: Iterable[tuple[Graph.Vertex, float]]) -> list[tuple]:
+    return [(vertex.key, weight) for vertex, weight in edges]
+
+
+def _get_vertex_tuples(vertices: Iterable[Graph.Vertex]) -> list[tuple]:
+    return [(vertex.key, vertex.index, vertex.value) for vertex in vertices]
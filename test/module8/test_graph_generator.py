@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from module8.graph import Graph
+from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+from module8.graph_generator import random_graph, barabasi_albert_graph, grid_graph
+
+
+# All tests are run for both graph implementations.
+@pytest.fixture(params=[GraphAdjacencyList, GraphAdjacencyMatrix])
+def graph(request) -> Graph:
+    # Instantiate the graph implementation
+    return request.param()
+
+
+def _get_edges(graph):
+    return [(source_vertex.key, dest_vertex.key, weight)
+            for source_vertex in graph.vertices_by_index
+            for dest_vertex, weight in graph.get_edges_from_vertex(source_vertex)]
+
+
+def test_random_graph(graph):
+    """
+    Tests that G(n, p) graphs have about the expected number of edges, with no self loops or repeated edges.
+    """
+    random_graph(graph, 200, 0.1, seed=1)
+    assert list(graph.vertices) == list(range(200))
+    edges = [(source, dest) for source, dest, _ in _get_edges(graph)]
+    assert len(set(edges)) == len(edges)
+    assert all(source != dest for source, dest in edges)
+    # expected 200 * 199 * 0.1 = 3980, standard deviation about 60
+    assert 3700 < len(edges) < 4300
+    assert not graph.is_acyclic()
+
+
+def test_random_graph_seed():
+    """
+    Verifies that the same seed gives the same graph.
+    """
+    graph1 = random_graph(GraphAdjacencyList(), 100, 0.05, seed=1, weights=(1, 5))
+    graph2 = random_graph(GraphAdjacencyList(), 100, 0.05, seed=1, weights=(1, 5))
+    graph3 = random_graph(GraphAdjacencyList(), 100, 0.05, seed=2, weights=(1, 5))
+    assert _get_edges(graph1) == _get_edges(graph2)
+    assert _get_edges(graph1) != _get_edges(graph3)
+    assert all(1 <= weight <= 5 for _, _, weight in _get_edges(graph1))
+
+
+def test_random_graph_all_pairs(graph):
+    """
+    Tests that every pair is connected with probability 1, and none with probability 0.
+    """
+    random_graph(graph, 20, 1.0)
+    assert sorted((source, dest) for source, dest, _ in _get_edges(graph)) == [
+        (source, dest) for source in range(20) for dest in range(20) if source != dest]
+
+    acyclic_graph = random_graph(type(graph)(), 20, 1.0, acyclic=True)
+    assert sorted((source, dest) for source, dest, _ in _get_edges(acyclic_graph)) == [
+        (source, dest) for source in range(20) for dest in range(source + 1, 20)]
+    assert acyclic_graph.is_acyclic()
+
+    empty_graph = random_graph(type(graph)(), 20, 0.0)
+    assert _get_edges(empty_graph) == []
+
+
+def test_random_graph_undirected(graph):
+    """
+    Tests undirected G(n, p) graphs, which also update the connected components.
+    """
+    random_graph(graph, 100, 0.02, seed=3, undirected=True)
+    edges = {(source, dest) for source, dest, _ in _get_edges(graph)}
+    assert all((dest, source) in edges for source, dest in edges)
+
+    distances = graph.breadth_first_distances(graph.vertices_by_index[:1])
+    for vertex in graph.vertices_by_index:
+        assert graph.connected(graph.vertices_by_index[0], vertex) == (distances[vertex.index] >= 0)
+
+
+def test_random_graph_invalid(graph):
+    with pytest.raises(ValueError):
+        random_graph(graph, 10, 1.5)
+    graph.add_vertex('a')
+    with pytest.raises(ValueError):
+        random_graph(graph, 10, 0.5)
+
+
+def test_barabasi_albert_graph(graph):
+    """
+    Tests that power-law graphs are connected, with the expected number of edges and some high degree hubs.
+    """
+    barabasi_albert_graph(graph, 500, 2, seed=1)
+    edges = _get_edges(graph)
+    # undirected edges are stored in both directions
+    assert len(edges) == 2 * 2 * (500 - 2)
+    assert graph.connected_component_count() == 1
+
+    degrees = np.bincount([source for source, _, _ in edges])
+    assert degrees.min() >= 2
+    assert degrees.max() > 10 * np.median(degrees)
+
+    with pytest.raises(ValueError):
+        barabasi_albert_graph(type(graph)(), 2, 2)
+
+
+def test_grid_graph(graph):
+    """
+    Tests that grid graphs connect each vertex to its horizontal and vertical neighbors.
+    """
+    grid_graph(graph, 3, 2, seed=1, weights=(1, 2))
+    assert list(graph.vertices) == [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0), (2, 1)]
+    assert graph.get_vertex((2, 1)).value == (2, 1)
+
+    vertex = graph.get_vertex((1, 0))
+    assert sorted(dest_vertex.key for dest_vertex, _ in graph.get_edges_from_vertex(vertex)) == [
+        (0, 0), (1, 1), (2, 0)]
+    for source, dest, weight in _get_edges(graph):
+        assert abs(source[0] - dest[0]) + abs(source[1] - dest[1]) == 1
+        assert 1 <= weight <= 2
+        assert graph.get_edge_weight(graph.get_vertex(dest), graph.get_vertex(source)) == weight
+    assert len(_get_edges(graph)) == 2 * 7
+    assert graph.connected_component_count() == 1
@@ -0,0 +1,79 @@
+from random import seed, random, randint
+
+import pytest
+
+from module8.graph_adjacency_list import GraphAdjacencyList
+
+
+def test_shortest_paths_from_many():
+    """
+    Verifies that parallel shortest paths match shortest_paths_from() for each start vertex.
+    """
+    seed(506)
+    graph = GraphAdjacencyList()
+    vertices = [graph.add_vertex(i) for i in range(50)]
+    for source_vertex in vertices:
+        for dest_vertex in vertices:
+            if random() < .1:
+                graph.add_edge(source_vertex, dest_vertex, randint(1, 10))
+
+    start_vertices = vertices[::3]
+    trees = graph.shortest_paths_from_many(start_vertices, max_workers=2)
+    assert len(trees) == len(start_vertices)
+    for start_vertex, tree in zip(start_vertices, trees):
+        expected_tree = graph.shortest_paths_from(start_vertex)
+        assert tree.start_vertex is start_vertex
+        assert tree.distances == expected_tree.distances
+        for end_vertex in vertices:
+            path = tree.shortest_path(end_vertex)
+            assert len(path) == len(expected_tree.shortest_path(end_vertex))
+            if len(path) > 0:
+                assert path[0] is start_vertex
+                assert path[-1] is end_vertex
+
+
+def test_shortest_paths_from_many_empty():
+    """
+    Verifies that no shortest paths are returned if there are no start vertices.
+    """
+    graph = GraphAdjacencyList()
+    graph.add_vertex(1)
+    assert graph.shortest_paths_from_many([]) == []
+
+
+def test_shortest_paths_from_many_negative_weights():
+    """
+    Verifies that shortest paths with negative weights match shortest_paths_from(), which Dijkstra's algorithm would
+    get wrong.
+    """
+    graph = GraphAdjacencyList()
+    vertices = graph.add_vertices(range(4))
+    graph.add_edges([0, 0, 2, 1], [1, 2, 1, 3], [1.0, 5.0, -10.0, 1.0], by_index=True)
+
+    trees = graph.shortest_paths_from_many(vertices[:2], max_workers=2)
+    for start_vertex, tree in zip(vertices[:2], trees):
+        assert tree.distances == graph.shortest_paths_from(start_vertex).distances
+    assert trees[0].distance(vertices[3]) == -4
+    assert trees[0].shortest_path(vertices[3]) == [vertices[0], vertices[2], vertices[1], vertices[3]]
+
+    graph.add_edge(vertices[3], vertices[0], 1.0)
+    with pytest.raises(ValueError):
+        graph.shortest_paths_from_many(vertices[:1])
+
+
+def test_shortest_paths_from_many_removed_vertices():
+    """
+    Verifies that shortest paths use the vertex indices of the graph when vertices have been removed.
+    """
+    graph = GraphAdjacencyList()
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(5))
+    graph.add_edges([0, 2, 3, 0], [2, 3, 4, 1], by_index=True)
+    graph.remove_vertex(vertices[1])
+
+    trees = graph.shortest_paths_from_many([vertices[2], vertices[0]], max_workers=2)
+    assert graph.tombstone_count == 1
+    assert trees[0].start_vertex is vertices[2]
+    assert trees[0].shortest_path(vertices[4]) == [vertices[2], vertices[3], vertices[4]]
+    assert trees[1].distances == graph.shortest_paths_from(vertices[0]).distances
+    assert trees[1].shortest_path(vertices[4]) == [vertices[0], vertices[2], vertices[3], vertices[4]]
@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+
+from module8.graph import Graph
+from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+from module8.graph_generator import random_graph
+from module8.page_rank import page_rank
+
+
+# All tests are run for both graph implementations.
+@pytest.fixture(params=[GraphAdjacencyList, GraphAdjacencyMatrix])
+def graph(request) -> Graph:
+    # Instantiate the graph implementation
+    return request.param()
+
+
+def test_empty(graph):
+    assert page_rank(graph).tolist() == []
+
+
+def test_no_edges(graph):
+    graph.add_vertices([1, 2, 3, 4])
+    assert page_rank(graph) == pytest.approx([0.25] * 4)
+
+
+def test_cycle(graph):
+    """
+    Verifies that all vertices in a cycle have the same rank.
+    """
+    graph.add_vertices(range(4))
+    graph.add_edges(range(4), [1, 2, 3, 0], by_index=True)
+    assert np.allclose(graph.page_rank(), 0.25)
+
+
+def test_dangling(graph):
+    """
+    Tests a small graph with a dangling vertex against ranks calculated by hand:
+    a = 0.05 + 0.85 (c / 3), b = 0.05 + 0.85 (a / 2 + c / 3), c = 0.05 + 0.85 (a / 2 + b), which add up to 1.
+    """
+    vertex_a, vertex_b, vertex_c = graph.add_vertices(['a', 'b', 'c'])
+    graph.add_edge(vertex_a, vertex_b)
+    graph.add_edge(vertex_a, vertex_c)
+    graph.add_edge(vertex_b, vertex_c)
+
+    ranks = page_rank(graph, tolerance=1e-10)
+    assert ranks.sum() == pytest.approx(1)
+    assert ranks[vertex_c.index] > ranks[vertex_b.index] > ranks[vertex_a.index]
+    a, b, c = ranks
+    assert a == pytest.approx(0.05 + 0.85 * c / 3)
+    assert b == pytest.approx(0.05 + 0.85 * (a / 2 + c / 3))
+    assert c == pytest.approx(0.05 + 0.85 * (a / 2 + b + c / 3))
+
+
+def test_random_graph(graph):
+    """
+    Verifies that ranks match the stationary distribution of the dense transition matrix.
+    """
+    random_graph(graph, 50, 0.1, seed=4, weights=(1, 3))
+    vertices = graph.vertices_by_index
+    personalization = {vertices[0]: 2.0, vertices[1]: 1.0}
+    jump = np.zeros(50)
+    jump[:2] = [2 / 3, 1 / 3]
+
+    transitions = np.zeros((50, 50))
+    for source_vertex in vertices:
+        for dest_vertex, weight in graph.get_edges_from_vertex(source_vertex):
+            transitions[source_vertex.index, dest_vertex.index] = weight
+    out_weights = transitions.sum(axis=1, keepdims=True)
+    transitions = np.where(out_weights > 0, transitions / np.where(out_weights > 0, out_weights, 1), jump)
+    google_matrix = 0.9 * transitions + 0.1 * jump
+    # solve x = x G with sum(x) = 1
+    system = np.vstack([google_matrix.T - np.eye(50), np.ones(50)])
+    expected = np.linalg.lstsq(system, np.append(np.zeros(50), 1), rcond=None)[0]
+
+    ranks = page_rank(graph, damping=0.9, personalization=personalization, tolerance=1e-12, max_iterations=1000)
+    assert np.allclose(ranks, expected, atol=1e-9)
+    # the frozen graph has its own vertices
+    frozen = graph.freeze()
+    frozen_personalization = {frozen.get_vertex(vertex.key): value for vertex, value in personalization.items()}
+    ranks = page_rank(frozen, damping=0.9, personalization=frozen_personalization, tolerance=1e-12,
+                      max_iterations=1000)
+    assert np.allclose(ranks, expected, atol=1e-9)
+
+
+def test_unweighted(graph):
+    vertex1, vertex2, vertex3 = graph.add_vertices([1, 2, 3])
+    graph.add_edge(vertex1, vertex2, 10.0)
+    graph.add_edge(vertex1, vertex3, 1.0)
+    weighted_ranks = page_rank(graph)
+    assert weighted_ranks[vertex2.index] > weighted_ranks[vertex3.index]
+    ranks = page_rank(graph, weighted=False)
+    assert ranks[vertex2.index] == pytest.approx(ranks[vertex3.index])
+
+
+def test_removed_vertex(graph):
+    """
+    Verifies that removed vertices have no rank.
+    """
+    graph.compact_threshold = 1.0  # only compact manually
+    vertices = graph.add_vertices(range(4))
+    graph.add_edges(range(4), [1, 2, 3, 0], by_index=True)
+    graph.remove_vertex(vertices[3])
+    ranks = page_rank(graph)
+    assert ranks[3] == 0
+    assert ranks.sum() == pytest.approx(1)
+    assert ranks[2] > ranks[1] > ranks[0]
+
+
+def test_invalid(graph):
+    vertex1, vertex2 = graph.add_vertices([1, 2])
+    graph.add_edge_undirected(vertex1, vertex2)
+    with pytest.raises(ValueError):
+        page_rank(graph, damping=1.5)
+    with pytest.raises(ValueError):
+        page_rank(graph, personalization={vertex1: -1.0})
+    with pytest.raises(ValueError):
+        page_rank(graph, personalization={vertex1: 0.0})
+    with pytest.raises(KeyError):
+        page_rank(graph, personalization={Graph.Vertex(3, 0): 1.0})
+    # doesn't converge in one iteration
+    with pytest.raises(ValueError):
+        page_rank(graph, personalization={vertex1: 1.0}, max_iterations=1)
+
+
+@pytest.mark.parametrize('weight', [0.0, -1.0])
+def test_invalid_weights(graph, weight):
+    vertex1, vertex2 = graph.add_vertices([1, 2])
+    graph.add_edge(vertex1, vertex2, 1.0)
+    graph.add_edge(vertex2, vertex1, weight)
+    with pytest.raises(ValueError, match='must be positive'):
+        page_rank(graph)
+    # weights are not used
+    assert page_rank(graph, weighted=False) == pytest.approx([0.5, 0.5])
@@ -0,0 +1,49 @@
+import pytest
+
+from module8.graph import Graph
+from module8.graph_adjacency_list import GraphAdjacencyList
+from module8.graph_adjacency_matrix import GraphAdjacencyMatrix
+from module8.graph_generator import random_graph
+from module8.reachability import ReachabilityIndex
+
+
+# All tests are run for both graph implementations.
+@pytest.fixture(params=[GraphAdjacencyList, GraphAdjacencyMatrix])
+def graph(request) -> Graph:
+    # Instantiate the graph implementation
+    return request.param()
+
+
+def test_empty(graph):
+    assert len(ReachabilityIndex(graph)) == 0
+
+
+def test_components(graph):
+    """
+    Tests a graph with two cycles joined by an edge, so there are two components that can reach the same vertices.
+    """
+    graph.add_vertices(range(6))
+    graph.add_edges([0, 1, 2, 3, 4, 5], [1, 2, 0, 4, 3, 4], by_index=True)
+    graph.add_edges([2], [3], by_index=True)
+    index = ReachabilityIndex(graph)
+    assert len(index) == 3
+    for source_index in range(3):
+        assert all(index.can_reach(source_index, dest_index) for dest_index in range(5))
+        assert not index.can_reach(source_index, 5)
+    for source_index in [3, 4]:
+        assert [index.can_reach(source_index, dest_index) for dest_index in range(6)] == [
+            False, False, False, True, True, False]
+    assert [index.can_reach(5, dest_index) for dest_index in range(6)] == [False, False, False, True, True, True]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random(graph, seed):
+    """
+    Compares the index with a depth first search from every vertex in random graphs with small and large components.
+    """
+    random_graph(graph, 40, 0.04, seed=seed)
+    index = ReachabilityIndex(graph)
+    for source_vertex in graph.vertices_by_index:
+        reachable = {vertex.index for vertex in graph.traverse_depth_first(source_vertex)}
+        assert [index.can_reach(source_vertex.index, dest_index) for dest_index in range(40)] == [
+            dest_index in reachable for dest_index in range(40)]
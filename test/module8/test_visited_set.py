@@ -0,0 +1,67 @@
+import pytest
+
+from module8.visited_set import VisitedSet, SearchLabels
+
+
+def test_empty():
+    visited = VisitedSet()
+    assert len(visited) == 0
+
+    with pytest.raises(IndexError):
+        visited.add(0)
+
+
+def test_add_and_clear():
+    visited = VisitedSet(4)
+    visited.add(1)
+    visited.add(3)
+    assert [element in visited for element in range(4)] == [False, True, False, True]
+
+    visited.clear()
+    assert not any(element in visited for element in range(4))
+    visited.add(2)
+    assert [element in visited for element in range(4)] == [False, False, True, False]
+
+
+def test_clear_grows():
+    visited = VisitedSet(2)
+    visited.add(0)
+    visited.clear(5)
+    assert len(visited) == 5
+    assert not any(element in visited for element in range(5))
+    visited.add(4)
+    assert 4 in visited
+
+    # never shrinks
+    visited.clear(3)
+    assert len(visited) == 5
+
+
+def test_epoch_wraps():
+    """
+    Tests that elements added in an earlier epoch are not in the set after the epoch wraps around.
+    """
+    visited = VisitedSet(3)
+    visited.add(0)
+    for _ in range(VisitedSet.max_epoch - 1):
+        visited.clear()
+    assert visited.epoch == VisitedSet.max_epoch
+    visited.add(1)
+
+    visited.clear()
+    assert visited.epoch == 1
+    assert not any(element in visited for element in range(3))
+    visited.add(2)
+    assert [element in visited for element in range(3)] == [False, False, True]
+
+
+def test_search_labels_clear_grows():
+    labels = SearchLabels(2)
+    labels.add(1)
+    labels.distances[1] = 3.0
+    labels.clear(4)
+    assert len(labels) == 4
+    assert len(labels.distances) == len(labels.pred_indices) == 4
+    assert 1 not in labels
+    assert labels.distances[3] == float('inf')
+    assert labels.pred_indices[3] == -1